@@ -0,0 +1,109 @@
+"""
+Benchmark: per-call overhead of ask_chatgpt() with a new client per call
+(the old behaviour) versus the shared pooled client, against a local
+stand-in for the chat-completions endpoint. No API key or network needed.
+
+Also checks the retry path: the stand-in answers 429/503 a few times
+before succeeding.
+
+Usage: python bench_chatgpt_client.py [calls]   (default 200)
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+from openai import OpenAI
+
+import chatgpt_bot
+from chatgpt_bot import ask_chatgpt, create_client, get_client_stats
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """
+    Minimal POST /v1/chat/completions; fails the next server.fail_next calls
+    (with a Retry-After header when server.retry_after is set).
+    """
+    protocol_version = "HTTP/1.1"   # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.connections.add(self.client_address)
+        if self.server.fail_next:
+            self.server.fail_next.pop(0)
+            status, payload = self.server.fail_status, {"error": {"message": "try again"}}
+        else:
+            status = 200
+            payload = {
+                "id": "chatcmpl-bench", "object": "chat.completion", "created": int(time.time()),
+                "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": "ok"}}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            }
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        if status != 200 and getattr(self.server, "retry_after", None):
+            self.send_header("Retry-After", str(self.server.retry_after))
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    server.daemon_threads = True
+    server.connections, server.fail_next, server.fail_status = set(), [], 503
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def per_call_client(base_url):
+    """What ask_chatgpt() used to do: a fresh OpenAI + httpx.Client per question."""
+    return OpenAI(api_key="bench", base_url=base_url, http_client=httpx.Client(verify=False))
+
+
+def timed_calls(server, calls, make_client):
+    server.connections.clear()
+    start = time.perf_counter()
+    for _ in range(calls):
+        assert ask_chatgpt("ping", client=make_client()) == "ok"
+    return (time.perf_counter() - start) / calls * 1000, len(server.connections)
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    chatgpt_bot.LLM_CACHE = False   # every call must reach the server
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+
+    fresh_ms, fresh_conns = timed_calls(server, calls, lambda: per_call_client(base_url))
+    pooled = create_client("bench", base_url)
+    pooled_ms, pooled_conns = timed_calls(server, calls, lambda: pooled)
+
+    print(f"{'client':<12} {'ms/call':>9} {'connections':>12}")
+    print(f"{'per call':<12} {fresh_ms:>9.2f} {fresh_conns:>12}")
+    print(f"{'pooled':<12} {pooled_ms:>9.2f} {pooled_conns:>12}")
+    print(f"overhead saved: {fresh_ms - pooled_ms:.2f} ms/call ({fresh_ms / pooled_ms:.1f}x)")
+
+    # Retry path: two failures, then success; fast backoff for the benchmark
+    chatgpt_bot.BACKOFF_BASE = 0.01
+    for status in (429, 503):
+        server.fail_status, server.fail_next = status, [1, 2]
+        before = get_client_stats()
+        assert ask_chatgpt("ping", client=pooled) == "ok"
+        retries = get_client_stats()["retries"] - before["retries"]
+        print(f"{status}: succeeded after {retries} retries")
+    pooled.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark: time to first token of stream_chatgpt() versus the full wait of
+ask_chatgpt(), against a local stand-in that streams an answer token by
+token. Also checks cancellation, the time budget, and that both share the
+response cache and metrics. Uses a temporary cache file.
+
+Usage: python bench_chatgpt_stream.py [tokens] [token_ms]   (default 100, 20)
+"""
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import chatgpt_bot
+from bench_chatgpt_client import StandIn, start_server
+from chatgpt_bot import ask_chatgpt, stream_chatgpt, create_client, get_client_stats
+from llm_cache import ResponseCache
+
+
+class StreamingStandIn(StandIn):
+    """
+    The stand-in endpoint, producing server.tokens tokens every server.token_ms
+    (stalling for server.stall_s seconds after server.stall_after tokens, if set).
+    """
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        tokens = [f"word{i} " for i in range(self.server.tokens)]
+        if not body.get("stream"):
+            time.sleep(self.server.tokens * self.server.token_ms / 1000)
+            return self._reply(body, "".join(tokens))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            for i, token in enumerate(tokens):
+                if i == getattr(self.server, "stall_after", None):
+                    time.sleep(self.server.stall_s)
+                time.sleep(self.server.token_ms / 1000)
+                chunk = {"id": "chatcmpl-bench", "object": "chat.completion.chunk",
+                         "created": int(time.time()), "model": body["model"],
+                         "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+                self.server.sent += 1
+            # Like the API: a last chunk with finish_reason, then [DONE]
+            last = {"id": "chatcmpl-bench", "object": "chat.completion.chunk",
+                    "created": int(time.time()), "model": body["model"],
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            self.wfile.write(f"data: {json.dumps(last)}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # the client cancelled
+        self.close_connection = True
+
+    def _reply(self, body, content):
+        data = json.dumps({
+            "id": "chatcmpl-bench", "object": "chat.completion", "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main():
+    tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    token_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 20
+    server = start_server()
+    server.RequestHandlerClass = StreamingStandIn
+    server.tokens, server.token_ms, server.sent = tokens, token_ms, 0
+    client = create_client("bench", f"http://127.0.0.1:{server.server_port}/v1")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = chatgpt_bot.response_cache = ResponseCache(Path(tmp) / "llm_cache.db")
+
+        start = time.perf_counter()
+        ask_chatgpt("blocking", client=client, use_cache=False)
+        blocking = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pieces = stream_chatgpt("streamed", client=client)
+        next(pieces)
+        first = time.perf_counter() - start
+        for _ in pieces:
+            pass
+        streamed = time.perf_counter() - start
+        print(f"blocking answer:      {blocking * 1000:8.1f} ms")
+        print(f"streamed first token: {first * 1000:8.1f} ms ({blocking / first:.0f}x sooner)")
+        print(f"streamed full answer: {streamed * 1000:8.1f} ms")
+
+        # The completed stream was cached; both paths read it
+        assert cache.get("streamed", chatgpt_bot.MODEL) is not None
+        start = time.perf_counter()
+        ask_chatgpt("Streamed?", client=client)
+        print(f"cached (non-streamed read): {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        # Cancellation: stop after 5 tokens, the connection is dropped
+        sent = server.sent
+        cancel = threading.Event()
+        received = 0
+        for _ in stream_chatgpt("cancel me", client=client, cancel=cancel):
+            received += 1
+            if received == 5:
+                cancel.set()
+        time.sleep(token_ms * 5 / 1000)
+        print(f"cancelled after {received} tokens; server sent {server.sent - sent} of {tokens}, "
+              f"cached: {cache.get('cancel me', chatgpt_bot.MODEL) is not None}")
+
+        # Time budget
+        received = 0
+        try:
+            for _ in stream_chatgpt("too slow", client=client, time_budget=token_ms * 10 / 1000):
+                received += 1
+        except TimeoutError as e:
+            print(f"time budget: {e} after {received} tokens")
+
+        # A stall mid-answer still ends at the budget, not a read timeout later
+        budget = token_ms * 10 / 1000
+        server.stall_after, server.stall_s = 8, budget * 10
+        received = 0
+        start = time.perf_counter()
+        try:
+            for _ in stream_chatgpt("stalls", client=client, time_budget=budget):
+                received += 1
+        except TimeoutError:
+            pass
+        elapsed = time.perf_counter() - start
+        server.stall_after = None
+        assert elapsed < budget * 1.5, f"stalled stream ran {elapsed:.2f}s on a {budget:g}s budget"
+        print(f"stall after {received} tokens: TimeoutError after {elapsed * 1000:.0f} ms "
+              f"(budget {budget * 1000:.0f} ms)")
+
+        print("client stats:", get_client_stats())
+        print("cache stats:", cache.stats())
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: ask_chatgpt() latency on a cache miss (model call, here a local
+stand-in with simulated generation time) versus a repeat question answered
+from the SQLite response cache, plus hit ratio, TTL and LRU eviction checks.
+Uses a temporary cache file; the real llm_cache.db is not touched.
+
+Usage: python bench_llm_cache.py [questions] [model_ms]   (default 50, 300)
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import chatgpt_bot
+from bench_chatgpt_client import StandIn, start_server
+from chatgpt_bot import ask_chatgpt, create_client
+from llm_cache import ResponseCache
+
+
+class SlowStandIn(StandIn):
+    """The stand-in endpoint, taking server.model_ms to 'generate' each answer."""
+
+    def do_POST(self):
+        time.sleep(self.server.model_ms / 1000)
+        super().do_POST()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    questions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    model_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 300
+    server = start_server()
+    server.RequestHandlerClass = SlowStandIn
+    server.model_ms = model_ms
+    client = create_client("bench", f"http://127.0.0.1:{server.server_port}/v1")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = chatgpt_bot.response_cache = ResponseCache(Path(tmp) / "llm_cache.db")
+        prompts = [f"Summarize critical incident group {i}?" for i in range(questions)]
+
+        miss = sum(timed(lambda: ask_chatgpt(p, client=client, data_version="v1")) for p in prompts)
+        # Same questions, differently typed: normalized to the same key
+        hit = sum(timed(lambda: ask_chatgpt(f"  {p.upper()} ", client=client, data_version="v1"))
+                  for p in prompts)
+        print(f"miss: {miss / questions:8.2f} ms/question")
+        print(f"hit:  {hit / questions:8.2f} ms/question ({miss / hit:.0f}x faster)")
+
+        # New data version and bypass both go to the model again
+        assert cache.get(prompts[0], chatgpt_bot.MODEL, "v2") is None
+        bypass = timed(lambda: ask_chatgpt(prompts[0], client=client, data_version="v1", use_cache=False))
+        print(f"bypass: {bypass:.2f} ms")
+        print("stats:", cache.stats())
+
+        # TTL
+        cache.ttl = 0
+        assert cache.get(prompts[0], chatgpt_bot.MODEL, "v1") is None
+        cache.ttl = 3600
+        print(f"after ttl=0: {cache.expired} expired")
+
+        # LRU: fill to max_entries, read the oldest entry, then add 5 more.
+        # The entry just read survives; the 5 least recently used are evicted.
+        cache.clear()
+        cache.max_entries = 10
+        evictions = cache.evictions
+        keys = [f"lru question {i}" for i in range(cache.max_entries)]
+        for key in keys:
+            cache.put(key, chatgpt_bot.MODEL, "ok", "v1")
+        assert cache.get(keys[0], chatgpt_bot.MODEL, "v1") == "ok"
+        for i in range(5):
+            cache.put(f"lru extra {i}", chatgpt_bot.MODEL, "ok", "v1")
+        assert cache.stats()["entries"] == cache.max_entries
+        assert cache.evictions - evictions == 5
+        assert cache.get(keys[0], chatgpt_bot.MODEL, "v1") == "ok"
+        assert all(cache.get(key, chatgpt_bot.MODEL, "v1") is None for key in keys[1:6])
+        assert all(cache.get(key, chatgpt_bot.MODEL, "v1") == "ok" for key in keys[6:])
+        print(f"after {len(keys) + 5} puts with max_entries=10: {cache.stats()['entries']} entries, "
+              f"{cache.evictions - evictions} evicted (least recently used)")
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
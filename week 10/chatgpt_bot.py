@@ -1,21 +1,268 @@
 # chatgpt_bot.py
+"""
+Chat-completion calls for the dashboard chat panels.
+
+One OpenAI client (and one pooled, keep-alive httpx.Client under it) is
+shared by every call and every Streamlit session in the process, so a
+question pays no TCP/TLS handshake once a connection is open. Calls have
+explicit connect/read timeouts, are retried with jittered exponential
+backoff on 429/5xx and connection errors, and the pool is closed at exit.
+Answers, streamed or not, are cached in llm_cache.response_cache.
+"""
+import atexit
+import os
+import random
+import socket
+import threading
+import time
+
 import streamlit as st
-from openai import OpenAI
+from openai import OpenAI, APIConnectionError, APIStatusError, APITimeoutError
 import httpx
 
-def ask_chatgpt(question: str) -> str:
-    api_key = st.secrets.get("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("No API Key found in secrets.toml!")
+from llm_cache import response_cache, LLM_CACHE
+
+MODEL = "gpt-4o-mini"
+
+# Timeouts in seconds; the read timeout bounds the wait for a completion
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 60.0
+
+# Connections kept open to the API (shared by all sessions)
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE = 10
+KEEPALIVE_EXPIRY = 120.0
+# TLS certificates are verified; set OPENAI_VERIFY_SSL=0 only behind an
+# intercepting proxy whose certificate cannot be installed
+OPENAI_VERIFY_SSL = os.environ.get("OPENAI_VERIFY_SSL", "1") != "0"
+
+# Retries after the first attempt, and the backoff between them
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+# Seconds a streamed answer may take before it is cut off
+TIME_BUDGET = 60.0
+
+_client = None
+_client_lock = threading.Lock()
+
+_stats = {"calls": 0, "retries": 0, "failures": 0, "streams": 0, "cancelled": 0,
+          "timed_out": 0, "first_token_s": 0.0}
+_stats_lock = threading.Lock()
 
-    client = OpenAI(
-        api_key=api_key,
-        http_client=httpx.Client(verify=False)
+
+def _count(name, n=1):
+    with _stats_lock:
+        _stats[name] += n
+
+
+def get_client_stats():
+    """
+    Calls made, retries taken, calls that failed after all retries, and for
+    streamed answers how many were cancelled or ran out of time and the
+    average time to the first token.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["avg_first_token_s"] = stats.pop("first_token_s") / stats["streams"] if stats["streams"] else 0.0
+    return stats
+
+
+def create_client(api_key, base_url=None):
+    """
+    An OpenAI client over a pooled keep-alive httpx.Client. The SDK's own
+    retries are off; ask_chatgpt() retries with jitter itself.
+    """
+    http_client = httpx.Client(
+        verify=OPENAI_VERIFY_SSL,
+        timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS,
+                            max_keepalive_connections=MAX_KEEPALIVE,
+                            keepalive_expiry=KEEPALIVE_EXPIRY),
     )
+    return OpenAI(api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0)
+
+
+def get_client():
+    """The process-wide client, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            api_key = st.secrets.get("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("No API Key found in secrets.toml!")
+            _client = create_client(api_key)
+        return _client
+
+
+def close_client():
+    """Close the shared client's connections (a new one is made on next use)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
+
+atexit.register(close_client)
+
+
+def _retry_delay(attempt, error):
+    """Full-jitter exponential backoff, or the server's Retry-After if it sent one."""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_CAP)
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def _is_retryable(error):
+    if isinstance(error, (APIConnectionError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code in RETRY_STATUSES
+
+
+def with_retries(call, deadline=None):
+    """
+    Run call(), retrying up to MAX_RETRIES times on 429/5xx and connection
+    errors; no retry is started that would end after deadline (time.monotonic()).
+    """
+    _count("calls")
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return call()
+        except Exception as e:
+            delay = _retry_delay(attempt, e) if _is_retryable(e) else None
+            if (attempt == MAX_RETRIES or delay is None
+                    or (deadline is not None and time.monotonic() + delay >= deadline)):
+                _count("failures")
+                raise
+            _count("retries")
+            time.sleep(delay)
+
+
+def ask_chatgpt(question: str, model: str = MODEL, client=None,
+                data_version=None, use_cache: bool = True) -> str:
+    """
+    Ask the model one question. data_version (e.g. app_db.data_version(table))
+    scopes the cached answer to the data it was given for; use_cache=False
+    skips the cache lookup and stores the fresh answer.
+    """
+    if use_cache and LLM_CACHE:
+        cached = response_cache.get(question, model, data_version)
+        if cached is not None:
+            return cached
+    client = client or get_client()
+    response = with_retries(lambda: client.chat.completions.create(
+        model=model,
         messages=[{"role": "user", "content": question}]
-    )
-    return response.choices[0].message.content
+    ))
+    answer = response.choices[0].message.content
+    if LLM_CACHE:
+        response_cache.put(question, model, answer, data_version)
+    return answer
+
+
+def _interrupt(stream):
+    """
+    Wake a read blocked on a streamed response from another thread: closing
+    the socket would not return until the read timeout, shutting it down
+    ends the read at once. The stream itself is closed by its reader.
+    """
+    network_stream = stream.response.extensions.get("network_stream")
+    sock = network_stream.get_extra_info("socket") if network_stream is not None else None
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass   # already closed
+
+
+def stream_chatgpt(question: str, model: str = MODEL, client=None, data_version=None,
+                   use_cache: bool = True, time_budget: float = TIME_BUDGET, cancel=None):
+    """
+    Like ask_chatgpt(), but yields the answer in pieces as the model
+    produces them (a cached answer comes back as one piece).
+
+    Stops early when cancel (a threading.Event) is set or the generator is
+    closed, and raises TimeoutError once time_budget seconds have passed.
+    Only complete answers are cached.
+    """
+    if use_cache and LLM_CACHE:
+        cached = response_cache.get(question, model, data_version)
+        if cached is not None:
+            yield cached
+            return
+    client = client or get_client()
+    start = time.monotonic()
+    deadline = start + time_budget
+    # Each attempt waits at most the budget left when it starts
+    stream = with_retries(lambda: client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": question}],
+        stream=True,
+        timeout=httpx.Timeout(min(max(deadline - time.monotonic(), 0.001), READ_TIMEOUT),
+                              connect=CONNECT_TIMEOUT),
+    ), deadline)
+    _count("streams")
+
+    # The read timeout is fixed per request, so a stall late in the answer
+    # could outlast the budget; cut the connection at the deadline instead
+    expired = threading.Event()
+
+    def expire():
+        expired.set()
+        _interrupt(stream)
+
+    timer = threading.Timer(max(deadline - time.monotonic(), 0), expire)
+    timer.daemon = True
+    timer.start()
 
+    parts = []
+    outcome = "cancelled"
+    # Set by the chunk carrying finish_reason: from then on the answer is
+    # whole, even if the timer fires before the stream is done
+    finished = False
+    try:
+        for chunk in stream:
+            if cancel is not None and cancel.is_set():
+                break
+            choice = chunk.choices[0] if chunk.choices else None
+            finished = finished or (choice is not None and choice.finish_reason is not None)
+            if not finished and (expired.is_set() or time.monotonic() > deadline):
+                outcome = "timed_out"
+                break
+            delta = choice.delta.content if choice is not None else None
+            if delta:
+                if not parts:
+                    _count("first_token_s", time.monotonic() - start)
+                parts.append(delta)
+                yield delta
+        else:
+            # A shutdown by the timer can also end the stream quietly, so the
+            # timer only counts when the answer had not finished
+            outcome = "complete" if finished or not expired.is_set() else "timed_out"
+    except Exception:
+        if finished:
+            outcome = "complete"   # cut after the last piece arrived
+        elif not expired.is_set():
+            outcome = "failures"   # the connection broke mid-answer
+            raise
+        else:
+            outcome = "timed_out"  # cut by the timer mid-read
+    finally:
+        timer.cancel()
+        # Closing the response drops the connection instead of reading the rest
+        stream.close()
+        if outcome == "complete":
+            if LLM_CACHE:
+                response_cache.put(question, model, "".join(parts), data_version)
+        else:
+            _count(outcome)
+    if outcome == "timed_out":
+        raise TimeoutError(f"No complete answer within {time_budget:g}s")
@@ -0,0 +1,193 @@
+"""
+Persistent cache of chat-completion answers.
+
+Answers are stored in SQLite (llm_cache.db, next to intelligence_platform.db)
+keyed on the normalized question, the model and the version of the data the
+question is about, so a repeat question is answered from disk in
+milliseconds and a change to the data asks the model again. Entries expire
+after a TTL, and the least recently used ones are evicted past a size limit.
+Recency is a use counter rather than a timestamp, so uses never tie however
+coarse the clock is.
+"""
+import hashlib
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Week 8 package (app.*) for the managed SQLite connections
+WEEK8_PATH = Path(__file__).resolve().parent.parent / "week 8"
+if str(WEEK8_PATH) not in sys.path:
+    sys.path.insert(0, str(WEEK8_PATH))
+from app.data.db import get_connection, transaction, DATA_DIR
+
+CACHE_DB_PATH = DATA_DIR / "llm_cache.db"
+
+# Set LLM_CACHE=0 to always ask the model
+LLM_CACHE = os.environ.get("LLM_CACHE", "1") != "0"
+# Seconds an answer stays valid
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", 24 * 3600))
+# Answers kept before the least recently used are evicted
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 5000))
+# Hits are recorded in memory and written in one transaction at most this
+# often (seconds), instead of an UPDATE per hit
+LLM_CACHE_TOUCH_INTERVAL = float(os.environ.get("LLM_CACHE_TOUCH_INTERVAL", 5.0))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    data_version TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used INTEGER NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses(last_used);
+"""
+
+# Next value of the use counter: one above the latest use of any entry
+NEXT_USE = "(SELECT COALESCE(MAX(last_used), 0) + 1 FROM llm_responses)"
+
+
+def normalize_prompt(prompt):
+    """Case, surrounding whitespace, repeated spaces and trailing ?!. do not change the key."""
+    return re.sub(r"\s+", " ", prompt).strip().rstrip("?!. ").casefold()
+
+
+def cache_key(prompt, model, data_version=None):
+    """SHA-256 of the normalized prompt, model and data version."""
+    parts = (normalize_prompt(prompt), model, str(data_version or ""))
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed TTL + LRU cache of model answers, shared by every session
+    (and process) using the same file. Hit/miss counts are per process.
+
+    last_used is a use counter shared through the file: each store or
+    recorded hit takes the next value. Hits are queued in memory in the
+    order they happen and flushed every touch_interval seconds, before an
+    eviction and by flush(), so the order is exact once flushed.
+    """
+
+    def __init__(self, db_path=CACHE_DB_PATH, ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES,
+                 touch_interval=LLM_CACHE_TOUCH_INTERVAL):
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self._ready = False
+        self._lock = threading.Lock()
+        self._touches = {}   # key -> hits not yet written, in order of last use
+        self._last_flush = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def _conn(self):
+        conn = get_connection(self.db_path)
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    conn.executescript(SCHEMA)
+                    self._ready = True
+        return conn
+
+    def _count(self, name, n=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    def get(self, prompt, model, data_version=None):
+        """The cached answer, or None if missing or expired."""
+        key = cache_key(prompt, model, data_version)
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None:
+            self._count("misses")
+            return None
+        if now - row[1] > self.ttl:
+            conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            self._count("expired")
+            self._count("misses")
+            return None
+        self._count("hits")
+        self._touch(key)
+        return row[0]
+
+    def _touch(self, key):
+        with self._lock:
+            self._touches[key] = self._touches.pop(key, 0) + 1
+            due = time.monotonic() - self._last_flush >= self.touch_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write the queued hits: each entry gets the next use value, in order of last use."""
+        with self._lock:
+            touches, self._touches = self._touches, {}
+            self._last_flush = time.monotonic()
+        if not touches:
+            return
+        self._conn()
+        with transaction(self.db_path) as conn:
+            conn.executemany(
+                f"UPDATE llm_responses SET last_used = {NEXT_USE}, hits = hits + ? WHERE key = ?",
+                [(hits, key) for key, hits in touches.items()],
+            )
+
+    def put(self, prompt, model, response, data_version=None):
+        """Store an answer, evicting the least recently used past max_entries."""
+        key = cache_key(prompt, model, data_version)
+        # Reads queued so far must count before anything is evicted
+        self.flush()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_responses "
+            "(key, model, data_version, prompt, response, created_at, last_used) "
+            f"VALUES (?, ?, ?, ?, ?, ?, {NEXT_USE})",
+            (key, model, str(data_version or ""), normalize_prompt(prompt), response, time.time()),
+        )
+        evicted = conn.execute(
+            "DELETE FROM llm_responses WHERE key IN "
+            "(SELECT key FROM llm_responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        if evicted:
+            self._count("evictions", evicted)
+
+    def purge_expired(self):
+        """Delete expired answers; returns how many."""
+        cutoff = time.time() - self.ttl
+        return self._conn().execute("DELETE FROM llm_responses WHERE created_at < ?", (cutoff,)).rowcount
+
+    def clear(self):
+        """Delete every cached answer."""
+        with self._lock:
+            self._touches.clear()
+        self._conn().execute("DELETE FROM llm_responses")
+
+    def stats(self):
+        """Hits, misses, hit ratio, expirations, evictions and stored entries."""
+        entries = self._conn().execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "entries": entries,
+            }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,120 @@
+"""
+Tests for the shared client and retry policy in chatgpt_bot, against the
+local chat-completions stand-in from bench_chatgpt_client (no API key or
+network needed), and for how a streamed answer ends.
+
+Usage: python -m pytest test_chatgpt_bot.py
+"""
+import time
+from types import SimpleNamespace
+
+import pytest
+from openai import BadRequestError
+
+import chatgpt_bot
+from bench_chatgpt_client import start_server
+from chatgpt_bot import ask_chatgpt, close_client, create_client, get_client_stats, stream_chatgpt
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = start_server()
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def client(server, monkeypatch):
+    # Every call must reach the server, and retries should not slow the tests down
+    monkeypatch.setattr(chatgpt_bot, "LLM_CACHE", False)
+    monkeypatch.setattr(chatgpt_bot, "BACKOFF_BASE", 0.01)
+    server.connections.clear()
+    server.fail_next, server.fail_status, server.retry_after = [], 503, None
+    client = create_client("test", f"http://127.0.0.1:{server.server_port}/v1")
+    yield client
+    client.close()
+
+
+def test_calls_share_one_pooled_connection(server, client):
+    for _ in range(5):
+        assert ask_chatgpt("ping", client=client) == "ok"
+    assert len(server.connections) == 1
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_retries_on_rate_limit_and_unavailable(server, client, status):
+    server.fail_status, server.fail_next = status, [1, 2]
+    before = get_client_stats()
+    assert ask_chatgpt("ping", client=client) == "ok"
+    assert get_client_stats()["retries"] - before["retries"] == 2
+    assert server.fail_next == []
+
+
+def test_no_retry_on_bad_request(server, client):
+    server.fail_status, server.fail_next = 400, [1, 2]
+    before = get_client_stats()
+    with pytest.raises(BadRequestError):
+        ask_chatgpt("ping", client=client)
+    stats = get_client_stats()
+    assert stats["retries"] == before["retries"]
+    assert stats["failures"] - before["failures"] == 1
+    assert server.fail_next == [2]   # only one request was made
+
+
+def test_retry_after_is_capped(server, client, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(chatgpt_bot.time, "sleep", sleeps.append)
+    server.fail_status, server.fail_next, server.retry_after = 429, [1], 3600
+    assert ask_chatgpt("ping", client=client) == "ok"
+    assert sleeps == [chatgpt_bot.BACKOFF_CAP]
+
+
+def test_close_client_closes_the_shared_client(server, monkeypatch):
+    shared = create_client("test", f"http://127.0.0.1:{server.server_port}/v1")
+    monkeypatch.setattr(chatgpt_bot, "_client", shared)
+    close_client()
+    assert shared.is_closed()
+    assert chatgpt_bot._client is None
+    close_client()   # nothing left to close
+
+
+class LingeringStream:
+    """A streamed response that stays open for linger seconds after its last chunk."""
+
+    def __init__(self, pieces, finish_reason, linger):
+        self.chunks = [self._chunk(piece, None) for piece in pieces]
+        self.chunks.append(self._chunk(None, finish_reason))
+        self.linger = linger
+        self.response = SimpleNamespace(extensions={})
+
+    @staticmethod
+    def _chunk(content, finish_reason):
+        choice = SimpleNamespace(delta=SimpleNamespace(content=content), finish_reason=finish_reason)
+        return SimpleNamespace(choices=[choice])
+
+    def __iter__(self):
+        yield from self.chunks
+        time.sleep(self.linger)
+
+    def close(self):
+        pass
+
+
+def stream_client(stream):
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **_: stream)))
+
+
+def test_finished_stream_is_complete_even_if_the_budget_runs_out_after(monkeypatch):
+    monkeypatch.setattr(chatgpt_bot, "LLM_CACHE", False)
+    before = get_client_stats()
+    client = stream_client(LingeringStream(["all ", "there"], "stop", linger=0.2))
+    pieces = list(stream_chatgpt("q", client=client, time_budget=0.05))
+    assert "".join(pieces) == "all there"
+    assert get_client_stats()["timed_out"] == before["timed_out"]
+
+
+def test_unfinished_stream_times_out(monkeypatch):
+    monkeypatch.setattr(chatgpt_bot, "LLM_CACHE", False)
+    client = stream_client(LingeringStream(["half "], None, linger=0.2))
+    with pytest.raises(TimeoutError):
+        list(stream_chatgpt("q", client=client, time_budget=0.05))
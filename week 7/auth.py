@@ -1,20 +1,28 @@
 import bcrypt
 import os
 import re # This import needs to be at the top with the others!
+import sys
+import time
+from user_store import get_user_store
 
 # Step 6. Define the User Data File
 USER_DATA_FILE = "users.txt"
 
+# bcrypt work factor (cost). Each +1 doubles the hashing time.
+# Run `python auth.py --calibrate` to pick a value for this machine.
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", 12))
+
 # --- CORE SECURITY FUNCTIONS ---
 
-def hash_password(plain_text_password):
+def hash_password(plain_text_password, rounds=None):
     """
     Hashes a password using bcrypt with automatic salt generation.
+    Uses BCRYPT_ROUNDS unless a cost is given.
     """
     # Encode the password to bytes (bcrypt requires byte strings)
     password_bytes = plain_text_password.encode('utf-8')
-    # Generate a salt using bcrypt.gensalt()
-    salt = bcrypt.gensalt()
+    # Generate a salt using bcrypt.gensalt() at the configured cost
+    salt = bcrypt.gensalt(rounds or BCRYPT_ROUNDS)
     # Hash the password using bcrypt.hashpw()
     hashed_bytes = bcrypt.hashpw(password_bytes, salt)
     # Decode the hash back to a string to store in a text file
@@ -31,25 +39,57 @@ def verify_password(plain_text_password, hashed_password):
     # Use bcrypt.checkpw() to verify the password
     return bcrypt.checkpw(plain_text_bytes, hashed_bytes)
 
+def get_hash_rounds(hashed_password):
+    """
+    Returns the cost a bcrypt hash was created with (format: $2b$12$...).
+    """
+    try:
+        return int(hashed_password.split('$')[2])
+    except (IndexError, ValueError):
+        return None
+
+def needs_rehash(hashed_password):
+    """
+    Checks if a stored hash uses a different cost than BCRYPT_ROUNDS.
+    """
+    return get_hash_rounds(hashed_password) != BCRYPT_ROUNDS
+
+def calibrate_rounds(target_ms=100, min_rounds=4, max_rounds=16):
+    """
+    Measures bcrypt on this machine and returns the highest cost whose
+    hash time stays under target_ms (never lower than min_rounds).
+    """
+    password_bytes = b"calibration-password"
+    best = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        start = time.perf_counter()
+        bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"  cost {rounds:>2}: {elapsed_ms:8.1f} ms")
+        if elapsed_ms > target_ms:
+            break
+        best = rounds
+    return best
+
+def schedule_rehash(username, plain_text_password):
+    """
+    Re-hashes a user's password at BCRYPT_ROUNDS on the shared auth executor.
+    The new hash is appended to the user file; the store keeps the latest
+    line, and `python auth.py --compact` drops the superseded ones.
+    """
+    # Imported here: auth_executor imports this module for the bcrypt helpers
+    from auth_executor import get_executor
+    get_executor().schedule_rehash(username, plain_text_password,
+                                   get_user_store(USER_DATA_FILE).append)
+
 # --- USER MANAGEMENT FUNCTIONS ---
 
 def user_exists(username):
     """
     Checks if a username already exists in the user database.
     """
-    # Handle the case where the file doesn't exist yet
-    if not os.path.exists(USER_DATA_FILE):
-        return False
-
-    # Read the file and check each line for the username
-    with open(USER_DATA_FILE, 'r') as f:
-        for line in f:
-            # Lines are format: username,hashed_password
-            stored_username = line.strip().split(',')[0]
-            if stored_username == username:
-                return True
-
-    return False
+    # The store keeps an in-memory index of users.txt, so this is a dict lookup
+    return get_user_store(USER_DATA_FILE).contains(username)
 
 def register_user(username, password):
     """
@@ -65,8 +105,7 @@ def register_user(username, password):
 
     # Append the new user to the file (Format: username,hashed_password)
     try:
-        with open(USER_DATA_FILE, 'a') as f:
-            f.write(f"{username},{hashed_password}\n")
+        get_user_store(USER_DATA_FILE).append(username, hashed_password)
         print(f"Success: User '{username}' registered successfully!")
         return True
     except IOError as e:
@@ -77,37 +116,29 @@ def login_user(username, password):
     """
     Authenticates a user by verifying their username and password.
     """
+    store = get_user_store(USER_DATA_FILE)
+
     # Handle the case where no users are registered yet
-    if not os.path.exists(USER_DATA_FILE):
+    if not store.exists():
         print("Error: No users are registered yet.")
         return False
 
-    # Search for the username in the file
-    with open(USER_DATA_FILE, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-
-            try:
-                # Use split(',', 1) in case the hash itself contains commas (though unlikely for bcrypt)
-                stored_username, stored_hash = line.split(',', 1)
-            except ValueError:
-                # Skip malformed lines
-                continue
-
-            if stored_username == username:
-                # If username matches, verify the password
-                if verify_password(password, stored_hash):
-                    print(f"Success: Welcome, {username}!")
-                    return True
-                else:
-                    print("Error: Invalid password.")
-                    return False
+    # Look the username up in the index instead of scanning the file
+    stored_hash = store.get_hash(username)
+    if stored_hash is None:
+        print("Error: Username not found.")
+        return False
 
-    # If we reach here, the username was not found
-    print("Error: Username not found.")
-    return False
+    # If username matches, verify the password
+    if verify_password(password, stored_hash):
+        # Move hashes made at an old cost to the current one
+        if needs_rehash(stored_hash):
+            schedule_rehash(username, password)
+        print(f"Success: Welcome, {username}!")
+        return True
+    else:
+        print("Error: Invalid password.")
+        return False
 
 # --- INPUT VALIDATION FUNCTIONS ---
 
@@ -208,6 +239,25 @@ def main():
         else:
             print("\nError: Invalid option. Please select 1, 2, or 3.")
 
+def compact():
+    """Rewrites the user file without superseded lines (e.g. old hashes)."""
+    removed = get_user_store(USER_DATA_FILE).compact()
+    print(f"Removed {removed} superseded line(s) from {USER_DATA_FILE}.")
+
+def calibrate(target_ms=100):
+    """Prints the recommended BCRYPT_ROUNDS for a target hash time."""
+    print(f"\nCalibrating bcrypt for a {target_ms} ms target...")
+    rounds = calibrate_rounds(target_ms)
+    print(f"\nRecommended cost: {rounds} (current: {BCRYPT_ROUNDS})")
+    print(f"Set BCRYPT_ROUNDS={rounds} to use it. Existing hashes are upgraded on login.")
+
 if __name__ == "__main__":
-    # You can safely remove the TEMPORARY TEST CODE here if you used it earlier.
-    main()
\ No newline at end of file
+    # python auth.py --calibrate [target_ms]
+    if len(sys.argv) > 1 and sys.argv[1] == "--calibrate":
+        calibrate(float(sys.argv[2]) if len(sys.argv) > 2 else 100)
+    elif len(sys.argv) > 1 and sys.argv[1] == "--compact":
+        # Run while nobody else is writing the file
+        compact()
+    else:
+        # You can safely remove the TEMPORARY TEST CODE here if you used it earlier.
+        main()
\ No newline at end of file
@@ -0,0 +1,225 @@
+import asyncio
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import auth
+from user_store import get_user_store
+
+
+class AuthBusyError(Exception):
+    """Raised when the executor queue is full and no slot frees up in time."""
+
+
+class AuthTimeoutError(Exception):
+    """Raised when a single hash/verify request takes longer than its timeout."""
+
+
+class AuthExecutor:
+    """
+    Bounded worker pool for bcrypt hashing and verification.
+
+    bcrypt releases the GIL while hashing, so the default thread pool spreads
+    concurrent logins across all cores. A process pool can be used instead
+    with use_processes=True. At most max_workers + max_queue requests are in
+    flight; further submissions wait up to submit_timeout for a free slot and
+    then fail with AuthBusyError instead of queueing forever.
+    """
+
+    def __init__(self, max_workers=None, max_queue=None, timeout=5.0,
+                 submit_timeout=1.0, use_processes=False):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = self.max_workers * 4 if max_queue is None else max_queue
+        self.timeout = timeout
+        self.submit_timeout = submit_timeout
+        pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._pool = pool_class(max_workers=self.max_workers)
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._rehash_pending = set()
+        self._rehash_lock = threading.Lock()
+
+    def _submit(self, fn, *args):
+        """Submits fn to the pool once a queue slot is free."""
+        if not self._slots.acquire(timeout=self.submit_timeout):
+            raise AuthBusyError("Authentication queue is full, try again later.")
+        try:
+            future = self._pool.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _result(self, future, timeout):
+        """Waits for a future, cancelling it if it runs past the timeout."""
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise AuthTimeoutError("Authentication request timed out.")
+
+    def _batches(self, items):
+        """Splits items into batches that fit the queue, so a burst never hits AuthBusyError."""
+        items = list(items)
+        batch_size = self.max_workers + self.max_queue
+        for start in range(0, len(items), batch_size):
+            yield items[start:start + batch_size]
+
+    def _submit_all(self, fn, args_list):
+        """Submits fn for every args tuple; on AuthBusyError cancels the ones already queued."""
+        futures = []
+        try:
+            for args in args_list:
+                futures.append(self._submit(fn, *args))
+        except AuthBusyError:
+            for future in futures:
+                future.cancel()
+            raise
+        return futures
+
+    def submit_verify(self, plain_text_password, hashed_password):
+        """Queues one password check and returns its Future."""
+        return self._submit(auth.verify_password, plain_text_password, hashed_password)
+
+    def submit_hash(self, plain_text_password):
+        """Queues one password hash and returns its Future."""
+        return self._submit(auth.hash_password, plain_text_password)
+
+    def verify(self, plain_text_password, hashed_password, timeout=None):
+        """Verifies one password on the pool."""
+        return self._result(self.submit_verify(plain_text_password, hashed_password), timeout)
+
+    def verify_many(self, pairs, timeout=None):
+        """
+        Verifies (password, hash) pairs in parallel; returns one bool per pair.
+        Raises AuthTimeoutError if a check times out (the rest are cancelled),
+        so an overloaded pool is not mistaken for a wrong password.
+        """
+        results = []
+        for batch in self._batches(pairs):
+            futures = self._submit_all(auth.verify_password, batch)
+            try:
+                for future in futures:
+                    results.append(self._result(future, timeout))
+            except AuthTimeoutError:
+                for future in futures:
+                    future.cancel()
+                raise
+        return results
+
+    def hash_many(self, passwords, timeout=None):
+        """Hashes passwords in parallel, keeping the input order."""
+        hashes = []
+        for batch in self._batches(passwords):
+            futures = self._submit_all(auth.hash_password, [(password,) for password in batch])
+            hashes.extend(self._result(future, timeout) for future in futures)
+        return hashes
+
+    async def verify_async(self, plain_text_password, hashed_password, timeout=None):
+        """Awaitable version of verify() for asyncio callers."""
+        future = asyncio.wrap_future(self.submit_verify(plain_text_password, hashed_password))
+        try:
+            return await asyncio.wait_for(future, self.timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            raise AuthTimeoutError("Authentication request timed out.")
+
+    def schedule_rehash(self, username, plain_text_password, save):
+        """
+        Re-hashes a password at BCRYPT_ROUNDS in the background and hands the
+        new hash to save(username, new_hash). At most one rehash per user is
+        pending; when the pool is busy the upgrade waits for a later login.
+        """
+        with self._rehash_lock:
+            if username in self._rehash_pending:
+                return
+            self._rehash_pending.add(username)
+
+        def rehash():
+            try:
+                save(username, auth.hash_password(plain_text_password))
+            except IOError as e:
+                print(f"Error re-hashing password for '{username}': {e}")
+            finally:
+                with self._rehash_lock:
+                    self._rehash_pending.discard(username)
+
+        try:
+            self._submit(rehash)
+        except AuthBusyError:
+            with self._rehash_lock:
+                self._rehash_pending.discard(username)
+
+    def shutdown(self, wait=True):
+        """Stops the worker pool."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Returns the shared AuthExecutor, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = AuthExecutor()
+            atexit.register(_executor.shutdown, False)
+        return _executor
+
+
+# --- BATCH / ASYNC LOGIN ---
+
+def verify_many(pairs, timeout=None):
+    """Verifies (password, hash) pairs on the shared executor."""
+    return get_executor().verify_many(pairs, timeout)
+
+
+def login_many(credentials, timeout=None):
+    """
+    Authenticates (username, password) pairs in parallel.
+    Returns one bool per pair; unknown usernames are False. Raises
+    AuthTimeoutError when the pool cannot keep up.
+    """
+    store = get_user_store(auth.USER_DATA_FILE)
+    results = [False] * len(credentials)
+    pending = []
+    for i, (username, password) in enumerate(credentials):
+        stored_hash = store.get_hash(username)
+        if stored_hash is not None:
+            pending.append((i, password, stored_hash))
+
+    checks = verify_many([(password, stored_hash) for _, password, stored_hash in pending], timeout)
+    for (i, password, stored_hash), ok in zip(pending, checks):
+        results[i] = ok
+        if ok and auth.needs_rehash(stored_hash):
+            auth.schedule_rehash(credentials[i][0], password)
+    return results
+
+
+async def login_user_async(username, password, timeout=None):
+    """
+    Async variant of auth.login_user(): the bcrypt check runs on the shared
+    executor so the event loop can serve other logins meanwhile.
+    """
+    store = get_user_store(auth.USER_DATA_FILE)
+
+    if not store.exists():
+        print("Error: No users are registered yet.")
+        return False
+
+    stored_hash = store.get_hash(username)
+    if stored_hash is None:
+        print("Error: Username not found.")
+        return False
+
+    if await get_executor().verify_async(password, stored_hash, timeout):
+        if auth.needs_rehash(stored_hash):
+            auth.schedule_rehash(username, password)
+        print(f"Success: Welcome, {username}!")
+        return True
+    else:
+        print("Error: Invalid password.")
+        return False
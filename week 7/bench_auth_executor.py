@@ -0,0 +1,48 @@
+"""
+Benchmark: login throughput with serial vs pooled bcrypt verification.
+
+A burst of logins is simulated as a list of (password, hash) pairs. The
+serial run calls verify_password() one after another on this thread, the
+pooled run sends the same burst through AuthExecutor.verify_many().
+
+Usage: python bench_auth_executor.py [logins] [bcrypt_rounds]
+"""
+import os
+import sys
+import time
+
+import bcrypt
+
+from auth import verify_password
+from auth_executor import AuthExecutor
+
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+
+    password = "Benchmark1"
+    stored_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+    pairs = [(password, stored_hash)] * logins
+
+    start = time.perf_counter()
+    for plain, hashed in pairs:
+        verify_password(plain, hashed)
+    serial = time.perf_counter() - start
+
+    executor = AuthExecutor(max_queue=logins, timeout=60)
+    start = time.perf_counter()
+    executor.verify_many(pairs)
+    pooled = time.perf_counter() - start
+    executor.shutdown()
+
+    print(f"{logins} logins at cost {rounds} on {os.cpu_count()} CPU(s)")
+    print(f"{'Mode':<10} {'Total (s)':>10} {'Logins/s':>10}")
+    print("-" * 32)
+    print(f"{'serial':<10} {serial:>10.2f} {logins / serial:>10.1f}")
+    print(f"{'pooled':<10} {pooled:>10.2f} {logins / pooled:>10.1f}")
+    print(f"Speed-up: {serial / pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
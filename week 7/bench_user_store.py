@@ -0,0 +1,68 @@
+"""
+Benchmark: username lookup latency against the number of registered users.
+
+Compares the old approach (scan users.txt line by line on every call) with
+the indexed UserStore. Fake hashes are used so the files can be generated
+quickly; bcrypt time is not part of the lookup being measured.
+
+Usage: python bench_user_store.py [max_users]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from user_store import UserStore
+
+FAKE_HASH = "$2b$12$" + "x" * 53
+
+
+def scan_lookup(path, username):
+    """The pre-index lookup: read the file until the username is found."""
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip().split(',')[0] == username:
+                return True
+    return False
+
+
+def write_users(path, count):
+    with open(path, 'w') as f:
+        f.writelines(f"user{i},{FAKE_HASH}\n" for i in range(count))
+
+
+def time_lookups(fn, names):
+    start = time.perf_counter()
+    for name in names:
+        fn(name)
+    return (time.perf_counter() - start) / len(names) * 1e6
+
+
+def main():
+    max_users = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sizes = [n for n in (1_000, 10_000, 100_000, 1_000_000) if n <= max_users]
+
+    print(f"{'Users':>10} {'Scan (us)':>14} {'Index (us)':>12} {'First load (ms)':>16}")
+    print("-" * 56)
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in sizes:
+            path = os.path.join(tmp, f"users_{count}.txt")
+            write_users(path, count)
+            names = [f"user{random.randrange(count)}" for _ in range(200)]
+
+            # Keep the scan benchmark short on large files
+            scan_names = names[:max(1, 20_000 // count)]
+            scan_us = time_lookups(lambda n: scan_lookup(path, n), scan_names)
+
+            store = UserStore(path)
+            start = time.perf_counter()
+            store.refresh()
+            load_ms = (time.perf_counter() - start) * 1000
+            index_us = time_lookups(store.contains, names)
+
+            print(f"{count:>10} {scan_us:>14.1f} {index_us:>12.2f} {load_ms:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
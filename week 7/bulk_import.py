@@ -0,0 +1,76 @@
+"""
+Bulk user import for the week 7 file backend.
+
+Reads a CSV of users (header: username,password), skips rows whose username
+or password fails the registration rules, usernames duplicated in the file
+and ones already registered, hashes the new
+passwords in parallel and appends them to users.txt in one buffered write.
+
+Usage: python bulk_import.py users.csv
+"""
+import csv
+import sys
+import time
+
+import auth
+from auth_executor import get_executor
+from user_store import get_user_store
+
+
+def read_users_csv(csv_path):
+    """Yields (username, password) rows from a CSV with a username,password header."""
+    with open(csv_path, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            username = (row.get('username') or '').strip()
+            password = (row.get('password') or '').strip()
+            yield username, password
+
+
+def import_users_from_csv(csv_path):
+    """
+    Imports new users from a CSV file.
+    Returns a dict with imported/skipped counts, elapsed seconds and rows/sec.
+    """
+    start = time.perf_counter()
+    store = get_user_store(auth.USER_DATA_FILE)
+
+    new_users = []
+    # Registered usernames, taken from the store index once; new rows are
+    # added as they are accepted so duplicates within the file are caught too
+    taken = store.usernames()
+    skipped = 0
+    for username, password in read_users_csv(csv_path):
+        # Same rules as the interactive registration
+        if (not auth.validate_username(username)[0] or not auth.validate_password(password)[0]
+                or username in taken):
+            skipped += 1
+            continue
+        taken.add(username)
+        new_users.append((username, password))
+
+    # Hash on all cores, then write every new line at once
+    hashes = get_executor().hash_many([password for _, password in new_users])
+    store.append_many(zip([username for username, _ in new_users], hashes))
+
+    elapsed = time.perf_counter() - start
+    total = len(new_users) + skipped
+    return {
+        'imported': len(new_users),
+        'skipped': skipped,
+        'seconds': elapsed,
+        'rows_per_sec': total / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python bulk_import.py users.csv")
+        return
+
+    report = import_users_from_csv(sys.argv[1])
+    print(f"Imported {report['imported']} user(s), skipped {report['skipped']} "
+          f"in {report['seconds']:.2f}s ({report['rows_per_sec']:.1f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
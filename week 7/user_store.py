@@ -0,0 +1,169 @@
+import os
+import tempfile
+import threading
+
+
+class UserStore:
+    """
+    In-memory username -> password hash index over the users.txt file.
+
+    The file is read once and then only re-read when its size or
+    modification time changes, so lookups cost one dictionary access no
+    matter how many users are registered. New users are still appended to
+    the end of the file (Format: username,hashed_password), and so is a
+    changed hash: the latest line for a user wins.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._index = {}
+        self._size = -1
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _parse_line(self, line):
+        """Returns (username, hash) for a valid line, otherwise None."""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            # split(',', 1) in case the hash itself contains commas
+            username, stored_hash = line.split(',', 1)
+        except ValueError:
+            # Skip malformed lines
+            return None
+        return username, stored_hash
+
+    def _load(self, offset=0):
+        """Reads the file from offset and adds every user found to the index."""
+        with open(self.path, 'r') as f:
+            f.seek(offset)
+            for line in f:
+                parsed = self._parse_line(line)
+                if parsed:
+                    # Later lines win (older files may hold a user more than once)
+                    self._index[parsed[0]] = parsed[1]
+
+    def refresh(self):
+        """
+        Brings the index up to date with the file on disk.
+        Only the appended tail is read when the file has grown.
+        """
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                self._index = {}
+                self._size = -1
+                self._mtime = None
+                return
+
+            if stat.st_size == self._size and stat.st_mtime_ns == self._mtime:
+                return
+
+            if self._size >= 0 and stat.st_size > self._size:
+                # File was appended to by someone else: read the new lines only
+                self._load(self._size)
+            else:
+                # First load, or the file was rewritten: rebuild from scratch
+                self._index = {}
+                self._load()
+
+            self._size = stat.st_size
+            self._mtime = stat.st_mtime_ns
+
+    def exists(self):
+        """Returns True if the backing file exists."""
+        return os.path.exists(self.path)
+
+    def get_hash(self, username):
+        """Returns the stored hash for username, or None if not registered."""
+        self.refresh()
+        return self._index.get(username)
+
+    def contains(self, username):
+        """Checks if a username is in the store."""
+        return self.get_hash(username) is not None
+
+    def usernames(self):
+        """Returns a snapshot set of the registered usernames."""
+        self.refresh()
+        with self._lock:
+            return set(self._index)
+
+    def __len__(self):
+        self.refresh()
+        return len(self._index)
+
+    def append(self, username, hashed_password):
+        """Appends one user to the file and to the index."""
+        self.append_many([(username, hashed_password)])
+
+    def append_many(self, users):
+        """Appends (username, hash) pairs to the file in one buffered write."""
+        users = list(users)
+        if not users:
+            return
+        self.refresh()
+        data = "".join(f"{username},{hashed}\n" for username, hashed in users)
+        with self._lock:
+            with open(self.path, 'a') as f:
+                f.write(data)
+            stat = os.stat(self.path)
+            # Only skip the re-read if nobody else wrote in between
+            expected = self._size if self._size >= 0 else 0
+            if stat.st_size == expected + len(data.encode('utf-8')):
+                for username, hashed in users:
+                    self._index[username] = hashed
+                self._size = stat.st_size
+                self._mtime = stat.st_mtime_ns
+
+    def compact(self):
+        """
+        Rewrites the file keeping only the latest line per user. Rehashes
+        append a new line, so superseded hashes pile up until this is run.
+        The new file is written next to the old one and swapped in
+        atomically; lines appended meanwhile are copied over first, but run
+        it while no other process is registering users. Returns the number
+        of lines removed.
+        """
+        with self._lock:
+            with open(self.path, 'r') as f:
+                lines = f.readlines()
+                read_size = f.tell()
+            latest = {}
+            for line in lines:
+                parsed = self._parse_line(line)
+                if parsed:
+                    latest[parsed[0]] = parsed[1]
+            kept = [f"{username},{hashed}\n" for username, hashed in latest.items()]
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".users-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.writelines(kept)
+                    # Keep anything appended since the read
+                    with open(self.path, 'r') as current:
+                        current.seek(read_size)
+                        f.write(current.read())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            # Re-read the compacted file on the next lookup
+            self._size = -1
+            self._mtime = None
+        return len(lines) - len(kept)
+
+
+_stores = {}
+
+
+def get_user_store(path):
+    """Returns the shared UserStore for path, creating it on first use."""
+    key = os.path.abspath(path)
+    store = _stores.get(key)
+    if store is None:
+        store = _stores[key] = UserStore(path)
+    return store
@@ -0,0 +1,138 @@
+"""
+SQL-side aggregations behind the dashboard charts.
+
+Each function runs one parameterized GROUP BY in SQLite and returns a small
+DataFrame (one row per group), so chart data never pulls the whole table
+into Python. filters use the same format as app/data/readers.py.
+Plain counts over summary keys are answered from the trigger-maintained
+summary tables in app/data/summaries.py instead.
+"""
+import pandas as pd
+
+from app.data.ingest import get_table_columns
+from app.data.readers import build_where, DATE_COLUMNS
+from app.data.summaries import can_serve, summary_exists, summary_counts
+
+# SQL expressions that map a YYYY-MM-DD column to the start of its bucket
+TIME_BUCKETS = {
+    "day": "date({col})",
+    "week": "date({col}, 'weekday 0', '-6 days')",   # Monday of that week
+    "month": "strftime('%Y-%m-01', {col})",
+}
+
+AGGREGATES = {"count", "sum", "avg", "min", "max"}
+
+
+def aggregate(conn, table, group_by=(), filters=None, value=None, agg="count",
+              time_bucket=None, date_column=None, value_name=None):
+    """
+    Run SELECT <groups>, <agg>(value) FROM table WHERE <filters> GROUP BY <groups>.
+
+    group_by: column names to group on.
+    time_bucket: "day", "week" or "month" adds a "bucket" group on
+        date_column (default: the table's date column from DATE_COLUMNS).
+    agg/value: count(*) by default, or sum/avg/min/max of a column.
+    Returns a DataFrame with the group columns (and "bucket") plus the
+    value column, named value_name (default "count" or "<agg>_<value>").
+    """
+    table_columns = get_table_columns(conn, table)
+    group_by = list(group_by)
+    for column in group_by + ([value] if value else []):
+        if column not in table_columns:
+            raise ValueError(f"Unknown column for {table}: {column}")
+    if agg not in AGGREGATES:
+        raise ValueError(f"agg must be one of {', '.join(sorted(AGGREGATES))}")
+    if agg != "count" and not value:
+        raise ValueError(f"agg='{agg}' needs a value column")
+
+    name = value_name or ("count" if agg == "count" else f"{agg}_{value}")
+    if (not time_bucket and agg == "count" and not value
+            and can_serve(table, group_by, filters) and summary_exists(conn, table)):
+        return summary_counts(conn, table, group_by, filters).rename(columns={"count": name})
+
+    select, groups = [], []
+    if time_bucket:
+        if time_bucket not in TIME_BUCKETS:
+            raise ValueError(f"time_bucket must be one of {', '.join(TIME_BUCKETS)}")
+        column = date_column or DATE_COLUMNS[table]
+        if column not in table_columns:
+            raise ValueError(f"Unknown date column for {table}: {column}")
+        select.append(f"{TIME_BUCKETS[time_bucket].format(col=column)} AS bucket")
+        groups.append("bucket")
+    select.extend(group_by)
+    groups.extend(group_by)
+
+    measure = "COUNT(*)" if agg == "count" and not value else f"{agg.upper()}({value})"
+    select.append(f"{measure} AS {name}")
+
+    where, params = build_where(filters, table_columns)
+    if time_bucket:
+        # Rows without a date cannot be bucketed
+        column = date_column or DATE_COLUMNS[table]
+        where = " AND ".join(filter(None, [where, f"{column} IS NOT NULL"]))
+
+    sql = f"SELECT {', '.join(select)} FROM {table}"
+    if where:
+        sql += f" WHERE {where}"
+    if groups:
+        sql += f" GROUP BY {', '.join(groups)} ORDER BY {', '.join(groups)}"
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+# --- Dashboard chart queries ---
+def incidents_by_type(conn, filters=None, time_bucket=None):
+    """Incident counts per incident_type."""
+    return aggregate(conn, "cyber_incidents", ["incident_type"], filters, time_bucket=time_bucket)
+
+
+def incidents_by_severity(conn, filters=None, time_bucket=None):
+    """Incident counts per severity."""
+    return aggregate(conn, "cyber_incidents", ["severity"], filters, time_bucket=time_bucket)
+
+
+def incident_volume(conn, filters=None, time_bucket="day"):
+    """Incident counts per time bucket."""
+    return aggregate(conn, "cyber_incidents", [], filters, time_bucket=time_bucket)
+
+
+def tickets_by_priority(conn, filters=None, time_bucket=None):
+    """Ticket counts per priority."""
+    return aggregate(conn, "it_tickets", ["priority"], filters, time_bucket=time_bucket)
+
+
+def tickets_by_status(conn, filters=None, time_bucket=None):
+    """Ticket counts per status."""
+    return aggregate(conn, "it_tickets", ["status"], filters, time_bucket=time_bucket)
+
+
+def tickets_by_assignee(conn, filters=None, time_bucket=None):
+    """Ticket counts per assigned_to."""
+    return aggregate(conn, "it_tickets", ["assigned_to"], filters, time_bucket=time_bucket)
+
+
+def ticket_volume(conn, filters=None, time_bucket="day"):
+    """Ticket counts per time bucket of created_date."""
+    return aggregate(conn, "it_tickets", [], filters, time_bucket=time_bucket)
+
+
+def datasets_by_category(conn, filters=None):
+    """Dataset counts per category."""
+    return aggregate(conn, "datasets_metadata", ["category"], filters)
+
+
+def datasets_by_source(conn, filters=None):
+    """Dataset counts per source."""
+    return aggregate(conn, "datasets_metadata", ["source"], filters)
+
+
+def dataset_size_over_time(conn, filters=None, time_bucket=None):
+    """
+    Total file_size_mb per last_updated date (or per day/week/month bucket).
+    Columns: last_updated, file_size_mb - the shape the size chart expects.
+    """
+    if time_bucket:
+        df = aggregate(conn, "datasets_metadata", [], filters, value="file_size_mb", agg="sum",
+                       time_bucket=time_bucket, value_name="file_size_mb")
+        return df.rename(columns={"bucket": "last_updated"})
+    return aggregate(conn, "datasets_metadata", ["last_updated"], filters, value="file_size_mb",
+                     agg="sum", value_name="file_size_mb")
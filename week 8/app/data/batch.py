@@ -0,0 +1,71 @@
+"""Generic batched insert/update/delete helpers (one transaction per call)."""
+from app.data.db import atomic
+
+# Max ids per IN (...) lookup, well under SQLite's bound-parameter limit
+ID_CHUNK_SIZE = 500
+
+
+def as_rows(items, columns):
+    """Turn dicts (keyed by column) or sequences into tuples in column order."""
+    rows = []
+    for item in items:
+        if isinstance(item, dict):
+            rows.append(tuple(item.get(column) for column in columns))
+        else:
+            rows.append(tuple(item))
+    return rows
+
+
+def existing_ids(conn, table, ids):
+    """Return the subset of ids present in table, in input order."""
+    ids = list(dict.fromkeys(ids))
+    found = set()
+    for start in range(0, len(ids), ID_CHUNK_SIZE):
+        chunk = ids[start:start + ID_CHUNK_SIZE]
+        placeholders = ",".join("?" * len(chunk))
+        found.update(row[0] for row in conn.execute(
+            f"SELECT id FROM {table} WHERE id IN ({placeholders})", chunk))
+    return [i for i in ids if i in found]
+
+
+def insert_many(conn, table, columns, items):
+    """
+    Insert rows with one executemany in one transaction.
+    Returns (new_ids, count).
+    """
+    rows = as_rows(items, columns)
+    if not rows:
+        return [], 0
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    with atomic(conn):
+        # AUTOINCREMENT ids only grow, and the write lock is held until
+        # commit, so every id above the previous maximum is one of ours
+        last_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+        conn.executemany(sql, rows)
+        new_ids = [row[0] for row in conn.execute(
+            f"SELECT id FROM {table} WHERE id > ? ORDER BY id", (last_id,))]
+    return new_ids, len(new_ids)
+
+
+def update_many(conn, table, assignments, ids):
+    """
+    Apply the same column assignments ({column: value}) to every id.
+    Returns (updated_ids, count).
+    """
+    if not assignments:
+        raise ValueError("update_many() needs at least one column to set.")
+    columns = list(assignments)
+    values = [assignments[column] for column in columns]
+    sql = f"UPDATE {table} SET {', '.join(f'{column} = ?' for column in columns)} WHERE id = ?"
+    with atomic(conn):
+        found = existing_ids(conn, table, ids)
+        cursor = conn.executemany(sql, [(*values, i) for i in found])
+    return found, cursor.rowcount if found else 0
+
+
+def delete_many(conn, table, ids):
+    """Delete every id in one transaction. Returns (deleted_ids, count)."""
+    with atomic(conn):
+        found = existing_ids(conn, table, ids)
+        cursor = conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(i,) for i in found])
+    return found, cursor.rowcount if found else 0
@@ -1,11 +1,39 @@
-from app.data.db import connect_database
+from app.data.db import get_connection, transaction
+from app.data.batch import insert_many, update_many, delete_many
+from app.data.readers import read_page, iter_chunks, DEFAULT_PAGE_SIZE
 
 def insert_dataset(name, description, source, created_at):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO datasets_metadata (name, description, source, created_at)
-        VALUES (?, ?, ?, ?)
-    """, (name, description, source, created_at))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("""
+            INSERT INTO datasets_metadata (name, description, source, created_at)
+            VALUES (?, ?, ?, ?)
+        """, (name, description, source, created_at))
+
+# --- Batched variants: one transaction / executemany per call ---
+DATASET_COLUMNS = ("dataset_name", "category", "source", "last_updated", "record_count", "file_size_mb")
+
+def insert_datasets_many(datasets):
+    """Insert datasets (dicts or tuples in DATASET_COLUMNS order). Returns (ids, count)."""
+    return insert_many(get_connection(), "datasets_metadata", DATASET_COLUMNS, datasets)
+
+def update_datasets_many(dataset_ids, **changes):
+    """Apply the same column changes to many datasets, e.g. category="Archive". Returns (ids, count)."""
+    unknown = set(changes) - set(DATASET_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown dataset column(s): {', '.join(sorted(unknown))}")
+    return update_many(get_connection(), "datasets_metadata", changes, dataset_ids)
+
+def delete_datasets_many(dataset_ids):
+    """Delete many datasets at once. Returns (deleted_ids, count)."""
+    return delete_many(get_connection(), "datasets_metadata", dataset_ids)
+
+
+# --- Paginated / streaming readers ---
+def get_datasets_page(columns=None, filters=None, order_by="id", after=None,
+                     limit=DEFAULT_PAGE_SIZE, conn=None):
+    """One keyset page of datasets. Returns (DataFrame, next_cursor)."""
+    return read_page(conn or get_connection(), "datasets_metadata", columns, filters, order_by, after, limit)
+
+def iter_datasets(chunk_size=DEFAULT_PAGE_SIZE, columns=None, filters=None, order_by="id", conn=None):
+    """Yield datasets as DataFrames of at most chunk_size rows."""
+    return iter_chunks(conn or get_connection(), "datasets_metadata", chunk_size, columns, filters, order_by)
@@ -1,10 +1,150 @@
+import itertools
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
-DATA_DIR = Path("DATA")
+# Resolve DATA next to the week 8 package so other apps (e.g. the week 9
+# dashboards) open the same database regardless of their working directory
+DATA_DIR = Path(__file__).resolve().parents[2] / "DATA"
 DB_PATH = DATA_DIR / "intelligence_platform.db"
 
-def connect_database(db_path=DB_PATH):
+# PRAGMA settings applied to every new connection, by profile name.
+# "default" suits the dashboards and app helpers (WAL lets readers run
+# while a writer commits), "ingest" trades durability for bulk load speed,
+# "safe" fsyncs on every commit.
+PRAGMA_PROFILES = {
+    "default": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,       # negative = KiB, so 64 MB
+        "mmap_size": 268435456,     # 256 MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,       # ms to wait for a lock before failing
+    },
+    "ingest": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+}
+
+DEFAULT_PROFILE = os.environ.get("DB_PROFILE", "default")
+# Number of compiled statements each connection keeps (sqlite3 cached_statements)
+STATEMENT_CACHE_SIZE = int(os.environ.get("DB_STATEMENT_CACHE_SIZE", 256))
+
+
+def apply_pragmas(conn, profile=None):
+    """Apply a PRAGMA profile to an open connection."""
+    for name, value in PRAGMA_PROFILES[profile or DEFAULT_PROFILE].items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def connect_database(db_path=DB_PATH, profile=None):
     """Connect to SQLite database."""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
-    return sqlite3.connect(str(db_path))
+    conn = sqlite3.connect(str(db_path), cached_statements=STATEMENT_CACHE_SIZE)
+    apply_pragmas(conn, profile)
+    return conn
+
+
+_savepoint_ids = itertools.count()
+
+
+@contextmanager
+def atomic(conn, immediate=True):
+    """
+    Run a block in one transaction on any connection: commit on success,
+    roll back on error. Inside an open transaction it uses a savepoint, so
+    a failing inner block only undoes its own part.
+    """
+    if conn.in_transaction:
+        name = f"sp_{next(_savepoint_ids)}"
+        conn.execute(f"SAVEPOINT {name}")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute(f"ROLLBACK TO {name}")
+            conn.execute(f"RELEASE {name}")
+            raise
+        conn.execute(f"RELEASE {name}")
+        return
+
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+# --- Managed connections ---
+class ConnectionManager:
+    """
+    Keeps one open connection per thread, database and profile, so helpers
+    reuse it instead of connecting and closing around every query.
+
+    Managed connections run in autocommit mode; group writes with
+    transaction(), which commits on success and rolls back on error.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _connections(self):
+        if not hasattr(self._local, "connections"):
+            self._local.connections = {}
+        return self._local.connections
+
+    def get_connection(self, db_path=DB_PATH, profile=None):
+        """Return this thread's connection, opening it on first use."""
+        key = (str(db_path), profile or DEFAULT_PROFILE)
+        connections = self._connections()
+        conn = connections.get(key)
+        if conn is None:
+            conn = connect_database(db_path, profile)
+            conn.isolation_level = None
+            connections[key] = conn
+        return conn
+
+    def transaction(self, db_path=DB_PATH, profile=None, immediate=True):
+        """Run a block in one transaction on this thread's connection."""
+        return atomic(self.get_connection(db_path, profile), immediate)
+
+    def close_all(self):
+        """Close every connection opened by the current thread."""
+        connections = self._connections()
+        for conn in connections.values():
+            conn.close()
+        connections.clear()
+
+
+_manager = ConnectionManager()
+
+
+def get_connection(db_path=DB_PATH, profile=None):
+    """Return the calling thread's managed connection."""
+    return _manager.get_connection(db_path, profile)
+
+
+def transaction(db_path=DB_PATH, profile=None, immediate=True):
+    """Context manager: `with transaction() as conn:` commits or rolls back."""
+    return _manager.transaction(db_path, profile, immediate)
+
+
+def close_connections():
+    """Close the calling thread's managed connections."""
+    _manager.close_all()
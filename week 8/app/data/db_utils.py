@@ -1,8 +1,22 @@
-# Function to be used in main.py or a helper file
+# CSV loading helpers used by main.py
+from pathlib import Path
+
+from app.data.db import DATA_DIR
+from app.data.ingest import ingest_csv_incremental
+
+# Source CSV for each domain table
+CSV_SOURCES = {
+    "cyber_incidents": DATA_DIR / "cyber_incidents_1000.csv",
+    "datasets_metadata": DATA_DIR / "datasets_metadata_1000.csv",
+    "it_tickets": DATA_DIR / "it_tickets_1000.csv",
+}
+
 
-# NOTE: Requires pandas, connect_database, and DATA_DIR from imports
 def load_csv_to_table(conn, csv_path, table_name):
-    """Load a CSV file into a database table using pandas."""
+    """
+    Load new rows from a CSV file into a database table.
+    Files already recorded in ingest_manifest only load what changed.
+    """
     csv_file = Path(csv_path)
 
     if not csv_file.exists():
@@ -10,15 +24,24 @@ def load_csv_to_table(conn, csv_path, table_name):
         return 0
 
     try:
-        df = pd.read_csv(csv_file)
-        rows_loaded = df.to_sql(
-            name=table_name,
-            con=conn,
-            if_exists='append',
-            index=False
-        )
-        print(f" Loaded {rows_loaded} rows into {table_name} from {csv_file.name}.")
-        return rows_loaded
+        report = ingest_csv_incremental(conn, csv_file, table_name)
+        if report['mode'] == "unchanged":
+            print(f" {csv_file.name} unchanged since last load. Skipping {table_name}.")
+            return 0
+        print(f" Loaded {report['rows']} new rows ({report['mode']}) into {table_name} "
+              f"from {csv_file.name} in {report['seconds']:.2f}s "
+              f"({report['rows_per_sec']:,.0f} rows/sec).")
+        if report['mode'] == "rewritten":
+            print(f" {csv_file.name} changed before its last loaded row; rows already in "
+                  f"{table_name} were kept as they were; rebuild the database to reload them.")
+        if report['conflicts']:
+            ids = ", ".join(map(str, report['conflicts'][:10]))
+            more = " ..." if len(report['conflicts']) > 10 else ""
+            print(f" Skipped {len(report['conflicts'])} row(s) whose id is already in {table_name}: "
+                  f"{ids}{more}")
+        if report['ignored']:
+            print(f" Ignored CSV columns not in {table_name}: {', '.join(report['ignored'])}")
+        return report['rows']
     except Exception as e:
         print(f"Error loading CSV {csv_file.name} into {table_name}: {e}")
         return 0
@@ -27,7 +50,6 @@ def load_csv_to_table(conn, csv_path, table_name):
 def load_all_csv_data(conn):
     """Load data for all three main tables."""
     total_rows = 0
-    total_rows += load_csv_to_table(conn, DATA_DIR / "cyber_incidents.csv", "cyber_incidents")
-    total_rows += load_csv_to_table(conn, DATA_DIR / "datasets_metadata.csv", "datasets_metadata")
-    total_rows += load_csv_to_table(conn, DATA_DIR / "it_tickets.csv", "it_tickets")
-    return total_rows
\ No newline at end of file
+    for table_name, csv_path in CSV_SOURCES.items():
+        total_rows += load_csv_to_table(conn, csv_path, table_name)
+    return total_rows
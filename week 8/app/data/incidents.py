@@ -1,5 +1,7 @@
 import pandas as pd
 from app.data.db import connect_database
+from app.data.batch import insert_many, update_many, delete_many
+from app.data.readers import read_page, iter_chunks, DEFAULT_PAGE_SIZE
 
 def insert_incident(conn, date, incident_type, severity, status, description, reported_by=None):
     cursor = conn.cursor()
@@ -13,6 +15,15 @@ def insert_incident(conn, date, incident_type, severity, status, description, re
 def get_all_incidents(conn):
     return pd.read_sql_query("SELECT * FROM cyber_incidents", conn)
 
+def get_incidents_page(conn, columns=None, filters=None, order_by="id", after=None,
+                       limit=DEFAULT_PAGE_SIZE):
+    """One keyset page of incidents. Returns (DataFrame, next_cursor)."""
+    return read_page(conn, "cyber_incidents", columns, filters, order_by, after, limit)
+
+def iter_incidents(conn, chunk_size=DEFAULT_PAGE_SIZE, columns=None, filters=None, order_by="id"):
+    """Yield incidents as DataFrames of at most chunk_size rows."""
+    return iter_chunks(conn, "cyber_incidents", chunk_size, columns, filters, order_by)
+
 def update_incident_status(conn, incident_id, new_status):
     cursor = conn.cursor()
     cursor.execute("UPDATE cyber_incidents SET status = ? WHERE id = ?", (new_status, incident_id))
@@ -24,3 +35,18 @@ def delete_incident(conn, incident_id):
     cursor.execute("DELETE FROM cyber_incidents WHERE id = ?", (incident_id,))
     conn.commit()
     return cursor.rowcount
+
+# --- Batched variants: one transaction / executemany per call ---
+INCIDENT_COLUMNS = ("date", "incident_type", "severity", "status", "description", "reported_by")
+
+def insert_incidents_many(conn, incidents):
+    """Insert incidents (dicts or tuples in INCIDENT_COLUMNS order). Returns (ids, count)."""
+    return insert_many(conn, "cyber_incidents", INCIDENT_COLUMNS, incidents)
+
+def update_incident_status_many(conn, incident_ids, new_status):
+    """Set the status of many incidents at once. Returns (updated_ids, count)."""
+    return update_many(conn, "cyber_incidents", {"status": new_status}, incident_ids)
+
+def delete_incidents_many(conn, incident_ids):
+    """Delete many incidents at once. Returns (deleted_ids, count)."""
+    return delete_many(conn, "cyber_incidents", incident_ids)
@@ -0,0 +1,164 @@
+"""Secondary indexes for the dashboard access paths and query-plan checks."""
+
+# name -> (table, columns). Column order puts equality filters first so any
+# leading subset of the sidebar filters can use the index; trailing columns
+# make the index covering for the matching group-by.
+INDEXES = {
+    # cyber_incidents: filters on incident_type / severity / status, counts by type and severity
+    "idx_incidents_type_severity_status": ("cyber_incidents", ("incident_type", "severity", "status")),
+    "idx_incidents_severity_status_type": ("cyber_incidents", ("severity", "status", "incident_type")),
+    "idx_incidents_status_type": ("cyber_incidents", ("status", "incident_type", "severity")),
+    "idx_incidents_date": ("cyber_incidents", ("date",)),
+
+    # it_tickets: filters on priority / status / assigned_to, counts by each
+    "idx_tickets_priority_status_assigned": ("it_tickets", ("priority", "status", "assigned_to")),
+    "idx_tickets_status_assigned_priority": ("it_tickets", ("status", "assigned_to", "priority")),
+    "idx_tickets_assigned_priority_status": ("it_tickets", ("assigned_to", "priority", "status")),
+    "idx_tickets_created_date": ("it_tickets", ("created_date",)),
+
+    # datasets_metadata: filters on dataset_name / category / source, size over time
+    "idx_datasets_category_source": ("datasets_metadata", ("category", "source", "dataset_name")),
+    "idx_datasets_source_category": ("datasets_metadata", ("source", "category")),
+    "idx_datasets_name": ("datasets_metadata", ("dataset_name", "category", "source")),
+    "idx_datasets_updated_size": ("datasets_metadata", ("last_updated", "file_size_mb")),
+}
+
+# Query shapes the app and dashboards run: (name, sql, params).
+# check_query_plans() requires every one of them to use an index.
+SHIPPED_QUERIES = [
+    ("user by username", "SELECT * FROM users WHERE username = ?", ("u",)),
+    ("incident by id", "UPDATE cyber_incidents SET status = ? WHERE id = ?", ("Closed", 1)),
+
+    ("incidents by type", "SELECT * FROM cyber_incidents WHERE incident_type = ?", ("Phishing",)),
+    ("incidents by severity", "SELECT * FROM cyber_incidents WHERE severity = ?", ("High",)),
+    ("incidents by status", "SELECT * FROM cyber_incidents WHERE status = ?", ("Open",)),
+    ("incidents by type+severity+status",
+     "SELECT * FROM cyber_incidents WHERE incident_type = ? AND severity = ? AND status = ?",
+     ("Phishing", "High", "Open")),
+    ("incidents by severity+status",
+     "SELECT * FROM cyber_incidents WHERE severity = ? AND status = ?", ("High", "Open")),
+    ("incidents by type+status",
+     "SELECT * FROM cyber_incidents WHERE incident_type = ? AND status = ?", ("Phishing", "Open")),
+    ("incidents in date range",
+     "SELECT * FROM cyber_incidents WHERE date BETWEEN ? AND ?", ("2024-01-01", "2024-01-31")),
+    ("incident counts by type",
+     "SELECT incident_type, COUNT(*) FROM cyber_incidents GROUP BY incident_type", ()),
+    ("incident counts by type for severity",
+     "SELECT incident_type, COUNT(*) FROM cyber_incidents WHERE severity = ? GROUP BY incident_type",
+     ("High",)),
+    ("incident counts by severity",
+     "SELECT severity, COUNT(*) FROM cyber_incidents GROUP BY severity", ()),
+    ("incident counts by severity for status",
+     "SELECT severity, COUNT(*) FROM cyber_incidents WHERE status = ? GROUP BY severity", ("Open",)),
+
+    ("tickets by priority", "SELECT * FROM it_tickets WHERE priority = ?", ("High",)),
+    ("tickets by status", "SELECT * FROM it_tickets WHERE status = ?", ("Open",)),
+    ("tickets by assignee", "SELECT * FROM it_tickets WHERE assigned_to = ?", ("Technician A",)),
+    ("tickets by priority+status+assignee",
+     "SELECT * FROM it_tickets WHERE priority = ? AND status = ? AND assigned_to = ?",
+     ("High", "Open", "Technician A")),
+    ("tickets by status+assignee",
+     "SELECT * FROM it_tickets WHERE status = ? AND assigned_to = ?", ("Open", "Technician A")),
+    ("tickets in date range",
+     "SELECT * FROM it_tickets WHERE created_date BETWEEN ? AND ?", ("2024-01-01", "2024-01-31")),
+    ("ticket counts by priority",
+     "SELECT priority, COUNT(*) FROM it_tickets GROUP BY priority", ()),
+    ("ticket counts by status",
+     "SELECT status, COUNT(*) FROM it_tickets GROUP BY status", ()),
+    ("open tickets per assignee",
+     "SELECT assigned_to, COUNT(*) FROM it_tickets WHERE status = ? GROUP BY assigned_to", ("Open",)),
+
+    ("datasets by category", "SELECT * FROM datasets_metadata WHERE category = ?", ("Security",)),
+    ("datasets by source", "SELECT * FROM datasets_metadata WHERE source = ?", ("Internal",)),
+    ("datasets by name", "SELECT * FROM datasets_metadata WHERE dataset_name = ?", ("System Event Logs",)),
+    ("dataset counts by category",
+     "SELECT category, COUNT(*) FROM datasets_metadata GROUP BY category", ()),
+    ("dataset counts by source",
+     "SELECT source, COUNT(*) FROM datasets_metadata GROUP BY source", ()),
+    ("dataset size over time",
+     "SELECT last_updated, SUM(file_size_mb) FROM datasets_metadata GROUP BY last_updated", ()),
+
+    # Time-bucketed trends from app/data/aggregations.py
+    ("incident volume by month",
+     "SELECT strftime('%Y-%m-01', date) AS bucket, COUNT(*) AS count FROM cyber_incidents "
+     "WHERE date IS NOT NULL GROUP BY bucket ORDER BY bucket", ()),
+    ("ticket volume by day for status",
+     "SELECT date(created_date) AS bucket, COUNT(*) AS count FROM it_tickets "
+     "WHERE status = ? AND created_date IS NOT NULL GROUP BY bucket ORDER BY bucket", ("Open",)),
+
+    # Headline counts from the summary tables in app/data/summaries.py
+    ("open tickets per assignee (summary)",
+     "SELECT NULLIF(assigned_to, '') AS assigned_to, COALESCE(SUM(row_count), 0) AS count "
+     "FROM ticket_summary WHERE status = ? GROUP BY assigned_to ORDER BY assigned_to", ("Open",)),
+
+    # Keyset pages from app/data/readers.py
+    ("incident page by id",
+     "SELECT * FROM cyber_incidents WHERE id > ? ORDER BY id LIMIT ?", (0, 1000)),
+    ("incident page by date",
+     "SELECT * FROM cyber_incidents WHERE (date, id) > (?, ?) ORDER BY date, id LIMIT ?",
+     ("2024-01-01", 0, 1000)),
+    ("filtered incident page by id",
+     "SELECT * FROM cyber_incidents WHERE severity = ? AND id > ? ORDER BY id LIMIT ?",
+     ("High", 0, 1000)),
+    ("ticket page by date",
+     "SELECT * FROM it_tickets WHERE (created_date, id) > (?, ?) ORDER BY created_date, id LIMIT ?",
+     ("2024-01-01", 0, 1000)),
+    ("dataset page by date",
+     "SELECT * FROM datasets_metadata WHERE (last_updated, id) > (?, ?) ORDER BY last_updated, id LIMIT ?",
+     ("2024-01-01", 0, 1000)),
+]
+
+
+class QueryPlanError(Exception):
+    """Raised when a shipped query would scan a table instead of using an index."""
+
+
+def create_indexes(conn):
+    """Create every index in INDEXES (no-op for the ones that exist)."""
+    cursor = conn.cursor()
+    for name, (table, columns) in INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+    conn.commit()
+    # Refresh planner statistics for the new indexes
+    cursor.execute("PRAGMA optimize")
+
+
+def drop_indexes(conn):
+    """Drop every index in INDEXES (used by the benchmark)."""
+    cursor = conn.cursor()
+    for name in INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.commit()
+
+
+def explain(conn, sql, params=()):
+    """Return the EXPLAIN QUERY PLAN detail lines for a query."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def is_table_scan(detail):
+    """
+    True for plan lines that visit every row of a table. Only index-only
+    scans ("SCAN t USING COVERING INDEX ...") are allowed: they read the
+    much smaller index and never touch the table. A plain "USING INDEX"
+    scan still walks every row and looks each one up in the table.
+    """
+    return detail.startswith("SCAN ") and " USING COVERING INDEX " not in detail
+
+
+def check_query_plans(conn, queries=None):
+    """
+    Run EXPLAIN QUERY PLAN on each shipped query.
+    Returns {name: plan_lines}; raises QueryPlanError if any query scans a table.
+    """
+    plans = {}
+    failures = []
+    for name, sql, params in (queries or SHIPPED_QUERIES):
+        plan = explain(conn, sql, params)
+        plans[name] = plan
+        scans = [detail for detail in plan if is_table_scan(detail)]
+        if scans:
+            failures.append(f"{name}: {'; '.join(scans)}")
+    if failures:
+        raise QueryPlanError("Queries falling back to a table scan:\n  " + "\n  ".join(failures))
+    return plans
@@ -0,0 +1,381 @@
+import csv
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from app.data.db import apply_pragmas, DEFAULT_PROFILE
+
+# Rows per executemany call / transaction
+DEFAULT_CHUNK_SIZE = 50_000
+
+# CSV header names that differ from the schema column they belong to
+COLUMN_ALIASES = {
+    "datasets_metadata": {"name": "dataset_name"},
+    "it_tickets": {"title": "subject"},
+}
+
+
+def get_table_columns(conn, table_name):
+    """Return the column names of a table as created by app/data/schema.py."""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")]
+
+
+def map_csv_columns(conn, table_name, header):
+    """
+    Match CSV header names to table columns (case/space-insensitive, plus
+    COLUMN_ALIASES). Returns (csv_positions, table_columns, ignored_headers).
+    """
+    columns = get_table_columns(conn, table_name)
+    if not columns:
+        raise ValueError(f"Table '{table_name}' does not exist.")
+    by_name = {column.lower(): column for column in columns}
+    aliases = COLUMN_ALIASES.get(table_name, {})
+
+    positions, mapped, ignored = [], [], []
+    for i, name in enumerate(header):
+        key = name.strip().lower()
+        column = by_name.get(aliases.get(key, key))
+        if column is None or column in mapped:
+            ignored.append(name)
+            continue
+        positions.append(i)
+        mapped.append(column)
+    return positions, mapped, ignored
+
+
+def print_progress(table_name, rows, elapsed):
+    """Default progress callback."""
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"   {table_name}: {rows:,} rows ({rate:,.0f} rows/sec)")
+
+
+def iter_csv_chunks(reader, positions, chunk_size):
+    """Yield lists of row tuples (only mapped columns, '' as NULL) from a csv reader."""
+    chunk = []
+    for record in reader:
+        if not record:
+            continue
+        chunk.append(tuple(
+            (record[i] if i < len(record) and record[i] != "" else None) for i in positions
+        ))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def insert_chunks(conn, table_name, columns, chunks, on_conflict=None, progress=print_progress,
+                  on_chunk=None):
+    """
+    Insert row chunks with executemany, one transaction per chunk, under the
+    "ingest" PRAGMA profile. on_chunk(conn, inserted), if given, runs inside
+    each chunk's transaction just before it commits, with the chunk's row count.
+    Returns the number of rows inserted (rows skipped by on_conflict and
+    trigger writes are not counted).
+    """
+    verb = f"INSERT OR {on_conflict}" if on_conflict else "INSERT"
+    sql = (f"{verb} INTO {table_name} ({', '.join(columns)}) "
+           f"VALUES ({', '.join('?' * len(columns))})")
+
+    apply_pragmas(conn, "ingest")
+    start = time.perf_counter()
+    inserted = 0
+    try:
+        for chunk in chunks:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            # rowcount counts the statement's own rows, not the writes made
+            # by triggers (FTS index, summary tables) on the same table
+            count = conn.executemany(sql, chunk).rowcount
+            inserted += count
+            if on_chunk:
+                on_chunk(conn, count)
+            conn.commit()
+            if progress:
+                progress(table_name, inserted, time.perf_counter() - start)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        apply_pragmas(conn, DEFAULT_PROFILE)
+    return inserted
+
+
+def ingest_csv(conn, csv_path, table_name, chunk_size=DEFAULT_CHUNK_SIZE,
+               on_conflict=None, progress=print_progress):
+    """
+    Stream a CSV into a table in fixed-size chunks, so memory stays flat no
+    matter how big the file is.
+
+    Returns a report dict: rows, seconds, rows_per_sec, columns, ignored.
+    """
+    csv_file = Path(csv_path)
+    start = time.perf_counter()
+
+    with open(csv_file, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return {"rows": 0, "seconds": 0.0, "rows_per_sec": 0.0, "columns": [], "ignored": []}
+
+        positions, columns, ignored = map_csv_columns(conn, table_name, header)
+        rows = insert_chunks(
+            conn, table_name, columns,
+            iter_csv_chunks(reader, positions, chunk_size),
+            on_conflict=on_conflict, progress=progress,
+        )
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed > 0 else 0.0,
+        "columns": columns,
+        "ignored": ignored,
+    }
+
+
+# --- Incremental, manifest-driven ingestion ---
+# Bytes ending at the stored offset that are compared first: a change there
+# rules out an append without hashing the whole ingested prefix
+CHECKSUM_WINDOW = 64 * 1024
+# Read size when hashing the ingested prefix
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class TrackedLines:
+    """
+    Iterates a binary file as decoded text lines while keeping the byte
+    offset of everything consumed so far, and a running sha256 of those
+    bytes. csv.reader pulls lines lazily, so after each record the offset
+    (and hash) sits exactly at the end of that record.
+    """
+
+    def __init__(self, f, offset=0, hasher=None):
+        self._f = f
+        self.offset = offset
+        self.hasher = hasher if hasher is not None else hashlib.sha256()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self._f.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        self.hasher.update(line)
+        return line.decode("utf-8")
+
+
+def hash_window(f, end, size=CHECKSUM_WINDOW):
+    """sha256 hex digest of the size bytes of f that end at offset end."""
+    start = max(0, end - size)
+    f.seek(start)
+    return hashlib.sha256(f.read(end - start)).hexdigest()
+
+
+def hash_prefix(f, end):
+    """sha256 of the first end bytes of f, read in blocks; f is left at end."""
+    hasher = hashlib.sha256()
+    f.seek(0)
+    remaining = end
+    while remaining > 0:
+        block = f.read(min(HASH_BLOCK_SIZE, remaining))
+        if not block:
+            break
+        hasher.update(block)
+        remaining -= len(block)
+    return hasher
+
+
+def get_existing_ids(conn, table_name, ids, chunk_size=500):
+    """Return the subset of ids already used in table_name (primary key lookups)."""
+    ids = list(ids)
+    existing = set()
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(f"SELECT id FROM {table_name} WHERE id IN ({placeholders})", chunk)
+        existing.update(row[0] for row in rows)
+    return existing
+
+
+def get_manifest_entry(conn, source_path):
+    """Return the ingest_manifest row for a file as a dict, or None."""
+    keys = ("checksum", "tail_checksum", "checksum_window", "file_size", "file_mtime",
+            "byte_offset", "max_id", "rows_loaded")
+    row = conn.execute(
+        f"SELECT {', '.join(keys)} FROM ingest_manifest WHERE source_path = ?",
+        (source_path,)
+    ).fetchone()
+    if row is None:
+        return None
+    return dict(zip(keys, row))
+
+
+def save_manifest_entry(conn, source_path, table_name, checksum, tail_checksum, checksum_window,
+                        file_size, file_mtime, byte_offset, max_id, rows_loaded):
+    """Insert or update the ingest_manifest row for a file."""
+    conn.execute("""
+        INSERT INTO ingest_manifest
+            (source_path, table_name, checksum, tail_checksum, checksum_window, file_size,
+             file_mtime, byte_offset, max_id, rows_loaded)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(source_path) DO UPDATE SET
+            table_name = excluded.table_name,
+            checksum = excluded.checksum,
+            tail_checksum = excluded.tail_checksum,
+            checksum_window = excluded.checksum_window,
+            file_size = excluded.file_size,
+            file_mtime = excluded.file_mtime,
+            byte_offset = excluded.byte_offset,
+            max_id = excluded.max_id,
+            rows_loaded = excluded.rows_loaded,
+            updated_at = CURRENT_TIMESTAMP
+    """, (source_path, table_name, checksum, tail_checksum, checksum_window, file_size,
+          file_mtime, byte_offset, max_id, rows_loaded))
+
+
+def ingest_csv_incremental(conn, csv_path, table_name, chunk_size=DEFAULT_CHUNK_SIZE,
+                           progress=print_progress, conflicts="report"):
+    """
+    Load only what is new in a CSV since the last run, using ingest_manifest.
+
+    - size and mtime unchanged, or the ingested bytes unchanged and nothing
+      after them: skipped
+    - the ingested bytes (up to the stored byte offset) unchanged and the
+      file grew: only the appended rows are parsed and inserted
+    - anything before the stored offset changed (an edit anywhere, not just
+      near the end): the file counts as rewritten, so the whole file is read
+      but only rows with an id above the stored max id are inserted; rows
+      that were edited in place are not reloaded
+
+    Appends are confirmed by hashing the ingested prefix (sequential reads,
+    no parsing); the CHECKSUM_WINDOW bytes before the offset are compared
+    first, so most rewrites are caught without reading the whole prefix.
+
+    A new row whose id is already in the table (or repeats an earlier row's
+    id) is a conflict. With conflicts="report" it is skipped and its id is
+    listed under "conflicts" in the report; with conflicts="fail" the load
+    stops with ValueError before the chunk holding it is written.
+    The manifest is updated in the same transaction as each chunk, and
+    rows_loaded counts the rows actually inserted.
+    Returns a report dict like ingest_csv() plus "mode" and "conflicts" keys.
+    """
+    if conflicts not in ("report", "fail"):
+        raise ValueError("conflicts must be 'report' or 'fail'")
+    csv_file = Path(csv_path)
+    source_path = str(csv_file.resolve())
+    stat = os.stat(csv_file)
+    entry = get_manifest_entry(conn, source_path)
+    start = time.perf_counter()
+    state = {
+        "max_id": entry["max_id"] if entry else None,
+        "rows_loaded": entry["rows_loaded"] if entry else 0,
+        "conflicts": [],
+    }
+
+    def report(mode, rows=0, columns=(), ignored=()):
+        elapsed = time.perf_counter() - start
+        return {
+            "mode": mode,
+            "rows": rows,
+            "seconds": elapsed,
+            "rows_per_sec": rows / elapsed if elapsed > 0 else 0.0,
+            "columns": list(columns),
+            "ignored": list(ignored),
+            "conflicts": state["conflicts"],
+        }
+
+    if entry and entry["file_size"] == stat.st_size and entry["file_mtime"] == stat.st_mtime:
+        return report("unchanged")
+
+    # probe reads checksum windows without moving the line reader
+    with open(csv_file, "rb") as f, open(csv_file, "rb") as probe:
+        header_lines = TrackedLines(f)
+        header = next(csv.reader(header_lines), None)
+        if header is None:
+            return report("empty")
+        positions, columns, ignored = map_csv_columns(conn, table_name, header)
+        id_index = columns.index("id") if "id" in columns else None
+
+        mode = "full"
+        min_id = None
+        lines = None
+        if entry:
+            offset = entry["byte_offset"]
+            prefix = None
+            if (entry["checksum_window"] and stat.st_size >= offset
+                    and hash_window(probe, offset, entry["checksum_window"]) == entry["tail_checksum"]):
+                prefix = hash_prefix(f, offset)
+            if prefix is not None and prefix.hexdigest() == entry["checksum"]:
+                if stat.st_size == offset:
+                    # Only the mtime moved (e.g. the file was touched)
+                    with conn:
+                        save_manifest_entry(conn, source_path, table_name, entry["checksum"],
+                                            entry["tail_checksum"], entry["checksum_window"],
+                                            stat.st_size, stat.st_mtime, offset, entry["max_id"],
+                                            entry["rows_loaded"])
+                    return report("unchanged")
+                mode = "append"
+                # hash_prefix left f at the offset; keep extending its hash
+                lines = TrackedLines(f, offset, prefix)
+            else:
+                mode = "rewritten"
+                min_id = entry["max_id"]
+
+        if lines is None:
+            f.seek(0)
+            lines = TrackedLines(f)
+            next(csv.reader(lines), None)  # skip the header again
+
+        def drop_conflicts(chunk):
+            ids = [int(row[id_index]) for row in chunk if row[id_index] is not None]
+            taken = get_existing_ids(conn, table_name, ids)
+            kept, clashes = [], []
+            for row in chunk:
+                if row[id_index] is not None:
+                    row_id = int(row[id_index])
+                    if row_id in taken:
+                        clashes.append(row_id)
+                        continue
+                    taken.add(row_id)  # a repeat later in the file clashes too
+                kept.append(row)
+            if clashes and conflicts == "fail":
+                shown = ", ".join(map(str, clashes[:10]))
+                raise ValueError(f"{len(clashes)} row(s) of {csv_file.name} reuse ids already "
+                                 f"in {table_name}: {shown}{' ...' if len(clashes) > 10 else ''}")
+            state["conflicts"].extend(clashes)
+            return kept
+
+        def rows_to_insert():
+            for chunk in iter_csv_chunks(csv.reader(lines), positions, chunk_size):
+                if id_index is not None:
+                    if min_id is not None:
+                        chunk = [row for row in chunk
+                                 if row[id_index] is not None and int(row[id_index]) > min_id]
+                    chunk = drop_conflicts(chunk)
+                    ids = [int(row[id_index]) for row in chunk if row[id_index] is not None]
+                    if ids:
+                        state["max_id"] = max(ids + ([state["max_id"]] if state["max_id"] is not None else []))
+                yield chunk
+
+        def record_progress(chunk_conn, inserted):
+            state["rows_loaded"] += inserted
+            save_manifest_entry(chunk_conn, source_path, table_name, lines.hasher.hexdigest(),
+                                hash_window(probe, lines.offset), CHECKSUM_WINDOW,
+                                stat.st_size, stat.st_mtime, lines.offset,
+                                state["max_id"], state["rows_loaded"])
+
+        rows = insert_chunks(conn, table_name, columns, rows_to_insert(),
+                             progress=progress, on_chunk=record_progress)
+
+        # Nothing new to insert still moves the manifest forward
+        if rows == 0:
+            with conn:
+                record_progress(conn, 0)
+
+    return report(mode, rows, columns, ignored)
@@ -0,0 +1,50 @@
+"""
+bcrypt helpers shared by the week 7 file backend and the week 8 database
+backend: hashing at a configurable cost, checking whether a stored hash
+needs upgrading, and picking a cost for this host.
+"""
+import os
+import time
+
+import bcrypt
+
+# bcrypt work factor; `python main.py --calibrate` suggests a value for this host
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", 12))
+
+
+def hash_password(password, rounds=None):
+    """Hash a password with bcrypt at BCRYPT_ROUNDS (or the given cost)."""
+    salt = bcrypt.gensalt(rounds or BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def verify_password(password, stored_hash):
+    """Check a password against a stored bcrypt hash."""
+    return bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8'))
+
+
+def get_hash_rounds(stored_hash):
+    """Return the cost a bcrypt hash was made with ($2b$<cost>$...)."""
+    try:
+        return int(stored_hash.split('$')[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def needs_rehash(stored_hash):
+    """True if the hash was made at a different cost than BCRYPT_ROUNDS."""
+    return get_hash_rounds(stored_hash) != BCRYPT_ROUNDS
+
+
+def calibrate_rounds(target_ms=100, min_rounds=4, max_rounds=16):
+    """Return the highest bcrypt cost that hashes in under target_ms on this host."""
+    best = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration-password", bcrypt.gensalt(rounds))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"  cost {rounds:>2}: {elapsed_ms:8.1f} ms")
+        if elapsed_ms > target_ms:
+            break
+        best = rounds
+    return best
@@ -0,0 +1,136 @@
+"""
+Keyset-paginated and streaming readers for the domain tables.
+
+Pages are fetched with "WHERE key > last_key ORDER BY key LIMIT n" instead
+of OFFSET, so every page costs the same however deep it is, and only the
+requested columns and matching rows leave SQLite.
+"""
+import pandas as pd
+
+from app.data.ingest import get_table_columns
+
+# Date column used for (date, id) ordering in each table
+DATE_COLUMNS = {
+    "cyber_incidents": "date",
+    "it_tickets": "created_date",
+    "datasets_metadata": "last_updated",
+}
+
+DEFAULT_PAGE_SIZE = 1000
+
+# Filter key suffix -> SQL operator, e.g. {"date__gte": "2024-01-01"}
+OPERATORS = {
+    "eq": "=",
+    "ne": "!=",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+    "like": "LIKE",
+}
+
+# Operators that accept a list value, and the SQL they map to
+LIST_OPERATORS = {
+    "": "IN",
+    "eq": "IN",
+    "ne": "NOT IN",
+}
+
+
+def build_where(filters, valid_columns):
+    """
+    Turn a filters dict into (sql, params). Keys are column names, optionally
+    with an operator suffix (column__gte); list/tuple/set values become IN,
+    or NOT IN with __ne, and any other operator with a list is a ValueError.
+    None values are ignored, so an "All" selection can be passed as None.
+    """
+    clauses, params = [], []
+    for key, value in (filters or {}).items():
+        if value is None:
+            continue
+        column, _, op = key.partition("__")
+        if column not in valid_columns:
+            raise ValueError(f"Unknown filter column: {column}")
+        if op and op not in OPERATORS:
+            raise ValueError(f"Unknown filter operator: {op}")
+        if isinstance(value, (list, tuple, set)):
+            if op not in LIST_OPERATORS:
+                raise ValueError(f"Operator {op} does not take a list of values: {key}")
+            values = list(value)
+            if not values:
+                # IN () matches nothing, NOT IN () matches everything
+                clauses.append("0" if LIST_OPERATORS[op] == "IN" else f"{column} IS NOT NULL")
+                continue
+            clauses.append(f"{column} {LIST_OPERATORS[op]} ({', '.join('?' * len(values))})")
+            params.extend(values)
+            continue
+        clauses.append(f"{column} {OPERATORS[op or 'eq']} ?")
+        params.append(value)
+    return " AND ".join(clauses), params
+
+
+def _order_columns(table, order_by):
+    if order_by == "id":
+        return ["id"]
+    if order_by == "date":
+        return [DATE_COLUMNS[table], "id"]
+    raise ValueError("order_by must be 'id' or 'date'")
+
+
+def read_page(conn, table, columns=None, filters=None, order_by="id", after=None,
+              limit=DEFAULT_PAGE_SIZE):
+    """
+    Read one page of rows in key order.
+
+    after is the cursor returned by the previous call (None for the first
+    page): the last id for order_by="id", a (date, id) tuple for "date".
+    Rows with a NULL date are not returned in date order.
+    Returns (DataFrame, next_cursor); next_cursor is None on the last page.
+    """
+    table_columns = get_table_columns(conn, table)
+    selected = list(columns or table_columns)
+    unknown = [column for column in selected if column not in table_columns]
+    if unknown:
+        raise ValueError(f"Unknown column(s) for {table}: {', '.join(unknown)}")
+
+    keys = _order_columns(table, order_by)
+    fetch = selected + [key for key in keys if key not in selected]
+
+    where, params = build_where(filters, table_columns)
+    clauses = [where] if where else []
+    if after is not None:
+        if len(keys) == 1:
+            clauses.append(f"{keys[0]} > ?")
+            params.append(after)
+        else:
+            # Row-value comparison walks the (date, id) index order directly
+            clauses.append(f"({', '.join(keys)}) > ({', '.join('?' * len(keys))})")
+            params.extend(after)
+    elif len(keys) > 1:
+        clauses.append(f"{keys[0]} IS NOT NULL")
+
+    sql = f"SELECT {', '.join(fetch)} FROM {table}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY {', '.join(keys)} LIMIT ?"
+    params.append(limit)
+
+    df = pd.read_sql_query(sql, conn, params=params)
+    next_cursor = None
+    if len(df) == limit:
+        # Plain Python values (not numpy scalars) so the cursor binds as a parameter
+        last = [value.item() if hasattr(value, "item") else value for value in df.iloc[-1][keys]]
+        next_cursor = last[0] if len(keys) == 1 else tuple(last)
+    return df[selected], next_cursor
+
+
+def iter_chunks(conn, table, chunk_size=DEFAULT_PAGE_SIZE, columns=None, filters=None,
+                order_by="id"):
+    """Yield DataFrames of at most chunk_size rows until the table is exhausted."""
+    cursor = None
+    while True:
+        df, cursor = read_page(conn, table, columns, filters, order_by, cursor, chunk_size)
+        if not df.empty:
+            yield df
+        if cursor is None:
+            return
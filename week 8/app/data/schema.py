@@ -1,3 +1,7 @@
+from app.data.indexes import create_indexes
+from app.data.summaries import create_summary_tables
+
+
 def create_users_table(conn):
     """Create users table."""
     cursor = conn.cursor()
@@ -69,6 +73,81 @@ def create_it_tickets_table(conn):
     conn.commit()
 
 
+def create_ingest_manifest_table(conn):
+    """Create the ingest_manifest table (one row per loaded CSV file)."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ingest_manifest (
+            source_path TEXT PRIMARY KEY,
+            table_name TEXT NOT NULL,
+            checksum TEXT,
+            tail_checksum TEXT,
+            file_size INTEGER,
+            file_mtime REAL,
+            byte_offset INTEGER,
+            checksum_window INTEGER,
+            max_id INTEGER,
+            rows_loaded INTEGER DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+
+
+# Full-text search tables: (fts table, base table, indexed columns)
+SEARCH_TABLES = [
+    ("cyber_incidents_fts", "cyber_incidents", ("description",)),
+    ("it_tickets_fts", "it_tickets", ("subject", "description")),
+]
+
+
+def create_search_tables(conn):
+    """
+    Create FTS5 indexes over incident descriptions and ticket text, plus the
+    triggers that keep them in sync with their base tables. A newly created
+    index is filled from the rows already in the base table.
+    """
+    cursor = conn.cursor()
+    for fts_table, base_table, columns in SEARCH_TABLES:
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,)
+        ).fetchone()
+        # External-content table: the text stays in the base table only
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                {column_list},
+                content='{base_table}',
+                content_rowid='id',
+                prefix='2 3'
+            )
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {base_table} BEGIN
+                INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {base_table} BEGIN
+                INSERT INTO {fts_table}({fts_table}, rowid, {column_list})
+                VALUES ('delete', old.id, {old_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {column_list} ON {base_table} BEGIN
+                INSERT INTO {fts_table}({fts_table}, rowid, {column_list})
+                VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """)
+        if not exists:
+            cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+    conn.commit()
+
+
 # IMPORTANT — must be at the bottom
 def create_all_tables(conn):
     """Create all tables."""
@@ -76,3 +155,7 @@ def create_all_tables(conn):
     create_cyber_incidents_table(conn)
     create_datasets_metadata_table(conn)
     create_it_tickets_table(conn)
+    create_ingest_manifest_table(conn)
+    create_indexes(conn)
+    create_search_tables(conn)
+    create_summary_tables(conn)
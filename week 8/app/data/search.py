@@ -0,0 +1,80 @@
+"""
+Ranked full-text search over incident descriptions and ticket text.
+
+Backed by the FTS5 tables from app/data/schema.py (create_search_tables),
+so a lookup is an index probe instead of a LIKE '%...%' scan.
+"""
+import re
+
+import pandas as pd
+
+DEFAULT_LIMIT = 50
+
+
+def build_match_query(text, prefix=True):
+    """
+    Turn free text into a safe FTS5 MATCH expression: every word must match,
+    quoted so FTS5 syntax in the input is treated as plain text. With prefix,
+    words also match longer terms ("phish" finds "phishing").
+    Returns None when the text has no searchable words.
+    """
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        return None
+    suffix = "*" if prefix else ""
+    return " AND ".join(f'"{word}"{suffix}' for word in words)
+
+
+def has_search_index(conn, base_table):
+    """
+    True if the FTS5 table over base_table exists. Read-only: the search
+    tables are created by the week 8 setup (create_search_tables), never here.
+    """
+    fts_table = f"{base_table}_fts"
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,)
+    ).fetchone()
+    return row is not None
+
+
+def _search(conn, fts_table, base_table, columns, text, limit, prefix, weights, marker):
+    match = build_match_query(text, prefix)
+    if match is None:
+        return pd.DataFrame(columns=list(columns) + ["snippet", "rank"])
+
+    # Snippet from whichever indexed column matched best (-1)
+    sql = f"""
+        SELECT {', '.join(f'b.{column}' for column in columns)},
+               snippet({fts_table}, -1, ?, ?, '…', 12) AS snippet,
+               bm25({fts_table}, {', '.join(str(w) for w in weights)}) AS rank
+        FROM {fts_table}
+        JOIN {base_table} AS b ON b.id = {fts_table}.rowid
+        WHERE {fts_table} MATCH ?
+        ORDER BY rank
+        LIMIT ?
+    """
+    return pd.read_sql_query(sql, conn, params=(marker, marker, match, limit))
+
+
+def search_incidents(conn, text, limit=DEFAULT_LIMIT, prefix=True, marker="**"):
+    """
+    Search incident descriptions. Best matches first (BM25; lower rank is
+    better). The snippet wraps matched terms in marker (Markdown bold).
+    """
+    return _search(
+        conn, "cyber_incidents_fts", "cyber_incidents",
+        ("id", "date", "incident_type", "severity", "status", "description"),
+        text, limit, prefix, weights=(1.0,), marker=marker,
+    )
+
+
+def search_tickets(conn, text, limit=DEFAULT_LIMIT, prefix=True, marker="**"):
+    """
+    Search ticket subjects and descriptions (subject hits weigh double).
+    Best matches first; the snippet wraps matched terms in marker.
+    """
+    return _search(
+        conn, "it_tickets_fts", "it_tickets",
+        ("id", "ticket_id", "priority", "status", "assigned_to", "subject", "description"),
+        text, limit, prefix, weights=(2.0, 1.0), marker=marker,
+    )
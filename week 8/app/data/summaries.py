@@ -0,0 +1,220 @@
+"""
+Summary tables for the dashboard headline counts.
+
+Each summary table holds one row per distinct key (e.g. severity + status)
+with the number of base rows and, for datasets, running totals. Triggers
+on the base table keep it current on every INSERT/UPDATE/DELETE, so a
+count is a lookup over a handful of rows instead of an aggregation over
+the whole table. NULL keys are stored as '' (a primary key column cannot
+hold a usable NULL) and read back as None.
+
+rebuild_summaries() recomputes everything from the base tables and
+verify_summaries() reports any drift between the two.
+"""
+import pandas as pd
+
+from app.data.db import atomic
+from app.data.readers import build_where
+
+# summary table -> (base table, key columns, summed columns)
+SUMMARIES = {
+    "incident_summary": ("cyber_incidents", ("severity", "status", "incident_type"), ()),
+    "ticket_summary": ("it_tickets", ("status", "assigned_to", "priority"), ()),
+    "dataset_summary": ("datasets_metadata", ("category", "source"), ("record_count", "file_size_mb")),
+}
+
+# Base table -> its summary table
+SUMMARY_FOR_TABLE = {base: name for name, (base, _, _) in SUMMARIES.items()}
+
+# Tolerance for comparing REAL totals in verify_summaries()
+SUM_TOLERANCE = 1e-6
+
+
+def _keys_match(keys, prefix):
+    return " AND ".join(f"{key} = COALESCE({prefix}.{key}, '')" for key in keys)
+
+
+def _increment_sql(name, keys, sums, prefix, sign):
+    """Statements that add (sign=1) or remove (sign=-1) one row's contribution."""
+    if sign > 0:
+        key_values = ", ".join(f"COALESCE({prefix}.{key}, '')" for key in keys)
+        sum_values = "".join(f", COALESCE({prefix}.{col}, 0)" for col in sums)
+        sum_updates = "".join(f", total_{col} = total_{col} + excluded.total_{col}" for col in sums)
+        return [f"""
+            INSERT INTO {name} ({', '.join(keys)}, row_count{''.join(f', total_{col}' for col in sums)})
+            VALUES ({key_values}, 1{sum_values})
+            ON CONFLICT({', '.join(keys)}) DO UPDATE SET row_count = row_count + 1{sum_updates};
+        """]
+    sum_updates = "".join(f", total_{col} = total_{col} - COALESCE({prefix}.{col}, 0)" for col in sums)
+    return [
+        f"UPDATE {name} SET row_count = row_count - 1{sum_updates} WHERE {_keys_match(keys, prefix)};",
+        f"DELETE FROM {name} WHERE row_count <= 0 AND {_keys_match(keys, prefix)};",
+    ]
+
+
+def create_summary_tables(conn):
+    """
+    Create every summary table in SUMMARIES with the triggers that maintain
+    it. A newly created summary is filled from the rows already present.
+    """
+    cursor = conn.cursor()
+    created = []
+    for name, (base, keys, sums) in SUMMARIES.items():
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone()
+        key_columns = "".join(f"{key} TEXT NOT NULL, " for key in keys)
+        sum_columns = "".join(f"total_{col} REAL NOT NULL DEFAULT 0, " for col in sums)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {name} (
+                {key_columns}row_count INTEGER NOT NULL DEFAULT 0,
+                {sum_columns}PRIMARY KEY ({', '.join(keys)})
+            ) WITHOUT ROWID
+        """)
+
+        insert_body = "\n".join(_increment_sql(name, keys, sums, "new", 1))
+        delete_body = "\n".join(_increment_sql(name, keys, sums, "old", -1))
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {base} BEGIN
+                {insert_body}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {base} BEGIN
+                {delete_body}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {', '.join(keys + sums)} ON {base} BEGIN
+                {delete_body}
+                {insert_body}
+            END
+        """)
+        if not exists:
+            created.append(name)
+    conn.commit()
+    if created:
+        rebuild_summaries(conn, created)
+
+
+def _recompute_sql(name):
+    base, keys, sums = SUMMARIES[name]
+    key_values = ", ".join(f"COALESCE({key}, '')" for key in keys)
+    sum_values = "".join(f", TOTAL({col})" for col in sums)
+    return f"SELECT {key_values}, COUNT(*){sum_values} FROM {base} GROUP BY {key_values}"
+
+
+def rebuild_summaries(conn, names=None):
+    """Recompute summary tables (all by default) from their base tables."""
+    with atomic(conn):
+        for name in (names or SUMMARIES):
+            conn.execute(f"DELETE FROM {name}")
+            conn.execute(f"INSERT INTO {name} {_recompute_sql(name)}")
+
+
+def verify_summaries(conn, names=None):
+    """
+    Compare summary tables with a fresh aggregation of their base tables.
+    Returns a list of drift dicts (summary, key, column, stored, actual);
+    empty when everything matches.
+    """
+    drift = []
+    for name in (names or SUMMARIES):
+        _, keys, sums = SUMMARIES[name]
+        columns = ["row_count"] + [f"total_{col}" for col in sums]
+        stored_sql = f"SELECT {', '.join(keys)}, {', '.join(columns)} FROM {name}"
+        stored = {row[:len(keys)]: row[len(keys):] for row in conn.execute(stored_sql)}
+        actual = {row[:len(keys)]: row[len(keys):] for row in conn.execute(_recompute_sql(name))}
+
+        zero = (0,) * len(columns)
+        for key in sorted(set(stored) | set(actual)):
+            have, want = stored.get(key, zero), actual.get(key, zero)
+            for column, stored_value, actual_value in zip(columns, have, want):
+                if abs(stored_value - actual_value) > SUM_TOLERANCE:
+                    drift.append({
+                        "summary": name,
+                        "key": dict(zip(keys, key)),
+                        "column": column,
+                        "stored": stored_value,
+                        "actual": actual_value,
+                    })
+    return drift
+
+
+def summary_exists(conn, table):
+    """True if table has a summary table in this database."""
+    name = SUMMARY_FOR_TABLE.get(table)
+    return name is not None and conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def can_serve(table, group_by=(), filters=None):
+    """
+    True if a count over table grouped by group_by with these filters can be
+    answered from its summary: every column must be a summary key and every
+    filter a plain equality or IN (other operators treat NULL differently).
+    """
+    if table not in SUMMARY_FOR_TABLE:
+        return False
+    keys = SUMMARIES[SUMMARY_FOR_TABLE[table]][1]
+    for key, value in (filters or {}).items():
+        column, _, op = key.partition("__")
+        if value is not None and (column not in keys or op not in ("", "eq")):
+            return False
+    return all(column in keys for column in group_by)
+
+
+def summary_counts(conn, table, group_by=(), filters=None):
+    """
+    Row counts for table per group_by, read from its summary table.
+    Same output as aggregations.aggregate(conn, table, group_by, filters):
+    the group columns plus "count", ordered by the group columns.
+    """
+    name = SUMMARY_FOR_TABLE[table]
+    keys = SUMMARIES[name][1]
+    group_by = list(group_by)
+    unknown = [column for column in group_by if column not in keys]
+    if unknown:
+        raise ValueError(f"Not a key of {name}: {', '.join(unknown)}")
+    where, params = build_where(filters, keys)
+
+    select = [f"NULLIF({column}, '') AS {column}" for column in group_by]
+    select.append("COALESCE(SUM(row_count), 0) AS count")
+    sql = f"SELECT {', '.join(select)} FROM {name}"
+    if where:
+        sql += f" WHERE {where}"
+    if group_by:
+        sql += f" GROUP BY {', '.join(group_by)} ORDER BY {', '.join(group_by)}"
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+# --- Headline counts ---
+def count_rows(conn, table, filters=None):
+    """Number of rows in table matching equality filters on summary keys."""
+    return int(summary_counts(conn, table, (), filters)["count"].iloc[0])
+
+
+def incidents_by_severity_status(conn, filters=None):
+    """Incident counts per (severity, status)."""
+    return summary_counts(conn, "cyber_incidents", ["severity", "status"], filters)
+
+
+def open_tickets_per_assignee(conn, status="Open"):
+    """Ticket counts per assigned_to for one status."""
+    return summary_counts(conn, "it_tickets", ["assigned_to"], {"status": status})
+
+
+def dataset_totals(conn, group_by=("category",)):
+    """Dataset count, total record_count and total file_size_mb per group."""
+    group_by = list(group_by)
+    unknown = [column for column in group_by if column not in SUMMARIES["dataset_summary"][1]]
+    if unknown:
+        raise ValueError(f"Not a key of dataset_summary: {', '.join(unknown)}")
+    select = [f"NULLIF({column}, '') AS {column}" for column in group_by]
+    select += ["SUM(row_count) AS count", "SUM(total_record_count) AS record_count",
+               "SUM(total_file_size_mb) AS file_size_mb"]
+    sql = f"SELECT {', '.join(select)} FROM dataset_summary"
+    if group_by:
+        sql += f" GROUP BY {', '.join(group_by)} ORDER BY {', '.join(group_by)}"
+    return pd.read_sql_query(sql, conn)
@@ -1,11 +1,39 @@
-from app.data.db import connect_database
+from app.data.db import get_connection, transaction
+from app.data.batch import insert_many, update_many, delete_many
+from app.data.readers import read_page, iter_chunks, DEFAULT_PAGE_SIZE
 
 def insert_ticket(title, description, priority, status, created_at):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO it_tickets (title, description, priority, status, created_at)
-        VALUES (?, ?, ?, ?, ?)
-    """, (title, description, priority, status, created_at))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("""
+            INSERT INTO it_tickets (title, description, priority, status, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, (title, description, priority, status, created_at))
+
+# --- Batched variants: one transaction / executemany per call ---
+TICKET_COLUMNS = (
+    "ticket_id", "priority", "status", "category", "subject",
+    "description", "created_date", "resolved_date", "assigned_to",
+)
+
+def insert_tickets_many(tickets):
+    """Insert tickets (dicts or tuples in TICKET_COLUMNS order). Returns (ids, count)."""
+    return insert_many(get_connection(), "it_tickets", TICKET_COLUMNS, tickets)
+
+def update_ticket_status_many(ticket_ids, new_status):
+    """Set the status of many tickets (by id) at once. Returns (updated_ids, count)."""
+    return update_many(get_connection(), "it_tickets", {"status": new_status}, ticket_ids)
+
+def delete_tickets_many(ticket_ids):
+    """Delete many tickets (by id) at once. Returns (deleted_ids, count)."""
+    return delete_many(get_connection(), "it_tickets", ticket_ids)
+
+
+# --- Paginated / streaming readers ---
+def get_tickets_page(columns=None, filters=None, order_by="id", after=None,
+                     limit=DEFAULT_PAGE_SIZE, conn=None):
+    """One keyset page of tickets. Returns (DataFrame, next_cursor)."""
+    return read_page(conn or get_connection(), "it_tickets", columns, filters, order_by, after, limit)
+
+def iter_tickets(chunk_size=DEFAULT_PAGE_SIZE, columns=None, filters=None, order_by="id", conn=None):
+    """Yield tickets as DataFrames of at most chunk_size rows."""
+    return iter_chunks(conn or get_connection(), "it_tickets", chunk_size, columns, filters, order_by)
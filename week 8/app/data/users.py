@@ -1,34 +1,47 @@
-from app.data.db import connect_database
-import bcrypt
+from app.data.db import get_connection, transaction
+# bcrypt helpers are shared with week 7; re-exported for main.py and the services
+from app.data.passwords import (
+    BCRYPT_ROUNDS, hash_password, verify_password, get_hash_rounds, needs_rehash, calibrate_rounds
+)
 from pathlib import Path
 
 # Path to users.txt for migration
 DATA_DIR = Path(__file__).resolve().parents[2] / "DATA"
 USERS_FILE = DATA_DIR / "users.txt"
 
+# --- Password hashing helpers ---
+def schedule_rehash(username, password):
+    """Re-hash a password at BCRYPT_ROUNDS on the shared auth executor."""
+    # Imported here: the executor module imports this one for its logins
+    from app.services.auth_executor import schedule_rehash as schedule
+    schedule(username, password, update_password_hash)
+
+
 # --- Database CRUD helpers ---
 def get_user_by_username(username):
     """Retrieve user by username."""
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute(
+    cursor = get_connection().execute(
         "SELECT * FROM users WHERE username = ?",
         (username,)
     )
-    user = cursor.fetchone()
-    conn.close()
-    return user
+    return cursor.fetchone()
 
 def insert_user(username, password_hash, role='user'):
     """Insert new user."""
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-        (username, password_hash, role)
-    )
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute(
+            "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+            (username, password_hash, role)
+        )
+
+def update_password_hash(username, password_hash):
+    """Replace a user's stored password hash."""
+    with transaction() as conn:
+        cursor = conn.execute(
+            "UPDATE users SET password_hash = ? WHERE username = ?",
+            (password_hash, username)
+        )
+    return cursor.rowcount
 
 
 # --- Service functions used by main.py ---
@@ -38,7 +51,7 @@ def register_user(username, password, role='user'):
         return False, f"Username '{username}' already exists."
 
     # Hash password
-    password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    password_hash = hash_password(password)
 
     # Insert into database
     insert_user(username, password_hash, role)
@@ -51,20 +64,42 @@ def login_user(username, password):
         return False, "User not found."
 
     stored_hash = user[2]  # password_hash column
-    if bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8')):
+    if verify_password(password, stored_hash):
+        if needs_rehash(stored_hash):
+            schedule_rehash(username, password)
         return True, f"Welcome, {username}!"
     return False, "Incorrect password."
 
+def get_existing_usernames(usernames, chunk_size=500):
+    """Return the subset of usernames already in the users table."""
+    usernames = list(usernames)
+    existing = set()
+    cursor = get_connection().cursor()
+    # IN lookups are served by the UNIQUE index on username
+    for start in range(0, len(usernames), chunk_size):
+        chunk = usernames[start:start + chunk_size]
+        placeholders = ",".join("?" * len(chunk))
+        cursor.execute(f"SELECT username FROM users WHERE username IN ({placeholders})", chunk)
+        existing.update(row[0] for row in cursor.fetchall())
+    return existing
+
+def insert_users_many(users):
+    """Insert (username, password_hash, role) rows in one transaction. Returns rows added."""
+    with transaction() as conn:
+        # rowcount of an executemany is the rows inserted; ignored ones add nothing
+        inserted = conn.executemany(
+            "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+            users
+        ).rowcount
+    return inserted
+
 def migrate_users_from_file(filepath=USERS_FILE):
     """Migrate users from text file to database."""
     if not filepath.exists():
         print(f" File not found: {filepath}. No users to migrate.")
         return 0
 
-    conn = connect_database()
-    cursor = conn.cursor()
-    migrated_count = 0
-
+    rows = []
     with open(filepath, 'r') as f:
         for line in f:
             line = line.strip()
@@ -75,18 +110,14 @@ def migrate_users_from_file(filepath=USERS_FILE):
             username = parts[0]
             password_hash = parts[1] if len(parts) > 1 else "placeholder"
             role = parts[2] if len(parts) > 2 else "user"
-            try:
-                cursor.execute(
-                    "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-                    (username, password_hash, role)
-                )
-                if cursor.rowcount > 0:
-                    migrated_count += 1
-            except Exception as e:
-                print(f"Error migrating user {username}: {e}")
-
-    conn.commit()
-    conn.close()
+            rows.append((username, password_hash, role))
+
+    # One executemany in one transaction instead of a statement per line
+    try:
+        migrated_count = insert_users_many(rows)
+    except Exception as e:
+        print(f"Error migrating users: {e}")
+        migrated_count = 0
+
     print(f" Migrated {migrated_count} users from {filepath.name}")
     return migrated_count
-
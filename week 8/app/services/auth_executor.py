@@ -0,0 +1,215 @@
+import asyncio
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from app.data.passwords import hash_password, verify_password, needs_rehash
+from app.data.users import get_user_by_username, update_password_hash
+
+
+class AuthBusyError(Exception):
+    """Raised when the executor queue is full and no slot frees up in time."""
+
+
+class AuthTimeoutError(Exception):
+    """Raised when a single hash/verify request takes longer than its timeout."""
+
+
+class AuthExecutor:
+    """
+    Bounded worker pool for bcrypt hashing and verification.
+
+    bcrypt releases the GIL, so the default thread pool runs concurrent
+    checks on all cores (use_processes=True switches to a process pool).
+    At most max_workers + max_queue requests are in flight; extra
+    submissions wait submit_timeout seconds for a slot, then raise
+    AuthBusyError.
+    """
+
+    def __init__(self, max_workers=None, max_queue=None, timeout=5.0,
+                 submit_timeout=1.0, use_processes=False):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = self.max_workers * 4 if max_queue is None else max_queue
+        self.timeout = timeout
+        self.submit_timeout = submit_timeout
+        pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._pool = pool_class(max_workers=self.max_workers)
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._rehash_pending = set()
+        self._rehash_lock = threading.Lock()
+
+    def _submit(self, fn, *args):
+        """Submit fn once a queue slot is free."""
+        if not self._slots.acquire(timeout=self.submit_timeout):
+            raise AuthBusyError("Authentication queue is full, try again later.")
+        try:
+            future = self._pool.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _result(self, future, timeout):
+        """Wait for a future, cancelling it when it runs past the timeout."""
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise AuthTimeoutError("Authentication request timed out.")
+
+    def _batches(self, items):
+        """Split items into batches that fit the queue, so a burst never hits AuthBusyError."""
+        items = list(items)
+        batch_size = self.max_workers + self.max_queue
+        for start in range(0, len(items), batch_size):
+            yield items[start:start + batch_size]
+
+    def _submit_all(self, fn, args_list):
+        """Submit fn for every args tuple; on AuthBusyError cancel the ones already queued."""
+        futures = []
+        try:
+            for args in args_list:
+                futures.append(self._submit(fn, *args))
+        except AuthBusyError:
+            for future in futures:
+                future.cancel()
+            raise
+        return futures
+
+    def submit_verify(self, password, stored_hash):
+        """Queue one password check and return its Future."""
+        return self._submit(verify_password, password, stored_hash)
+
+    def submit_hash(self, password):
+        """Queue one password hash and return its Future."""
+        return self._submit(hash_password, password)
+
+    def verify(self, password, stored_hash, timeout=None):
+        """Verify one password on the pool."""
+        return self._result(self.submit_verify(password, stored_hash), timeout)
+
+    def verify_many(self, pairs, timeout=None):
+        """
+        Verify (password, hash) pairs in parallel; one bool per pair.
+        Raises AuthTimeoutError if a check times out (the rest are
+        cancelled), so an overloaded pool is not mistaken for a wrong password.
+        """
+        results = []
+        for batch in self._batches(pairs):
+            futures = self._submit_all(verify_password, batch)
+            try:
+                for future in futures:
+                    results.append(self._result(future, timeout))
+            except AuthTimeoutError:
+                for future in futures:
+                    future.cancel()
+                raise
+        return results
+
+    def hash_many(self, passwords, timeout=None):
+        """Hash passwords in parallel, keeping the input order."""
+        hashes = []
+        for batch in self._batches(passwords):
+            futures = self._submit_all(hash_password, [(password,) for password in batch])
+            hashes.extend(self._result(future, timeout) for future in futures)
+        return hashes
+
+    async def verify_async(self, password, stored_hash, timeout=None):
+        """Awaitable version of verify()."""
+        future = asyncio.wrap_future(self.submit_verify(password, stored_hash))
+        try:
+            return await asyncio.wait_for(future, self.timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            raise AuthTimeoutError("Authentication request timed out.")
+
+    def schedule_rehash(self, username, password, save):
+        """
+        Re-hash a password at BCRYPT_ROUNDS in the background and hand the
+        new hash to save(username, new_hash). At most one rehash per user
+        is pending; when the pool is busy the upgrade waits for a later login.
+        """
+        with self._rehash_lock:
+            if username in self._rehash_pending:
+                return
+            self._rehash_pending.add(username)
+
+        def rehash():
+            try:
+                save(username, hash_password(password))
+            except Exception as e:
+                print(f"Error re-hashing password for {username}: {e}")
+            finally:
+                with self._rehash_lock:
+                    self._rehash_pending.discard(username)
+
+        try:
+            self._submit(rehash)
+        except AuthBusyError:
+            with self._rehash_lock:
+                self._rehash_pending.discard(username)
+
+    def shutdown(self, wait=True):
+        """Stop the worker pool."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the shared AuthExecutor, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = AuthExecutor()
+            atexit.register(_executor.shutdown, False)
+        return _executor
+
+
+def schedule_rehash(username, password, save):
+    """Upgrade a password hash on the shared executor (see AuthExecutor.schedule_rehash)."""
+    get_executor().schedule_rehash(username, password, save)
+
+
+# --- Batch / async login ---
+def verify_many(pairs, timeout=None):
+    """Verify (password, hash) pairs on the shared executor."""
+    return get_executor().verify_many(pairs, timeout)
+
+
+def login_many(credentials, timeout=None):
+    """
+    Authenticate (username, password) pairs in parallel. Returns one bool
+    per pair; raises AuthTimeoutError when the pool cannot keep up.
+    """
+    results = [False] * len(credentials)
+    pending = []
+    for i, (username, password) in enumerate(credentials):
+        user = get_user_by_username(username)
+        if user:
+            pending.append((i, password, user[2]))  # password_hash column
+
+    checks = verify_many([(password, stored_hash) for _, password, stored_hash in pending], timeout)
+    for (i, password, stored_hash), ok in zip(pending, checks):
+        results[i] = ok
+        if ok and needs_rehash(stored_hash):
+            schedule_rehash(credentials[i][0], password, update_password_hash)
+    return results
+
+
+async def login_user_async(username, password, timeout=None):
+    """Async variant of login_user(); bcrypt runs on the shared executor."""
+    user = await asyncio.to_thread(get_user_by_username, username)
+    if not user:
+        return False, "User not found."
+
+    stored_hash = user[2]  # password_hash column
+    if await get_executor().verify_async(password, stored_hash, timeout):
+        if needs_rehash(stored_hash):
+            schedule_rehash(username, password, update_password_hash)
+        return True, f"Welcome, {username}!"
+    return False, "Incorrect password."
@@ -0,0 +1,145 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from app.data.users import get_user_by_username, login_user
+
+# How long a session stays valid after login (seconds)
+SESSION_TTL_SECONDS = int(os.environ.get("SESSION_TTL_SECONDS", 8 * 60 * 60))
+# Maximum number of validated sessions kept in memory
+SESSION_CACHE_SIZE = int(os.environ.get("SESSION_CACHE_SIZE", 10_000))
+
+# Signing key; set SESSION_SECRET to keep sessions valid across restarts
+_SECRET = os.environ.get("SESSION_SECRET", "").encode('utf-8') or secrets.token_bytes(32)
+
+
+class SessionCache:
+    """Bounded LRU cache of validated sessions that also expires entries."""
+
+    def __init__(self, max_size=SESSION_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        """Return the cached session for token, or None if missing or expired."""
+        with self._lock:
+            session = self._entries.get(token)
+            if session is None:
+                return None
+            if session['expires_at'] <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return session
+
+    def put(self, token, session):
+        """Cache a session, evicting the least recently used one when full."""
+        with self._lock:
+            self._entries[token] = session
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def remove(self, token):
+        """Drop a session from the cache."""
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_cache = SessionCache()
+_revoked = {}  # token -> expires_at, kept until the token would have expired
+_revoked_lock = threading.Lock()
+
+
+def _sign(payload):
+    return hmac.new(_SECRET, payload, hashlib.sha256).digest()
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode('ascii')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def create_session(username, role='user', ttl=SESSION_TTL_SECONDS):
+    """Issue a signed session token for an already authenticated user."""
+    expires_at = int(time.time() + ttl)
+    payload = f"{username}|{role}|{expires_at}".encode('utf-8')
+    token = f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+    _cache.put(token, {'username': username, 'role': role, 'expires_at': expires_at})
+    return token
+
+
+def login(username, password):
+    """
+    Authenticate once with bcrypt and start a session.
+    Returns (success, message, token); token is None on failure.
+    """
+    success, message = login_user(username, password)
+    if not success:
+        return False, message, None
+
+    user = get_user_by_username(username)
+    role = user[3] if user and len(user) > 3 else 'user'  # role column
+    return True, message, create_session(username, role)
+
+
+def validate_session(token):
+    """
+    Return the session dict (username, role, expires_at) for a valid token,
+    otherwise None. Cached sessions are a dictionary lookup; anything else
+    is checked from the token signature alone, never the database.
+    """
+    if not token:
+        return None
+
+    session = _cache.get(token)
+    if session is not None:
+        return session
+
+    with _revoked_lock:
+        if token in _revoked:
+            return None
+
+    try:
+        payload_text, signature_text = token.split('.', 1)
+        payload = _b64decode(payload_text)
+        if not hmac.compare_digest(_sign(payload), _b64decode(signature_text)):
+            return None
+        username, role, expires_at = payload.decode('utf-8').rsplit('|', 2)
+        expires_at = int(expires_at)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+    if expires_at <= time.time():
+        return None
+
+    session = {'username': username, 'role': role, 'expires_at': expires_at}
+    _cache.put(token, session)
+    return session
+
+
+def logout(token):
+    """End a session so its token is no longer accepted."""
+    session = validate_session(token)
+    _cache.remove(token)
+    if session is None:
+        return
+
+    now = time.time()
+    with _revoked_lock:
+        _revoked[token] = session['expires_at']
+        # Forget revocations for tokens that have expired anyway
+        for old_token in [t for t, expires_at in _revoked.items() if expires_at <= now]:
+            del _revoked[old_token]
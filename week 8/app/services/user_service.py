@@ -1,17 +1,20 @@
-import bcrypt
+import csv
+import time
 from pathlib import Path
 from app.data.db import connect_database
-from app.data.users import get_user_by_username, insert_user
+from app.data.users import (
+    get_user_by_username, insert_user, hash_password, verify_password,
+    needs_rehash, schedule_rehash, get_existing_usernames, insert_users_many
+)
+from app.services.auth_executor import get_executor
+from app.services.validation import validate_username, validate_password
 from app.data.schema import create_users_table
 
 
 def register_user(username, password, role='user'):
     """Register new user with password hashing."""
     # Hash password
-    password_hash = bcrypt.hashpw(
-        password.encode('utf-8'),
-        bcrypt.gensalt()
-    ).decode('utf-8')
+    password_hash = hash_password(password)
 
     # Insert into database
     insert_user(username, password_hash, role)
@@ -26,11 +29,61 @@ def login_user(username, password):
 
     # Verify password
     stored_hash = user[2]  # password_hash column
-    if bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8')):
+    if verify_password(password, stored_hash):
+        if needs_rehash(stored_hash):
+            schedule_rehash(username, password)
         return True, f"Login successful!"
     return False, "Incorrect password."
 
 
 def migrate_users_from_file(filepath='DATA/users.txt'):
     """Migrate users from text file to database."""
-    # ... migration logic ...
\ No newline at end of file
+    # ... migration logic ...
+
+
+def bulk_import_users(csv_path):
+    """
+    Import users from a CSV (header: username,password[,role]).
+
+    Rows failing the registration rules (app.services.validation), usernames
+    already in the database and ones repeated in the file are skipped;
+    new passwords are hashed in parallel and all rows are inserted with one
+    executemany in a single transaction.
+    Returns a dict with imported/skipped counts, seconds and rows_per_sec.
+    """
+    start = time.perf_counter()
+
+    rows = []
+    seen = set()
+    skipped = 0
+    total = 0
+    with open(csv_path, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            total += 1
+            username = (row.get('username') or '').strip()
+            password = (row.get('password') or '').strip()
+            role = (row.get('role') or '').strip() or 'user'
+            if (not validate_username(username)[0] or not validate_password(password)[0]
+                    or username in seen):
+                skipped += 1
+                continue
+            seen.add(username)
+            rows.append((username, password, role))
+
+    existing = get_existing_usernames(seen)
+    new_rows = [row for row in rows if row[0] not in existing]
+    skipped += len(rows) - len(new_rows)
+
+    hashes = get_executor().hash_many([password for _, password, _ in new_rows])
+    imported = insert_users_many(
+        [(username, password_hash, role)
+         for (username, _, role), password_hash in zip(new_rows, hashes)]
+    )
+
+    elapsed = time.perf_counter() - start
+    return {
+        'imported': imported,
+        'skipped': skipped,
+        'seconds': elapsed,
+        'rows_per_sec': total / elapsed if elapsed > 0 else 0.0,
+    }
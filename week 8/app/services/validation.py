@@ -0,0 +1,23 @@
+import re
+
+
+def validate_username(username):
+    """3-20 characters: letters, digits and underscores. Returns (ok, error message)."""
+    if not (3 <= len(username) <= 20):
+        return False, "Username must be between 3 and 20 characters long."
+    if not re.match(r"^\w+$", username):
+        return False, "Username can only contain alphanumeric characters and underscores."
+    return True, ""
+
+
+def validate_password(password):
+    """6-50 characters with an uppercase letter, a lowercase letter and a digit."""
+    if not (6 <= len(password) <= 50):
+        return False, "Password must be between 6 and 50 characters long."
+    if not re.search(r"[A-Z]", password):
+        return False, "Password must contain at least one uppercase letter."
+    if not re.search(r"[a-z]", password):
+        return False, "Password must contain at least one lowercase letter."
+    if not re.search(r"[0-9]", password):
+        return False, "Password must contain at least one digit."
+    return True, ""
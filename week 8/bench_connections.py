@@ -0,0 +1,76 @@
+"""
+Microbenchmark: per-query connect/close vs managed thread-local connections.
+
+Runs the get_user_by_username() lookup against a temporary database, first
+the old way (connect, query, close for every call) and then through
+app.data.db.get_connection(), single-threaded and from several threads at
+once to mimic concurrent dashboard sessions.
+
+Usage: python bench_connections.py [queries] [threads]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+from app.data.db import connect_database, get_connection, close_connections
+from app.data.schema import create_users_table
+
+QUERY = "SELECT * FROM users WHERE username = ?"
+
+
+def per_query_connect(db_path, count):
+    for i in range(count):
+        conn = sqlite3.connect(str(db_path))
+        conn.execute(QUERY, (f"user{i % 1000}",)).fetchone()
+        conn.close()
+
+
+def managed(db_path, count):
+    for i in range(count):
+        get_connection(db_path).execute(QUERY, (f"user{i % 1000}",)).fetchone()
+    close_connections()
+
+
+def run_threads(fn, db_path, count, threads):
+    workers = [threading.Thread(target=fn, args=(db_path, count // threads)) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        conn = connect_database(db_path)
+        create_users_table(conn)
+        conn.executemany(
+            "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+            [(f"user{i}", "hash") for i in range(1000)]
+        )
+        conn.commit()
+        conn.close()
+
+        print(f"{count} lookups")
+        print(f"{'Mode':<28} {'Total (s)':>10} {'us/query':>10}")
+        print("-" * 50)
+        for label, fn in (("connect per query", per_query_connect), ("managed connection", managed)):
+            start = time.perf_counter()
+            fn(db_path, count)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<28} {elapsed:>10.3f} {elapsed / count * 1e6:>10.1f}")
+
+            elapsed = run_threads(fn, db_path, count, threads)
+            print(f"{label + f' x{threads} threads':<28} {elapsed:>10.3f} {elapsed / count * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: dashboard filter latency with and without the secondary indexes.
+
+Fills a temporary database with synthetic incidents, tickets and datasets,
+then times the filter and group-by queries from app.data.indexes
+(SHIPPED_QUERIES) before and after create_indexes().
+
+Usage: python bench_indexes.py [rows]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.data.db import connect_database, apply_pragmas
+from app.data.indexes import SHIPPED_QUERIES, create_indexes, drop_indexes
+from app.data.schema import create_all_tables
+
+TYPES = ["Phishing", "Malware", "DDoS", "Ransomware", "Insider Threat"]
+LEVELS = ["Low", "Medium", "High", "Critical"]
+STATUSES = ["Open", "In Progress", "Resolved", "Closed"]
+TECHS = [f"Technician {c}" for c in "ABCDEFGH"]
+CATEGORIES = ["Security", "Network", "Operations", "Finance"]
+SOURCES = ["Internal", "Automated System", "Third Party"]
+
+
+def random_date():
+    return f"{random.randint(2020, 2024)}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}"
+
+
+def fill(conn, rows):
+    apply_pragmas(conn, "ingest")
+    conn.executemany(
+        "INSERT INTO cyber_incidents (date, incident_type, severity, status, description) VALUES (?, ?, ?, ?, ?)",
+        ((random_date(), random.choice(TYPES), random.choice(LEVELS), random.choice(STATUSES), f"Incident {i}")
+         for i in range(rows)))
+    conn.executemany(
+        "INSERT INTO it_tickets (ticket_id, priority, status, subject, created_date, assigned_to) VALUES (?, ?, ?, ?, ?, ?)",
+        ((f"TCK-{i}", random.choice(LEVELS), random.choice(STATUSES), "Issue", random_date(), random.choice(TECHS))
+         for i in range(rows)))
+    conn.executemany(
+        "INSERT INTO datasets_metadata (dataset_name, category, source, last_updated, file_size_mb) VALUES (?, ?, ?, ?, ?)",
+        ((f"Dataset {i % 5000}", random.choice(CATEGORIES), random.choice(SOURCES), random_date(), random.random() * 500)
+         for i in range(rows)))
+    conn.commit()
+
+
+def time_queries(conn, repeat=3):
+    timings = {}
+    for name, sql, params in SHIPPED_QUERIES:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, params).fetchall()
+        timings[name] = (time.perf_counter() - start) / repeat * 1000
+    conn.rollback()  # undo the UPDATE shape
+    return timings
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect_database(os.path.join(tmp, "bench.db"))
+        create_all_tables(conn)
+        drop_indexes(conn)
+        fill(conn, rows)
+
+        without = time_queries(conn)
+        start = time.perf_counter()
+        create_indexes(conn)
+        build_s = time.perf_counter() - start
+        with_idx = time_queries(conn)
+        conn.close()
+
+    print(f"{rows:,} rows per table (index build: {build_s:.1f}s)")
+    print(f"{'Query':<40} {'No index (ms)':>14} {'Indexed (ms)':>13} {'Speed-up':>9}")
+    print("-" * 80)
+    for name in without:
+        speedup = without[name] / with_idx[name] if with_idx[name] > 0 else float("inf")
+        print(f"{name:<40} {without[name]:>14.2f} {with_idx[name]:>13.2f} {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
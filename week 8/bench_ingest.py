@@ -0,0 +1,83 @@
+"""
+Benchmark: streaming CSV ingestion into cyber_incidents.
+
+Generates a synthetic cyber_incidents CSV, loads it with
+app.data.ingest.ingest_csv() and compares the rate with SQLite's raw
+executemany speed on in-memory tuples. Peak memory during the ingest is
+reported so the constant-memory behaviour can be checked at different sizes.
+
+Usage: python bench_ingest.py [rows]
+"""
+import csv
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from app.data.db import connect_database, apply_pragmas
+from app.data.ingest import ingest_csv
+from app.data.schema import create_cyber_incidents_table
+
+TYPES = ["Phishing", "Malware", "DDoS", "Ransomware", "Insider Threat"]
+SEVERITIES = ["Low", "Medium", "High", "Critical"]
+STATUSES = ["Open", "Investigating", "Resolved", "Closed"]
+HEADER = ["id", "date", "incident_type", "severity", "status", "description", "reported_by", "created_at"]
+
+
+def make_row(i):
+    return (
+        i, f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+        random.choice(TYPES), random.choice(SEVERITIES), random.choice(STATUSES),
+        f"Incident {i:020d}", "Security Team", "2025-12-10 13:43:19",
+    )
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for i in range(1, rows + 1):
+            writer.writerow(make_row(i))
+
+
+def raw_insert_rate(db_path, rows):
+    """Rows/sec for executemany on pre-built tuples (no CSV parsing)."""
+    sample = min(rows, 500_000)
+    data = [make_row(i) for i in range(1, sample + 1)]
+    conn = connect_database(db_path)
+    create_cyber_incidents_table(conn)
+    apply_pragmas(conn, "ingest")
+    start = time.perf_counter()
+    conn.executemany(f"INSERT INTO cyber_incidents VALUES ({', '.join('?' * len(HEADER))})", data)
+    conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return sample / elapsed
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "cyber_incidents.csv")
+        write_csv(csv_path, rows)
+        size_mb = os.path.getsize(csv_path) / 1e6
+
+        conn = connect_database(os.path.join(tmp, "ingest.db"))
+        create_cyber_incidents_table(conn)
+        report = ingest_csv(conn, csv_path, "cyber_incidents", progress=None)
+        conn.close()
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+        raw = raw_insert_rate(os.path.join(tmp, "raw.db"), rows)
+
+        print(f"CSV: {rows:,} rows, {size_mb:.1f} MB")
+        print(f"ingest_csv:       {report['rows_per_sec']:>12,.0f} rows/sec ({report['seconds']:.2f}s)")
+        print(f"raw executemany:  {raw:>12,.0f} rows/sec")
+        print(f"Peak RSS during ingest: {peak_mb:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
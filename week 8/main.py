@@ -1,47 +1,14 @@
 # main.py
 
-import pandas as pd
-from pathlib import Path
-from app.data.db import connect_database, DB_PATH, DATA_DIR
+import sys
+from app.data.db import connect_database, DB_PATH
+from app.data.db_utils import load_all_csv_data
 from app.data.schema import create_all_tables
+from app.data.indexes import check_query_plans, QueryPlanError
+from app.data.summaries import verify_summaries, rebuild_summaries
 from app.data.incidents import insert_incident, get_all_incidents, update_incident_status, delete_incident
-from app.data.users import register_user, login_user, migrate_users_from_file
-
-# -----------------------------
-# CSV Helper Functions
-# -----------------------------
-
-def load_csv_to_table(conn, csv_path, table_name):
-    """Load a CSV file into a database table using pandas."""
-    csv_file = Path(csv_path)
-
-    if not csv_file.exists():
-        print(f"  CSV file not found: {csv_file}. Skipping {table_name}.")
-        return 0
-
-    try:
-        df = pd.read_csv(csv_file)
-        rows_loaded = df.to_sql(
-            name=table_name,
-            con=conn,
-            if_exists='append',
-            index=False
-        )
-        print(f" Loaded {rows_loaded} rows into {table_name} from {csv_file.name}.")
-        return rows_loaded
-    except Exception as e:
-        print(f"Error loading CSV {csv_file.name} into {table_name}: {e}")
-        return 0
-
-
-def load_all_csv_data(conn):
-    """Load data for all main tables from CSV files."""
-    total_rows = 0
-    total_rows += load_csv_to_table(conn, DATA_DIR / "cyber_incidents.csv", "cyber_incidents")
-    total_rows += load_csv_to_table(conn, DATA_DIR / "datasets_metadata.csv", "datasets_metadata")
-    total_rows += load_csv_to_table(conn, DATA_DIR / "it_tickets.csv", "it_tickets")
-    return total_rows
-
+from app.data.users import register_user, login_user, migrate_users_from_file, calibrate_rounds, BCRYPT_ROUNDS
+from app.services.user_service import bulk_import_users
 
 # -----------------------------
 # Database Setup
@@ -134,10 +101,94 @@ def run_test_queries():
     conn.close()
 
 
+# -----------------------------
+# bcrypt Calibration
+# -----------------------------
+
+def calibrate_bcrypt(target_ms=100):
+    """Print the highest bcrypt cost that hashes under target_ms on this host."""
+    print(f"\nCalibrating bcrypt for a {target_ms} ms target...")
+    rounds = calibrate_rounds(target_ms)
+    print(f"\n Recommended cost: {rounds} (current: {BCRYPT_ROUNDS})")
+    print(f" Set BCRYPT_ROUNDS={rounds}; stored hashes are upgraded on next login.")
+
+
+# -----------------------------
+# Bulk User Import
+# -----------------------------
+
+def import_users(csv_path):
+    """Bulk import users from a CSV file and print the throughput."""
+    report = bulk_import_users(csv_path)
+    print(f" Imported {report['imported']} user(s), skipped {report['skipped']} "
+          f"in {report['seconds']:.2f}s ({report['rows_per_sec']:.1f} rows/sec)")
+
+
+# -----------------------------
+# Query Plan Check
+# -----------------------------
+
+def check_plans():
+    """Fail (exit 1) if any shipped query falls back to a full table scan."""
+    conn = connect_database()
+    create_all_tables(conn)
+    try:
+        plans = check_query_plans(conn)
+    except QueryPlanError as e:
+        print(f" {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+    for name, plan in plans.items():
+        print(f" {name:<40} {' | '.join(plan)}")
+    print(f"\n All {len(plans)} shipped queries use an index.")
+
+
+# -----------------------------
+# Summary Tables
+# -----------------------------
+
+def check_summaries(rebuild=False):
+    """
+    Compare the summary tables with the base tables and print any drift.
+    With rebuild=True the summaries are then recomputed from scratch;
+    otherwise drift exits with status 1.
+    """
+    conn = connect_database()
+    create_all_tables(conn)
+    try:
+        drift = verify_summaries(conn)
+        for item in drift:
+            print(f" {item['summary']} {item['key']}: {item['column']} "
+                  f"stored {item['stored']}, actual {item['actual']}")
+        if not drift:
+            print(" Summary tables match the base tables.")
+        if rebuild:
+            rebuild_summaries(conn)
+            print(" Summary tables rebuilt.")
+        elif drift:
+            sys.exit(1)
+    finally:
+        conn.close()
+
+
 # -----------------------------
 # Entry Point
 # -----------------------------
 
 if __name__ == "__main__":
-    setup_database_complete()
-    run_test_queries()
+    # python main.py --calibrate [target_ms]
+    # python main.py --import-users users.csv
+    # python main.py --check-plans
+    # python main.py --verify-summaries | --rebuild-summaries
+    if len(sys.argv) > 1 and sys.argv[1] == "--calibrate":
+        calibrate_bcrypt(float(sys.argv[2]) if len(sys.argv) > 2 else 100)
+    elif len(sys.argv) > 2 and sys.argv[1] == "--import-users":
+        import_users(sys.argv[2])
+    elif len(sys.argv) > 1 and sys.argv[1] == "--check-plans":
+        check_plans()
+    elif len(sys.argv) > 1 and sys.argv[1] in ("--verify-summaries", "--rebuild-summaries"):
+        check_summaries(rebuild=sys.argv[1] == "--rebuild-summaries")
+    else:
+        setup_database_complete()
+        run_test_queries()
@@ -1,11 +1,25 @@
 import streamlit as st
+import sys
+import os
+
+# Week 8 package (app.*): users live in the SQLite database
+week8_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "week 8"))
+sys.path.insert(0, week8_path)
+from app.data.users import register_user
+from app.services.session_service import login, logout, validate_session
+from app_db import database_tables
 
 # --- Page configuration ---
 st.set_page_config(page_title="Login / Register", page_icon="🔑", layout="centered")
 
+# The users table (like every other table) is created by the week 8 setup
+if "users" not in database_tables():
+    st.error("The database is not set up yet. Run `python main.py` in week 8 first.")
+    st.stop()
+
 # --- Session state initialization ---
-if "users" not in st.session_state:
-    st.session_state.users = {}  # simple in-memory storage for users
+if "session_token" not in st.session_state:
+    st.session_state.session_token = None
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
 if "username" not in st.session_state:
@@ -14,12 +28,19 @@ if "username" not in st.session_state:
 st.title(" Welcome")
 
 #  If already logged in, show button to go to dashboard
-if st.session_state.logged_in:
+if validate_session(st.session_state.session_token) is not None:
     st.success(f"Already logged in as **{st.session_state.username}**.")
     if st.button("Go to dashboard"):
 
         st.switch_page("pages/cyber.py")
 
+    if st.button("Log out"):
+        logout(st.session_state.session_token)
+        st.session_state.session_token = None
+        st.session_state.logged_in = False
+        st.session_state.username = ""
+        st.rerun()
+
     st.stop()
 
 #  Tabs for Login / Register
@@ -32,8 +53,10 @@ with tab_login:
     login_password = st.text_input("Password", type="password", key="login_password")
 
     if st.button("Log in", type="primary"):
-        users = st.session_state.users
-        if login_username in users and users[login_username] == login_password:
+        # bcrypt runs once here; pages only check the signed session token
+        success, message, token = login(login_username, login_password)
+        if success:
+            st.session_state.session_token = token
             st.session_state.logged_in = True
             st.session_state.username = login_username
             st.success(f"Welcome back, {login_username}! ")
@@ -56,9 +79,9 @@ with tab_register:
             st.warning("Please fill in all fields.")
         elif new_password != confirm_password:
             st.error("Passwords do not match.")
-        elif new_username in st.session_state.users:
-            st.error("Username already exists.")
         else:
-            st.session_state.users[new_username] = new_password
-            st.success("Account created! Go to the Login tab.")
-
+            success, message = register_user(new_username, new_password)
+            if success:
+                st.success("Account created! Go to the Login tab.")
+            else:
+                st.error(message)
@@ -1,16 +1,915 @@
-
+import os
+import re
+import sqlite3
+import sys
+import threading
 import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # columnar cache disabled, CSV is parsed every time
+    pa = None
+
 # Define the base data folder relative to project root
 BASE_PATH = Path(__file__).parent.parent.parent / "week 8" / "DATA"
 
+# Week 8 package (app.*) for the SQLite backend
+WEEK8_PATH = Path(__file__).resolve().parent.parent.parent / "week 8"
+if str(WEEK8_PATH) not in sys.path:
+    sys.path.insert(0, str(WEEK8_PATH))
+from app.data.db import get_connection, DB_PATH
+from app.data.ingest import get_table_columns
+from app.data.readers import build_where, OPERATORS, LIST_OPERATORS
+from app.data.aggregations import aggregate as sql_aggregate
+
+from filter_engine import FilterEngine
+from downsample import downsample, floor_dates, DEFAULT_MAX_POINTS
+
+# Set COLUMNAR_CACHE=0 to always parse the CSV
+COLUMNAR_CACHE = os.environ.get("COLUMNAR_CACHE", "1") != "0"
+CACHE_SUFFIX = ".arrow"
+# Bumped whenever the cached frame layout changes, so old files are rebuilt
+CACHE_VERSION = "3"
+
+# Memory budget of the in-process table cache (MB)
+TABLE_CACHE_MB = int(os.environ.get("TABLE_CACHE_MB", 512))
+# Number of chart aggregates kept by the aggregate cache
+AGGREGATE_CACHE_SIZE = int(os.environ.get("AGGREGATE_CACHE_SIZE", 2048))
+# Number of table pages kept (including prefetched ones)
+PAGE_CACHE_SIZE = int(os.environ.get("PAGE_CACHE_SIZE", 256))
+
+# Explicit dtypes for the numeric columns of the exported tables; every
+# other column is read as text, so a column's type never depends on which
+# values happen to be in the file.
+NUMERIC_DTYPES = {
+    "id": "int64",
+    "record_count": "Int64",
+    "file_size_mb": "float64",
+}
+
+
+def _csv_dtypes(file_path):
+    header = pd.read_csv(file_path, nrows=0).columns
+    return {column: NUMERIC_DTYPES.get(column, "str") for column in header}
+
+
+# Text columns holding dates / timestamps in the exported tables
+DATE_COLUMNS = ("date", "created_date", "resolved_date", "last_updated", "created_at")
+
+# Table name -> exported CSV (without .csv) used by the CSV backend
+CSV_TABLES = {
+    "cyber_incidents": "cyber_incidents_1000",
+    "it_tickets": "it_tickets_1000",
+    "datasets_metadata": "datasets_metadata_1000",
+}
+TABLE_FOR_CSV = {filename: table for table, filename in CSV_TABLES.items()}
+
+# Typed loading profile per table: low-cardinality text columns become
+# categoricals (filters and group-bys then compare integer codes) and
+# numeric columns are downcast to the smallest type that holds them.
+LOAD_PROFILES = {
+    "cyber_incidents": {
+        "categories": ("incident_type", "severity", "status", "reported_by"),
+        "integers": ("id",),
+        "floats": (),
+    },
+    "it_tickets": {
+        "categories": ("priority", "status", "category", "assigned_to"),
+        "integers": ("id",),
+        "floats": (),
+    },
+    "datasets_metadata": {
+        "categories": ("dataset_name", "category", "source"),
+        "integers": ("id", "record_count"),
+        "floats": ("file_size_mb",),
+    },
+}
+
+
+def read_csv_typed(file_path):
+    """Parse a CSV with the explicit dtypes above."""
+    return pd.read_csv(file_path, dtype=_csv_dtypes(file_path))
+
+
+def apply_profile(df, table):
+    """Convert a frame's columns in place to the LOAD_PROFILES types for table."""
+    profile = LOAD_PROFILES.get(table)
+    if profile is None:
+        return df
+    for column in profile["categories"]:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    for column in profile["integers"]:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], downcast="integer")
+    for column in profile["floats"]:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], downcast="float")
+    return df
+
+
+def normalize_frame(df, table=None, typed=True):
+    """
+    Strip and lower-case the column names, parse the date columns (bad
+    values become NaT) and, unless typed is False, apply the table's
+    loading profile.
+    """
+    df.columns = df.columns.str.strip().str.lower()
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+    return apply_profile(df, table) if typed else df
+
+
+def cache_path_for(file_path):
+    """Columnar cache file kept next to a CSV (e.g. cyber_incidents_1000.arrow)."""
+    return Path(file_path).with_suffix(CACHE_SUFFIX)
+
+
+def _source_stamp(file_path):
+    stat = os.stat(file_path)
+    return f"{CACHE_VERSION}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _read_cache(cache_path, stamp):
+    """
+    Memory-map a cache file; None if it is missing or built from another CSV
+    version. Only numeric columns without nulls stay backed by the mapping;
+    text, date and categorical columns are converted into pandas memory.
+    """
+    if not cache_path.exists():
+        return None
+    try:
+        # Closing the file releases its descriptor; the mapped region is
+        # kept alive by the buffers that use it and unmapped with the frame
+        # (e.g. when table_cache evicts it)
+        with pa.memory_map(str(cache_path), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if (table.schema.metadata or {}).get(b"source_stamp") != stamp.encode():
+        return None
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _write_cache(df, cache_path, stamp):
+    """Write an uncompressed Feather (Arrow IPC) file so it can be mapped as is."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"source_stamp": stamp.encode()})
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        feather.write_feather(table, str(tmp_path), compression="uncompressed")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Read-only data folder: serve the parsed frame without caching it
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_csv(file_path, use_cache=None):
+    """
+    Load a CSV as a normalized frame through the columnar cache. The first
+    load parses the CSV and writes <name>.arrow next to it; later loads
+    memory-map that file (only null-free numeric columns are used from the
+    mapping without a copy). The cache records the CSV's size and mtime and is
+    rebuilt when they change.
+    """
+    file_path = Path(file_path)
+    table = TABLE_FOR_CSV.get(file_path.stem)
+    if use_cache is None:
+        use_cache = COLUMNAR_CACHE
+    if not use_cache or pa is None:
+        return normalize_frame(read_csv_typed(file_path), table)
+
+    stamp = _source_stamp(file_path)
+    cache_path = cache_path_for(file_path)
+    df = _read_cache(cache_path, stamp)
+    if df is None:
+        df = normalize_frame(read_csv_typed(file_path), table)
+        _write_cache(df, cache_path, stamp)
+    return df
+
+
+class TableCache:
+    """
+    Process-wide LRU cache of loaded frames, bounded by total memory.
+
+    Entries are keyed on (path, size, mtime), so a changed file is a miss and
+    its stale entry is dropped. Streamlit imports this module once per
+    process, so every session and rerun shares the same frames; callers
+    must treat them as read-only (filter into a copy, never assign into one).
+    Objects built from a frame (see derived) live in the frame's entry: they
+    count against the budget and are dropped with it.
+    """
+
+    def __init__(self, max_bytes=TABLE_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # path -> [stamp, frame, nbytes, {name: derived object}]
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path, loader):
+        """Return the frame for path, calling loader(path) at most once per file version."""
+        path = Path(path).resolve()
+        stamp = _source_stamp(path)
+        with self._lock:
+            frame = self._lookup(path, stamp)
+            if frame is not None:
+                return frame
+            load_lock = self._load_locks.setdefault(path, threading.Lock())
+
+        # One loader per file; concurrent sessions wait for it instead of reparsing
+        with load_lock:
+            with self._lock:
+                frame = self._lookup(path, stamp)
+                if frame is not None:
+                    return frame
+                self.misses += 1
+            frame = loader(path)
+            self._store(path, stamp, frame)
+        return frame
+
+    def _lookup(self, path, stamp):
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        if entry[0] != stamp:
+            self._drop(path)
+            return None
+        self._entries.move_to_end(path)
+        self.hits += 1
+        return entry[1]
+
+    def _store(self, path, stamp, frame):
+        nbytes = int(frame.memory_usage(deep=True).sum())
+        with self._lock:
+            self._drop(path)
+            if nbytes > self.max_bytes:
+                return  # larger than the whole budget: served but not kept
+            self._entries[path] = [stamp, frame, nbytes, {}]
+            self._bytes += nbytes
+            self._evict()
+
+    def derived(self, path, name, frame, build):
+        """
+        Return build(frame), built once per cached version of path's frame.
+        The result (which must have an nbytes() method) is kept in the
+        frame's entry, so its memory counts against the budget and it is
+        dropped when the frame is evicted or invalidated; for a frame that
+        is no longer cached it is built but not kept.
+        """
+        path = Path(path).resolve()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[1] is frame and name in entry[3]:
+                return entry[3][name]
+        obj = build(frame)
+        nbytes = int(obj.nbytes())
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[1] is frame and name not in entry[3]:
+                entry[3][name] = obj
+                entry[2] += nbytes
+                self._bytes += nbytes
+                self._evict()
+        return obj
+
+    def _evict(self):
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def invalidate(self, path=None):
+        """Drop one file's frame, or every frame when path is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                self._drop(Path(path).resolve())
+
+    def stats(self):
+        """Counters and current size, e.g. for an admin panel."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+table_cache = TableCache()
+
+
 def get_table_from_csv(filename):
+    """
+    Return a normalized table (lower-case columns, parsed dates, typed per
+    LOAD_PROFILES), shared across sessions through table_cache. Do not
+    modify the returned frame.
+    """
     file_path = BASE_PATH / f"{filename}.csv"
     if not file_path.exists():
         raise FileNotFoundError(f"CSV file not found: {file_path}")
-    return pd.read_csv(file_path)
+    return table_cache.get(file_path, load_csv)
+
+
+def invalidate_tables(filename=None):
+    """Forget the cached frame (and its filter engine) and chart aggregates for one table, or all."""
+    table_cache.invalidate(None if filename is None else BASE_PATH / f"{filename}.csv")
+    aggregate_cache.invalidate(None if filename is None else TABLE_FOR_CSV.get(filename, filename))
+
+
+def get_cache_stats():
+    """Hit/miss/eviction counters and memory use of the table cache."""
+    return table_cache.stats()
+
+
+# --- Pluggable data sources with filter pushdown ---
+# "csv" reads the exported snapshots, "sqlite" the live week 8 database once
+# its setup (week 8 main.py) has loaded the tables; "auto" (default) picks
+# sqlite when the database is loaded, csv otherwise
+DATA_BACKEND = os.environ.get("DATA_BACKEND", "auto")
+
+
+def filters_from_selections(selections):
+    """Turn sidebar selections ({column: value}) into filters; "All" means no filter."""
+    return {column: (None if value == "All" else value) for column, value in selections.items()}
+
+
+def _like_to_regex(pattern):
+    # SQL LIKE: % = any run, _ = one character, case-insensitive
+    return "^" + "".join(
+        ".*" if ch == "%" else "." if ch == "_" else re.escape(ch) for ch in pattern
+    ) + "$"
+
+
+def apply_filters(df, filters):
+    """
+    Apply filters in the app.data.readers format (column, column__gte, list
+    values as IN or, with __ne, NOT IN, None ignored) to a frame. Rows with
+    a missing value never match, as in SQL.
+    """
+    mask = pd.Series(True, index=df.index)
+    for key, value in (filters or {}).items():
+        if value is None:
+            continue
+        column, _, op = key.partition("__")
+        if column not in df.columns:
+            raise ValueError(f"Unknown filter column: {column}")
+        if op and op not in OPERATORS:
+            raise ValueError(f"Unknown filter operator: {op}")
+        series = df[column]
+        if isinstance(value, (list, tuple, set)):
+            if op not in LIST_OPERATORS:
+                raise ValueError(f"Operator {op} does not take a list of values: {key}")
+            matches = series.isin(list(value))
+            mask &= (~matches & series.notna()) if LIST_OPERATORS[op] == "NOT IN" else matches
+            continue
+        op = op or "eq"
+        if op == "like":
+            mask &= series.astype("string").str.match(_like_to_regex(value), case=False).fillna(False).astype(bool)
+        else:
+            unordered = isinstance(series.dtype, pd.CategoricalDtype) and not series.cat.ordered
+            if unordered and op in ("gt", "gte", "lt", "lte"):
+                # Unordered categoricals refuse <, >; compare the values, like SQL does
+                series = series.astype(object)
+            compare = {"eq": series.eq, "ne": series.ne, "gt": series.gt,
+                       "gte": series.ge, "lt": series.lt, "lte": series.le}[op]
+            mask &= compare(value) & series.notna()
+    return df[mask]
+
+
+class CsvBackend:
+    """
+    Tables from the exported CSVs, via the shared table cache. Equality/IN
+    filters on the profile's categorical columns are answered from bitmap
+    indexes (filter_engine.py); anything else runs in pandas.
+    """
+
+    name = "csv"
+
+    def engine(self, table):
+        """
+        The FilterEngine for the currently cached version of table. It is
+        kept in the table cache next to its frame, so its bitmaps count
+        against TABLE_CACHE_MB and go away when the frame does.
+        """
+        filename = CSV_TABLES[table]
+        df = get_table_from_csv(filename)
+        categories = LOAD_PROFILES.get(table, {}).get("categories", ())
+        return table_cache.derived(BASE_PATH / f"{filename}.csv", "filter_engine", df,
+                                   lambda frame: FilterEngine(frame, categories))
+
+    def columns(self, table):
+        return list(get_table_from_csv(CSV_TABLES[table]).columns)
+
+    def distinct_values(self, table, column):
+        return self.engine(table).distinct_values(column)
+
+    def load(self, table, filters=None, columns=None):
+        return self.engine(table).select(filters, columns, apply_rest=apply_filters)
+
+    def count(self, table, filters=None):
+        return self.engine(table).count(filters, apply_rest=apply_filters)
+
+    def page(self, table, filters=None, order_by="id", descending=False, offset=0, limit=50,
+             columns=None):
+        if order_by not in self.columns(table):
+            raise ValueError(f"Unknown column for {table}: {order_by}")
+        # Only the shown columns plus the sort keys are selected
+        needed = list(dict.fromkeys([*columns, order_by, "id"])) if columns else None
+        df = self.load(table, filters, needed)
+        if order_by != "id" or descending:
+            keys = [order_by, "id"] if order_by != "id" else ["id"]
+            df = df.sort_values(keys, ascending=not descending, kind="stable", na_position="last")
+        page = df.iloc[offset:offset + limit]
+        return page[list(columns)] if columns else page
+
+    def version(self, table):
+        """Changes whenever the table's CSV file changes."""
+        return _source_stamp(BASE_PATH / f"{CSV_TABLES[table]}.csv")
+
+    def aggregate(self, table, group_by, filters=None, agg="count", value=None, time_bucket=None):
+        columns = [group_by] + ([value] if value else [])
+        df = self.load(table, filters, columns)
+        if time_bucket:
+            df = df.assign(**{group_by: floor_dates(df[group_by], time_bucket)})
+        groups = df.groupby(group_by, observed=True)
+        if agg == "count":
+            return groups.size().reset_index(name="count")
+        return getattr(groups[value], agg)().reset_index()
+
+
+class SqliteBackend:
+    """
+    Tables from the week 8 database. Filters become a parameterized WHERE
+    and only the requested columns are selected, so SQLite (and its
+    indexes) do the filtering and only matching rows reach pandas.
+    """
+
+    name = "sqlite"
+
+    def columns(self, table):
+        return get_table_columns(get_connection(), table)
+
+    def distinct_values(self, table, column):
+        if column not in self.columns(table):
+            raise ValueError(f"Unknown column for {table}: {column}")
+        rows = get_connection().execute(
+            f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY {column}")
+        return [str(row[0]) for row in rows]
+
+    def load(self, table, filters=None, columns=None):
+        table_columns = self.columns(table)
+        selected = list(columns or table_columns)
+        unknown = [column for column in selected if column not in table_columns]
+        if unknown:
+            raise ValueError(f"Unknown column(s) for {table}: {', '.join(unknown)}")
+        where, params = build_where(filters, table_columns)
+        sql = f"SELECT {', '.join(selected)} FROM {table}"
+        if where:
+            sql += f" WHERE {where}"
+        return normalize_frame(pd.read_sql_query(sql, get_connection(), params=params), table)
+
+    def count(self, table, filters=None):
+        # COUNT(*) in SQLite, or a summary-table lookup when the filters allow
+        return int(sql_aggregate(get_connection(), table, [], filters)["count"].iloc[0])
+
+    def page(self, table, filters=None, order_by="id", descending=False, offset=0, limit=50,
+             columns=None):
+        table_columns = self.columns(table)
+        selected = list(columns or table_columns)
+        unknown = [column for column in selected + [order_by] if column not in table_columns]
+        if unknown:
+            raise ValueError(f"Unknown column(s) for {table}: {', '.join(unknown)}")
+        where, params = build_where(filters, table_columns)
+        direction = "DESC" if descending else "ASC"
+        order = f"{order_by} {direction}" + (f", id {direction}" if order_by != "id" else "")
+        sql = f"SELECT {', '.join(selected)} FROM {table}"
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order} LIMIT ? OFFSET ?"
+        df = pd.read_sql_query(sql, get_connection(), params=params + [limit, offset])
+        return normalize_frame(df, table)
+
+    def version(self, table):
+        """
+        Changes on every committed write: in WAL mode commits append to the
+        -wal file and checkpoints rewrite the database file, so their sizes
+        and mtimes together identify the data.
+        """
+        get_connection()  # the first connection switches the file to WAL mode
+        return _database_stamp()
+
+    def aggregate(self, table, group_by, filters=None, agg="count", value=None, time_bucket=None):
+        # GROUP BY in SQLite (or the summary tables for plain counts)
+        value_name = "count" if agg == "count" else value
+        if time_bucket:
+            df = sql_aggregate(get_connection(), table, [], filters, value=value, agg=agg,
+                               time_bucket=time_bucket, date_column=group_by, value_name=value_name)
+            df = df.rename(columns={"bucket": group_by})
+        else:
+            df = sql_aggregate(get_connection(), table, [group_by], filters, value=value, agg=agg,
+                               value_name=value_name)
+        return normalize_frame(df, typed=False)
+
+
+def _database_stamp():
+    parts = []
+    for path in (Path(DB_PATH), Path(f"{DB_PATH}-wal")):
+        try:
+            stat = os.stat(path)
+            parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+        except FileNotFoundError:
+            parts.append("-")
+    return "|".join(parts)
+
+
+_database_loaded = {}   # database stamp -> result of database_loaded()
+
+
+def database_loaded():
+    """
+    True if the week 8 setup has loaded every table into the database, i.e.
+    ingest_manifest has a row for each of them. The file is opened read-only,
+    so the check never creates or changes it; the answer is reused until the
+    database changes.
+    """
+    if not Path(DB_PATH).exists():
+        return False
+    stamp = _database_stamp()
+    if stamp not in _database_loaded:
+        try:
+            conn = sqlite3.connect(f"{Path(DB_PATH).as_uri()}?mode=ro", uri=True)
+            try:
+                loaded = {row[0] for row in conn.execute("SELECT DISTINCT table_name FROM ingest_manifest")}
+            finally:
+                conn.close()
+        except sqlite3.Error:  # no manifest: created before the incremental loader, or never set up
+            loaded = set()
+        _database_loaded.clear()
+        _database_loaded[stamp] = set(CSV_TABLES) <= loaded
+    return _database_loaded[stamp]
+
+
+BACKENDS = {"csv": CsvBackend(), "sqlite": SqliteBackend()}
+
+
+def get_backend(name=None):
+    """
+    Return a backend by name (default DATA_BACKEND). "auto" and "sqlite"
+    use the database once the week 8 setup has loaded it (database_loaded)
+    and CSV until then.
+    """
+    name = name or DATA_BACKEND
+    if name == "auto":
+        name = "sqlite"
+    if name not in BACKENDS:
+        raise ValueError(f"DATA_BACKEND must be one of auto, {', '.join(BACKENDS)}")
+    if name == "sqlite" and not database_loaded():
+        return BACKENDS["csv"]
+    return BACKENDS[name]
+
+
+_database_tables = {}   # database stamp -> names of its tables
+
+
+def database_tables():
+    """
+    Names of the tables in the week 8 database (empty if it does not exist
+    yet). Read-only like database_loaded(), and reused until the database
+    changes.
+    """
+    if not Path(DB_PATH).exists():
+        return frozenset()
+    stamp = _database_stamp()
+    if stamp not in _database_tables:
+        try:
+            conn = sqlite3.connect(f"{Path(DB_PATH).as_uri()}?mode=ro", uri=True)
+            try:
+                names = frozenset(row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"))
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            names = frozenset()
+        _database_tables.clear()
+        _database_tables[stamp] = names
+    return _database_tables[stamp]
+
+
+def search_available(table):
+    """
+    True if full-text search over table can be offered, i.e. the week 8
+    setup has built its FTS index. Search always runs on the database, so
+    this does not depend on the active backend.
+    """
+    return f"{table}_fts" in database_tables()
+
+
+def load_table(table, filters=None, columns=None, backend=None):
+    """
+    Read the rows of table matching filters (only the given columns), e.g.
+    load_table("cyber_incidents", {"severity": "High", "status": None}).
+    """
+    return get_backend(backend).load(table, filters, columns)
+
+
+def distinct_values(table, column, backend=None):
+    """Sorted non-null values of a column, as strings, for filter widgets."""
+    return get_backend(backend).distinct_values(table, column)
+
+
+def table_columns(table, backend=None):
+    """Column names of a table in the active backend."""
+    return get_backend(backend).columns(table)
+
+
+# --- Chart aggregate cache ---
+def data_version(table, backend=None):
+    """An id of the current contents of table, e.g. to scope cached answers to it."""
+    source = get_backend(backend)
+    return f"{source.name}:{table}:{source.version(table)}"
+
+
+def freeze_filters(filters):
+    """Hashable, order-independent form of a filters dict (None values dropped)."""
+    frozen = []
+    for key, value in (filters or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = tuple(sorted(value, key=str))
+        frozen.append((key, value))
+    return tuple(sorted(frozen))
+
+
+class AggregateCache:
+    """
+    Process-wide LRU cache of small chart frames, keyed on (backend, table,
+    data version, filters, chart spec). A change to the data changes the
+    version, so stale results are never served; they are dropped as soon
+    as the new version is seen. Cached frames are shared: do not modify.
+    """
+
+    def __init__(self, max_entries=AGGREGATE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> frame
+        self._versions = {}             # (backend, table) -> latest version seen
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, compute):
+        """Return the cached frame for key, or compute(), cache and return it."""
+        backend, table, version = key[:3]
+        with self._lock:
+            if self._versions.get((backend, table)) != version:
+                self._drop_table(backend, table)
+                self._versions[(backend, table)] = version
+            frame = self._entries.get(key)
+            if frame is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return frame
+            self.misses += 1
+        frame = compute()
+        with self._lock:
+            self._entries[key] = frame
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return frame
+
+    def _drop_table(self, backend, table):
+        for key in [k for k in self._entries if k[0] == backend and k[1] == table]:
+            del self._entries[key]
+
+    def invalidate(self, table=None):
+        """Drop the cached aggregates of one table, or all of them."""
+        with self._lock:
+            if table is None:
+                self._entries.clear()
+                self._versions.clear()
+            else:
+                for key in [k for k in self._entries if k[1] == table]:
+                    del self._entries[key]
+                for key in [k for k in self._versions if k[1] == table]:
+                    del self._versions[key]
+
+    def stats(self):
+        """Counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+aggregate_cache = AggregateCache()
+
+
+def aggregate_table(table, group_by, filters=None, agg="count", value=None, backend=None,
+                    time_bucket=None):
+    """
+    Chart data: one row per group_by value with "count" (agg="count") or
+    the sum/avg/min/max of value, in group order. With time_bucket
+    ("day", "week" or "month") group_by is a date column and rows are
+    grouped by the start of each bucket. Results are memoized in
+    aggregate_cache, so every analyst asking for the same view with the
+    same filters shares one computation.
+    """
+    source = get_backend(backend)
+    spec = (group_by, agg, value, time_bucket)
+    key = (source.name, table, source.version(table), freeze_filters(filters), spec)
+    return aggregate_cache.get(
+        key, lambda: source.aggregate(table, group_by, filters, agg, value, time_bucket))
+
+
+def time_series(table, date_column, filters=None, agg="count", value=None,
+                max_points=DEFAULT_MAX_POINTS, use_lttb=False, backend=None):
+    """
+    A chart-ready time series of table: daily aggregates (cached, computed
+    by the data source) re-bucketed to day/week/month to fit max_points or,
+    with use_lttb, kept daily and reduced to max_points with LTTB.
+    Returns (frame with date_column and "count" or value, bucket name).
+    """
+    daily = aggregate_table(table, date_column, filters, agg, value, backend, time_bucket="day")
+    y = "count" if agg == "count" else value
+    return downsample(daily, date_column, y, max_points, agg, use_lttb)
+
+
+def get_aggregate_cache_stats():
+    """Hit/miss/eviction counters of the aggregate cache."""
+    return aggregate_cache.stats()
+
+
+def count_rows(table, filters=None, backend=None):
+    """Number of rows matching filters, memoized like the chart aggregates."""
+    source = get_backend(backend)
+    key = (source.name, table, source.version(table), freeze_filters(filters), ("count",))
+    return aggregate_cache.get(key, lambda: source.count(table, filters))
+
+
+# --- Table pages ---
+class PageCache:
+    """
+    Process-wide LRU cache of table pages held as futures, keyed like the
+    aggregates (backend, table, data version, filters, page spec). The
+    future is inserted under the lock, so concurrent requests for the same
+    page (including its prefetch) share one fetch instead of racing to
+    submit their own. Pages of an older data version are dropped when a
+    newer one is seen.
+    """
+
+    def __init__(self, max_entries=PAGE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._futures = OrderedDict()   # key -> Future of the page frame
+        self._versions = {}             # (backend, table) -> latest version seen
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, submit):
+        """Return the future for key, calling submit() (which must not block) on a miss."""
+        backend, table, version = key[:3]
+        with self._lock:
+            if self._versions.get((backend, table)) != version:
+                for old in [k for k in self._futures if k[0] == backend and k[1] == table]:
+                    del self._futures[old]
+                self._versions[(backend, table)] = version
+            future = self._futures.get(key)
+            if future is not None:
+                self._futures.move_to_end(key)
+                self.hits += 1
+                return future
+            self.misses += 1
+            future = self._futures[key] = submit()
+            while len(self._futures) > self.max_entries:
+                self._futures.popitem(last=False)
+                self.evictions += 1
+            return future
+
+    def discard(self, key, future):
+        """Drop key if it still holds future (e.g. a failed fetch), so the next request retries."""
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+    def stats(self):
+        """Counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._futures),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._futures)
+
+
+page_cache = PageCache()
+_page_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="table-page")
+
+
+def get_page(table, filters=None, order_by="id", descending=False, page=0, page_size=50,
+             columns=None, backend=None, prefetch=True):
+    """
+    One page (0-based) of the rows matching filters, sorted by order_by
+    (then id), with the sort, offset and limit pushed to the data source.
+    With prefetch, the following page is fetched in the background so
+    "next" is served from page_cache.
+    """
+    source = get_backend(backend)
+    version = source.version(table)
+    frozen = freeze_filters(filters)
+    columns = list(columns) if columns else None
+
+    def key_for(n):
+        spec = ("page", order_by, descending, n, page_size, tuple(columns or ()))
+        return (source.name, table, version, frozen, spec)
+
+    def fetch(n):
+        return lambda: _page_pool.submit(source.page, table, filters, order_by, descending,
+                                         n * page_size, page_size, columns)
+
+    future = page_cache.get(key_for(page), fetch(page))
+    try:
+        df = future.result()
+    except Exception:
+        page_cache.discard(key_for(page), future)
+        raise
+    if prefetch and len(df) == page_size:
+        page_cache.get(key_for(page + 1), fetch(page + 1))
+    return df
 
 
+def frame_bytes(df):
+    """Total memory of a frame, including the Python string objects."""
+    return int(df.memory_usage(index=False, deep=True).sum())
 
 
+def memory_report(table):
+    """
+    Bytes per row of a table's CSV loaded untyped (text and 64-bit columns)
+    versus with its loading profile, per column and in total.
+    """
+    file_path = BASE_PATH / f"{CSV_TABLES[table]}.csv"
+    before = normalize_frame(read_csv_typed(file_path), typed=False)
+    after = apply_profile(before.copy(), table)
+    rows = max(len(before), 1)
+    columns = {
+        column: {
+            "dtype_before": str(before[column].dtype),
+            "dtype_after": str(after[column].dtype),
+            "bytes_per_row_before": before[column].memory_usage(index=False, deep=True) / rows,
+            "bytes_per_row_after": after[column].memory_usage(index=False, deep=True) / rows,
+        }
+        for column in before.columns
+    }
+    bytes_before, bytes_after = frame_bytes(before), frame_bytes(after)
+    return {
+        "table": table,
+        "rows": len(before),
+        "bytes_per_row_before": bytes_before / rows,
+        "bytes_per_row_after": bytes_after / rows,
+        "ratio": bytes_before / bytes_after if bytes_after else 0.0,
+        "columns": columns,
+    }
@@ -0,0 +1,67 @@
+"""
+Benchmark: cold CSV parsing vs warm loads from the columnar cache.
+
+For each size a synthetic cyber_incidents CSV is generated, then timed:
+- cold:  read_csv_typed(), the CSV parse every page load used to pay
+- build: first load_csv(), parse plus writing the .arrow cache
+- warm:  later load_csv() calls, memory-mapping the cache
+
+Usage: python bench_columnar_cache.py [rows,rows,...]   (default 1000,100000,10000000)
+"""
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app_db import load_csv, read_csv_typed, cache_path_for
+
+TYPES = ["Phishing", "Malware", "DDoS", "Ransomware", "Insider Threat"]
+SEVERITIES = ["Low", "Medium", "High", "Critical"]
+STATUSES = ["Open", "Investigating", "Resolved", "Closed"]
+HEADER = ["id", "date", "incident_type", "severity", "status", "description", "reported_by", "created_at"]
+
+WARM_RUNS = 5
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for i in range(1, rows + 1):
+            writer.writerow((
+                i, f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+                random.choice(TYPES), random.choice(SEVERITIES), random.choice(STATUSES),
+                f"Incident {i:020d}", "Security Team", "2025-12-10 13:43:19",
+            ))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1].split(",")] if len(sys.argv) > 1 else [1_000, 100_000, 10_000_000]
+
+    print(f"{'rows':>12} {'csv MB':>8} {'arrow MB':>9} {'cold s':>9} {'build s':>9} {'warm s':>9} {'speedup':>8}")
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "cyber_incidents.csv")
+            write_csv(csv_path, rows)
+
+            cold_df, cold = timed(read_csv_typed, csv_path)
+            _, build = timed(load_csv, csv_path)
+            warm = min(timed(load_csv, csv_path)[1] for _ in range(WARM_RUNS))
+            assert len(load_csv(csv_path)) == len(cold_df)
+
+            csv_mb = os.path.getsize(csv_path) / 1e6
+            arrow_mb = os.path.getsize(cache_path_for(csv_path)) / 1e6
+            print(f"{rows:>12,} {csv_mb:>8.1f} {arrow_mb:>9.1f} {cold:>9.3f} {build:>9.3f} "
+                  f"{warm:>9.3f} {cold / warm:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: sidebar filtering with the bitmap FilterEngine vs the pages'
+original approach (df.copy() then one string mask per selected filter).
+
+A synthetic cyber_incidents-shaped frame is built in memory; each filter
+combination is timed both ways and the results are checked to match.
+
+Usage: python bench_filter_engine.py [rows]   (default 10,000,000)
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from filter_engine import FilterEngine
+
+TYPES = ["Phishing", "Malware", "DDoS", "Ransomware", "Insider Threat", "Data Breach"]
+SEVERITIES = ["Low", "Medium", "High", "Critical"]
+STATUSES = ["Open", "Investigating", "Resolved", "Closed"]
+FILTER_COLUMNS = ["incident_type", "severity", "status"]
+
+COMBINATIONS = [
+    {"incident_type": "Phishing"},
+    {"incident_type": "Phishing", "severity": "High"},
+    {"incident_type": "Phishing", "severity": "High", "status": "Open"},
+    {"severity": "Critical", "status": "Open"},
+]
+
+
+def make_frame(rows):
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        "id": np.arange(1, rows + 1, dtype=np.int64),
+        "incident_type": pd.Categorical.from_codes(rng.integers(0, len(TYPES), rows), TYPES),
+        "severity": pd.Categorical.from_codes(rng.integers(0, len(SEVERITIES), rows), SEVERITIES),
+        "status": pd.Categorical.from_codes(rng.integers(0, len(STATUSES), rows), STATUSES),
+    })
+
+
+def original_filter(df, selections):
+    """What the pages did: copy, then one .astype(str) mask per selection."""
+    filtered = df.copy()
+    for column, value in selections.items():
+        filtered = filtered[filtered[column].astype(str) == value]
+    return filtered
+
+
+def best_of(fn, runs=3):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    df = make_frame(rows)
+
+    start = time.perf_counter()
+    engine = FilterEngine(df, FILTER_COLUMNS)
+    build = time.perf_counter() - start
+    print(f"{rows:,} rows; index build {build:.2f}s, {engine.nbytes() / 1e6:.1f} MB of bitmaps")
+
+    print(f"{'':<55} {'original':>9} {'engine':>9} {'speedup':>8}")
+    _, options_old = best_of(lambda: [sorted(df[c].astype(str).unique()) for c in FILTER_COLUMNS])
+    _, options_new = best_of(lambda: [engine.distinct_values(c) for c in FILTER_COLUMNS])
+    print(f"{'selectbox options':<55} {options_old:>8.3f}s {options_new:>8.4f}s {options_old / options_new:>7.0f}x")
+
+    for selections in COMBINATIONS:
+        expected, old = best_of(lambda: original_filter(df, selections))
+        result, new = best_of(lambda: engine.select(selections))
+        assert result["id"].tolist() == expected["id"].tolist()
+        label = ", ".join(f"{k}={v}" for k, v in selections.items())
+        print(f"{label:<55} {old:>8.3f}s {new:>8.4f}s {old / new:>8.1f}x  ({len(result):,} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Memory report: bytes per row of each dashboard table loaded untyped
+(text and 64-bit columns) versus with its app_db.LOAD_PROFILES profile.
+
+Usage: python bench_memory.py [table ...]   (default: all tables)
+"""
+import sys
+
+from app_db import memory_report, CSV_TABLES
+
+
+def main():
+    tables = sys.argv[1:] or list(CSV_TABLES)
+    for table in tables:
+        report = memory_report(table)
+        print(f"\n{table}: {report['rows']:,} rows, "
+              f"{report['bytes_per_row_before']:.0f} -> {report['bytes_per_row_after']:.0f} bytes/row "
+              f"({report['ratio']:.1f}x smaller)")
+        print(f"  {'column':<16} {'before':<16} {'after':<16} {'B/row before':>12} {'B/row after':>12}")
+        for column, info in report["columns"].items():
+            print(f"  {column:<16} {info['dtype_before']:<16} {info['dtype_after']:<16} "
+                  f"{info['bytes_per_row_before']:>12.1f} {info['bytes_per_row_after']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+ChatGPT panel shared by the dashboards.
+
+Answers are streamed into the page as the model writes them, so the first
+words show up after the time-to-first-token instead of the whole generation
+time. A Stop button cancels the answer (the click reruns the page, which
+closes the stream and its connection); a time budget cuts off answers that
+run too long. Partial answers stay in the history, marked as such.
+"""
+import sys
+from pathlib import Path
+
+import streamlit as st
+
+from app_db import data_version
+
+# Week 10 (chatgpt_bot, llm_cache)
+WEEK10_PATH = Path(__file__).resolve().parent.parent.parent / "week 10"
+if str(WEEK10_PATH) not in sys.path:
+    sys.path.insert(0, str(WEEK10_PATH))
+from chatgpt_bot import stream_chatgpt, TIME_BUDGET
+
+BUBBLE = """
+        <div style="
+            background-color: {color};
+            padding: 10px;
+            border-radius: 10px;
+            margin: 5px 0;
+            max-width: 70%;
+            float: {side};
+            clear: both;
+        ">
+            <strong>{who}:</strong> {text}
+        </div>
+        """
+
+
+def _user_bubble(text, target=st):
+    target.markdown(BUBBLE.format(color="#DCF8C6", side="right", who="You", text=text),
+                    unsafe_allow_html=True)
+
+
+def _bot_bubble(text, target=st):
+    target.markdown(BUBBLE.format(color="#F1F0F0", side="left", who="ChatGPT", text=text),
+                    unsafe_allow_html=True)
+
+
+NOTES = {"stopped": " <em>(stopped)</em>", "timed_out": " <em>(cut off)</em>"}
+
+
+def _answer_text(chat):
+    return chat["bot"] + NOTES.get(chat["state"], "")
+
+
+def chat_panel(table, key="chat", time_budget=TIME_BUDGET):
+    """
+    Render the chat form and history. Answers are cached per version of
+    table's data (see chatgpt_bot.stream_chatgpt).
+    """
+    st.header(" :) ChatGPT ")
+
+    # Initialize conversation in session state
+    history_key = f"{key}_history"
+    if history_key not in st.session_state:
+        st.session_state[history_key] = []
+    history = st.session_state[history_key]
+
+    with st.form(key=f"{key}_form", clear_on_submit=True):
+        user_input = st.text_input("Type your message here:")
+        fresh = st.checkbox("Ask again (skip cached answer)")
+        send_button = st.form_submit_button("Send")
+
+    # Display chat history (after form, so input stays at the top)
+    for chat in history:
+        _user_bubble(chat["user"])
+        _bot_bubble(_answer_text(chat))
+
+    if send_button and user_input:
+        # Stored before streaming: if Stop interrupts the run, the partial
+        # answer is kept and marked as stopped
+        chat = {"user": user_input, "bot": "", "state": "stopped"}
+        history.append(chat)
+        stop = st.empty()
+        stop.button("Stop", key=f"{key}_stop")
+        # Placeholders, so a failed question leaves nothing behind on the page
+        question = st.empty()
+        _user_bubble(user_input, question)
+        answer = st.empty()
+        try:
+            for piece in stream_chatgpt(user_input, data_version=data_version(table),
+                                        use_cache=not fresh, time_budget=time_budget):
+                chat["bot"] += piece
+                _bot_bubble(chat["bot"] + " ▌", answer)
+            chat["state"] = "done"
+        except TimeoutError as e:
+            chat["state"] = "timed_out"
+            st.warning(str(e))
+        except Exception as e:
+            history.remove(chat)
+            question.empty()
+            answer.empty()
+            st.error(f"API call failed: {e}")
+        stop.empty()
+        if chat["state"] != "stopped":
+            _bot_bubble(_answer_text(chat), answer)
+
+    st.markdown("<div style='clear: both;'></div>", unsafe_allow_html=True)
@@ -0,0 +1,106 @@
+"""
+Downsampling for the dashboard time-series charts.
+
+A series is re-bucketed to day, week or month, whichever keeps the visible
+range under a point budget. Alternatively it keeps daily resolution and is
+reduced to that budget with Largest-Triangle-Three-Buckets (LTTB), which
+keeps the points that shape the line (peaks, dips) instead of averaging
+them away. Chart payloads then stay bounded however long the history is.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+# Points sent to a line chart by default
+DEFAULT_MAX_POINTS = 365
+
+# Bucket sizes from finest to coarsest, with their approximate length in days.
+# Weeks start on Monday and months on the 1st, like app.data.aggregations.
+BUCKETS = [("day", 1), ("week", 7), ("month", 30.44)]
+
+# Aggregates that can be re-bucketed from finer buckets (avg cannot)
+REBUCKET_AGGREGATES = {"sum", "count", "min", "max"}
+
+
+def floor_dates(dates, bucket):
+    """Map a datetime Series to the start of its day, week or month."""
+    dates = pd.to_datetime(dates)
+    if bucket == "day":
+        return dates.dt.normalize()
+    if bucket == "week":
+        return (dates - pd.to_timedelta(dates.dt.weekday, unit="D")).dt.normalize()
+    if bucket == "month":
+        return dates.dt.to_period("M").dt.to_timestamp()
+    raise ValueError(f"bucket must be one of {', '.join(name for name, _ in BUCKETS)}")
+
+
+def choose_bucket(start, end, max_points=DEFAULT_MAX_POINTS):
+    """The finest bucket that covers start..end in at most max_points points."""
+    if pd.isna(start) or pd.isna(end):
+        return "day"
+    span_days = (pd.Timestamp(end) - pd.Timestamp(start)).days + 1
+    for name, days in BUCKETS:
+        if span_days / days <= max_points:
+            return name
+    return BUCKETS[-1][0]
+
+
+def rebucket(df, x, y, bucket, agg="sum"):
+    """Aggregate df[y] per bucket of df[x]; returns a frame with columns x, y."""
+    if agg not in REBUCKET_AGGREGATES:
+        raise ValueError(f"Cannot re-bucket agg='{agg}'")
+    how = "sum" if agg == "count" else agg
+    out = df.assign(**{x: floor_dates(df[x], bucket)})
+    return out.groupby(x, sort=True)[y].agg(how).reset_index()
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets: indices of threshold points of (x, y)
+    that best preserve the visual shape. x must be sorted.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    every = (n - 2) / (threshold - 2)
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle corner
+        next_start = int(math.floor((i + 1) * every)) + 1
+        next_end = min(int(math.floor((i + 2) * every)) + 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        start = int(math.floor(i * every)) + 1
+        end = int(math.floor((i + 1) * every)) + 1
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    indices[-1] = n - 1
+    return indices
+
+
+def downsample(df, x, y, max_points=DEFAULT_MAX_POINTS, agg="sum", use_lttb=False):
+    """
+    Bound a time series for charting. df holds one row per point (e.g.
+    daily aggregates); it is re-bucketed to the finest of day/week/month
+    that fits max_points or, with use_lttb, kept per day and reduced to
+    max_points days with LTTB. Returns (frame sorted by x, bucket name).
+    """
+    df = df.dropna(subset=[x]).sort_values(x)
+    if df.empty:
+        return df[[x, y]], "day"
+    # LTTB picks the points itself, so it needs the full daily series
+    bucket = "day" if use_lttb else choose_bucket(df[x].iloc[0], df[x].iloc[-1], max_points)
+    out = rebucket(df, x, y, bucket, agg)
+    if use_lttb and len(out) > max_points:
+        keep = lttb(out[x].astype("int64").to_numpy(), out[y].to_numpy(), max_points)
+        out = out.iloc[keep].reset_index(drop=True)
+    return out, bucket
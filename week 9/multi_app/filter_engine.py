@@ -0,0 +1,119 @@
+"""
+Bitmap-index filter engine for the dashboard sidebar filters.
+
+When a table is loaded, every filterable column gets a value -> row bitmap
+index (one packed bit per row, so 1.25 MB per value at 10M rows). A filter
+combination is answered by OR-ing the bitmaps of the selected values of
+each column, AND-ing the columns together, and taking the matching rows
+with a single positional slice; no boolean mask is rebuilt from the string
+columns and the table is never copied as a whole.
+"""
+import numpy as np
+import pandas as pd
+
+# Columns with more distinct values than this are not indexed; filters on
+# them fall back to a pandas mask over the already-narrowed rows
+MAX_INDEXED_VALUES = 4096
+
+
+class FilterEngine:
+    """Bitmap indexes over some columns of one (read-only) DataFrame."""
+
+    def __init__(self, df, columns, max_values=MAX_INDEXED_VALUES):
+        self.df = df
+        self.rows = len(df)
+        self._bitmaps = {}   # column -> {value: packed bits}
+        self._values = {}    # column -> sorted distinct values as strings
+        for column in columns:
+            if column in df.columns:
+                self._index_column(column, max_values)
+
+    def _index_column(self, column, max_values):
+        codes, uniques = pd.factorize(self.df[column], sort=True)
+        if len(uniques) > max_values:
+            return
+        codes = np.asarray(codes)
+        self._bitmaps[column] = {
+            value.item() if hasattr(value, "item") else value: np.packbits(codes == code)
+            for code, value in enumerate(uniques)
+        }
+        self._values[column] = sorted(str(value) for value in uniques)
+
+    @property
+    def columns(self):
+        """Names of the indexed columns."""
+        return list(self._bitmaps)
+
+    def distinct_values(self, column):
+        """Sorted non-null values of an indexed column, as strings (for selectboxes)."""
+        if column in self._values:
+            return list(self._values[column])
+        return sorted(str(value) for value in self.df[column].dropna().unique())
+
+    def _column_bitmap(self, column, value):
+        index = self._bitmaps[column]
+        values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+        found = [index[v] for v in values if v in index]
+        if not found:
+            return np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+        bitmap = found[0].copy()
+        for other in found[1:]:
+            np.bitwise_or(bitmap, other, out=bitmap)
+        return bitmap
+
+    def _split(self, filters):
+        """Split filters into indexed equality/IN ones and the rest."""
+        indexed, rest = [], {}
+        for key, value in (filters or {}).items():
+            if value is None:
+                continue
+            column, _, op = key.partition("__")
+            if column in self._bitmaps and op in ("", "eq"):
+                indexed.append((column, value))
+            else:
+                rest[key] = value
+        return indexed, rest
+
+    def positions(self, filters=None):
+        """
+        Row positions matching the indexed filters (None for "all rows").
+        Returns (positions, remaining_filters) where remaining_filters
+        could not be answered from a bitmap.
+        """
+        indexed, rest = self._split(filters)
+        if not indexed:
+            return None, rest
+        bitmap = self._column_bitmap(*indexed[0])
+        for column, value in indexed[1:]:
+            np.bitwise_and(bitmap, self._column_bitmap(column, value), out=bitmap)
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.rows)), rest
+
+    def count(self, filters=None, apply_rest=None):
+        """Number of rows matching filters."""
+        positions, rest = self.positions(filters)
+        if rest:
+            return len(self.select(filters, apply_rest=apply_rest))
+        return self.rows if positions is None else len(positions)
+
+    def select(self, filters=None, columns=None, apply_rest=None):
+        """
+        Return the rows matching filters, optionally only some columns.
+        apply_rest(df, filters) handles filters the index cannot answer
+        (operators other than equality, unindexed columns).
+        """
+        positions, rest = self.positions(filters)
+        if rest and apply_rest is None:
+            raise ValueError(f"Filters not covered by the index: {', '.join(rest)}")
+        # Narrow the columns first when nothing else needs the others
+        df = self.df if columns is None or rest else self.df[list(columns)]
+        if positions is not None:
+            df = df.iloc[positions]
+        if rest:
+            df = apply_rest(df, rest)
+            if columns is not None:
+                df = df[list(columns)]
+        return df
+
+    def nbytes(self):
+        """Memory used by the bitmaps."""
+        return sum(bitmap.nbytes for index in self._bitmaps.values() for bitmap in index.values())
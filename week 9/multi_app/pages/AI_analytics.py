@@ -1,7 +1,7 @@
 import streamlit as st
 import plotly.express as px
-from app_db import get_table_from_csv
-import pandas as pd
+from app_db import count_rows, distinct_values, filters_from_selections, aggregate_table, time_series
+from table_view import paginated_table
 import sys
 import os
 
@@ -10,8 +10,13 @@ week10_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."
 print("Week10 path:", week10_path, "Exists?", os.path.exists(week10_path))
 sys.path.insert(0, week10_path)
 
-# Import chatgpt_bot correctly (no .py extension)
-from chatgpt_bot import ask_chatgpt
+# Week 8 package (app.*) for the shared session service
+week8_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "week 8"))
+sys.path.insert(0, week8_path)
+from app.services.session_service import validate_session
+
+# Streaming ChatGPT panel (uses chatgpt_bot from week 10)
+from chat_panel import chat_panel
 
 # Page config MUST be first
 
@@ -19,69 +24,60 @@ st.set_page_config(page_title="AI Analytics Dashboard", layout="wide")
 
 
 # Require login
-if "logged_in" not in st.session_state or not st.session_state.logged_in:
+# The signed session token is checked from memory, never bcrypt or the database
+if validate_session(st.session_state.get("session_token")) is None:
     st.error("You must be logged in to view this page.")
     st.stop()
 
 st.title("AI Analytics Dashboard")
 
 
-# Load CSV
+# Data source (SQLite or CSV, see app_db.DATA_BACKEND)
 # -------------------------------------------------
-df = get_table_from_csv("datasets_metadata_1000")
-
-# Normalize column names
-df.columns = df.columns.str.strip().str.lower()
-
-# Parse dates safely
-df["last_updated"] = pd.to_datetime(df["last_updated"], errors="coerce")
-df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce")
+# Columns come back lower-cased with last_updated / created_at already parsed
+TABLE = "datasets_metadata"
+# Columns shown in the table; only these are read for each page
+DISPLAY_COLUMNS = ["id", "dataset_name", "category", "source", "last_updated", "record_count", "file_size_mb"]
 
 # -------------------------------------------------
 # Sidebar Filters (REAL columns)
 # -------------------------------------------------
-def safe_select(df, col, label):
-    values = sorted(df[col].dropna().astype(str).unique())
-    return st.sidebar.selectbox(label, ["All"] + values)
+def safe_select(col, label):
+    return st.sidebar.selectbox(label, ["All"] + distinct_values(TABLE, col))
 
-dataset_name = safe_select(df, "dataset_name", "Dataset")
-category = safe_select(df, "category", "Category")
-source = safe_select(df, "source", "Source")
+dataset_name = safe_select("dataset_name", "Dataset")
+category = safe_select("category", "Category")
+source = safe_select("source", "Source")
 
 # -------------------------------------------------
-# Filter Data
+# Filter Data (pushed down to the data source)
 # -------------------------------------------------
-filtered = df.copy()
-
-if dataset_name != "All":
-    filtered = filtered[filtered["dataset_name"].astype(str) == dataset_name]
-
-if category != "All":
-    filtered = filtered[filtered["category"].astype(str) == category]
-
-if source != "All":
-    filtered = filtered[filtered["source"].astype(str) == source]
+filters = filters_from_selections({
+    "dataset_name": dataset_name,
+    "category": category,
+    "source": source,
+})
+total = count_rows(TABLE, filters)
 
 # -------------------------------------------------
 # Display Table
 # -------------------------------------------------
-st.subheader(f"Showing {len(filtered)} record(s)")
-st.dataframe(filtered, use_container_width=True)
+st.subheader(f"Showing {total} record(s)")
+# Only the visible page is fetched and sent to the browser
+paginated_table(TABLE, filters, key="datasets", columns=DISPLAY_COLUMNS)
 
-if filtered.empty:
+if total == 0:
     st.warning("No data available for selected filters.")
     st.stop()
 
 # -------------------------------------------------
-# Charts
+# Charts (aggregates are cached per data version + filters, shared by every session)
 # -------------------------------------------------
 st.header("AI Analytics Charts")
 
 # 1️⃣ Datasets by Category
 cat_count = (
-    filtered.groupby("category")
-    .size()
-    .reset_index(name="count")
+    aggregate_table(TABLE, "category", filters)
     .sort_values("count", ascending=False)
 )
 
@@ -95,11 +91,7 @@ fig1 = px.bar(
 st.plotly_chart(fig1, use_container_width=True)
 
 # 2️⃣ Dataset Sources Breakdown
-src_count = (
-    filtered.groupby("source")
-    .size()
-    .reset_index(name="count")
-)
+src_count = aggregate_table(TABLE, "source", filters)
 
 fig2 = px.pie(
     src_count,
@@ -110,75 +102,22 @@ fig2 = px.pie(
 st.plotly_chart(fig2, use_container_width=True)
 
 # 3️⃣ Storage Size Over Time
-size_time = (
-    filtered.groupby("last_updated")["file_size_mb"]
-    .sum()
-    .reset_index()
-    .sort_values("last_updated")
-)
+# Daily totals are re-bucketed (day/week/month) so the chart stays under
+# the point budget however long the history is; with LTTB the days are
+# kept and thinned to the 200 that best preserve the line's shape
+smooth = st.checkbox("Reduce to 200 points (LTTB)", key="size_lttb")
+size_time, bucket = time_series(TABLE, "last_updated", filters, agg="sum", value="file_size_mb",
+                                max_points=200, use_lttb=smooth)
+if smooth:
+    bucket = "day, 200 points by LTTB"
 
 fig3 = px.line(
     size_time,
     x="last_updated",
     y="file_size_mb",
-    title="Total Dataset Size Over Time (MB)",
+    title=f"Total Dataset Size Over Time (MB, per {bucket})",
     markers=True
 )
 st.plotly_chart(fig3, use_container_width=True)
 
-st.header(" :) ChatGPT ")
-
-# Initialize conversation in session state
-if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
-
-# Input form at the bottom
-with st.form(key="chat_form", clear_on_submit=True):
-    user_input = st.text_input("Type your message here:")
-    send_button = st.form_submit_button("Send")
-
-    if send_button and user_input:
-        try:
-            answer = ask_chatgpt(user_input)
-            st.session_state.chat_history.append({"user": user_input, "bot": answer})
-        except Exception as e:
-            st.error(f"API call failed: {e}")
-
-# Display chat history (after form, so input stays at bottom)
-for chat in st.session_state.chat_history:
-    # User message
-    st.markdown(
-        f"""
-        <div style="
-            background-color: #DCF8C6;
-            padding: 10px;
-            border-radius: 10px;
-            margin: 5px 0;
-            max-width: 70%;
-            float: right;
-            clear: both;
-        ">
-            <strong>You:</strong> {chat['user']}
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-    # ChatGPT message
-    st.markdown(
-        f"""
-        <div style="
-            background-color: #F1F0F0;
-            padding: 10px;
-            border-radius: 10px;
-            margin: 5px 0;
-            max-width: 70%;
-            float: left;
-            clear: both;
-        ">
-            <strong>ChatGPT:</strong> {chat['bot']}
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-
-st.markdown("<div style='clear: both;'></div>", unsafe_allow_html=True)
\ No newline at end of file
+chat_panel(TABLE)
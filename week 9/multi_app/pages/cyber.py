@@ -1,5 +1,6 @@
 import plotly.express as px
-from app_db import get_table_from_csv
+from app_db import count_rows, distinct_values, filters_from_selections, aggregate_table, time_series, search_available
+from table_view import paginated_table
 import streamlit as st
 import sys
 import os
@@ -9,100 +10,71 @@ week10_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."
 print("Week10 path:", week10_path, "Exists?", os.path.exists(week10_path))
 sys.path.insert(0, week10_path)
 
-# Import chatgpt_bot correctly (no .py extension)
-from chatgpt_bot import ask_chatgpt
+# Week 8 package (app.*) for the shared session service
+week8_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "week 8"))
+sys.path.insert(0, week8_path)
+from app.services.session_service import validate_session
+from app.data.db import get_connection
+from app.data.search import search_incidents
+
+# Streaming ChatGPT panel (uses chatgpt_bot from week 10)
+from chat_panel import chat_panel
 
 #  Block page access unless logged in
-if "logged_in" not in st.session_state or st.session_state.logged_in is False:
+# The signed session token is checked from memory, never bcrypt or the database
+if validate_session(st.session_state.get("session_token")) is None:
     st.error(" You must be logged in to view this page.")
     st.stop()
 
 st.set_page_config(page_title="Cyber Security Dashboard", layout="wide")
 st.title("Cyber Security Incidents Dashboard")
 
-df = get_table_from_csv("cyber_incidents_1000")
+TABLE = "cyber_incidents"
+# Columns shown in the table; only these are read for each page
+DISPLAY_COLUMNS = ["id", "date", "incident_type", "severity", "status", "description", "reported_by"]
 
 # Sidebar filters
 st.sidebar.header("Filters")
-incident_type = st.sidebar.selectbox("Incident Type", ["All"] + sorted(df["incident_type"].unique()))
-severity = st.sidebar.selectbox("Severity", ["All"] + sorted(df["severity"].unique()))
-status = st.sidebar.selectbox("Status", ["All"] + sorted(df["status"].unique()))
-
-filtered = df.copy()
-if incident_type != "All":
-    filtered = filtered[filtered["incident_type"] == incident_type]
-if severity != "All":
-    filtered = filtered[filtered["severity"] == severity]
-if status != "All":
-    filtered = filtered[filtered["status"] == status]
-
-st.subheader(f"Showing {len(filtered)} incident(s)")
-st.dataframe(filtered, use_container_width=True)
-
-# Charts
+incident_type = st.sidebar.selectbox("Incident Type", ["All"] + distinct_values(TABLE, "incident_type"))
+severity = st.sidebar.selectbox("Severity", ["All"] + distinct_values(TABLE, "severity"))
+status = st.sidebar.selectbox("Status", ["All"] + distinct_values(TABLE, "status"))
+
+# The selections are pushed down to the data source, so only matching rows are read
+filters = filters_from_selections({
+    "incident_type": incident_type,
+    "severity": severity,
+    "status": status,
+})
+total = count_rows(TABLE, filters)
+
+st.subheader(f"Showing {total} incident(s)")
+# Only the visible page is fetched and sent to the browser
+paginated_table(TABLE, filters, key="incidents", columns=DISPLAY_COLUMNS)
+
+# Full-text search (SQLite FTS5 over the week 8 database). The index is
+# built by the week 8 setup (main.py); without it the search box is hidden.
+if search_available(TABLE):
+    search_text = st.text_input("Search incident descriptions", placeholder="e.g. ransomware, suspicious email")
+    if search_text:
+        results = search_incidents(get_connection(), search_text, limit=20)
+        st.caption(f"{len(results)} best matching incident(s)")
+        for row in results.itertuples():
+            st.markdown(f"**#{row.id}** · {row.date} · {row.incident_type} · {row.severity} · {row.status} — {row.snippet}")
+
+# Charts (aggregates are cached per data version + filters, shared by every session)
 st.header("Incident Trends")
 
-count_by_type = filtered.groupby("incident_type").size().reset_index(name="count")
+count_by_type = aggregate_table(TABLE, "incident_type", filters)
 fig = px.bar(count_by_type, x="incident_type", y="count", title="Incidents by Type", color="incident_type")
 st.plotly_chart(fig, use_container_width=True)
 
-severity_count = filtered.groupby("severity").size().reset_index(name="count")
+severity_count = aggregate_table(TABLE, "severity", filters)
 fig2 = px.pie(severity_count, names="severity", values="count", title="Severity Breakdown")
 st.plotly_chart(fig2, use_container_width=True)
 
-st.header(" :) ChatGPT ")
-
-# Initialize conversation in session state
-if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
-
-# Input form at the bottom
-with st.form(key="chat_form", clear_on_submit=True):
-    user_input = st.text_input("Type your message here:")
-    send_button = st.form_submit_button("Send")
-
-    if send_button and user_input:
-        try:
-            answer = ask_chatgpt(user_input)
-            st.session_state.chat_history.append({"user": user_input, "bot": answer})
-        except Exception as e:
-            st.error(f"API call failed: {e}")
-
-# Display chat history (after form, so input stays at bottom)
-for chat in st.session_state.chat_history:
-    # User message
-    st.markdown(
-        f"""
-        <div style="
-            background-color: #DCF8C6;
-            padding: 10px;
-            border-radius: 10px;
-            margin: 5px 0;
-            max-width: 70%;
-            float: right;
-            clear: both;
-        ">
-            <strong>You:</strong> {chat['user']}
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-    # ChatGPT message
-    st.markdown(
-        f"""
-        <div style="
-            background-color: #F1F0F0;
-            padding: 10px;
-            border-radius: 10px;
-            margin: 5px 0;
-            max-width: 70%;
-            float: left;
-            clear: both;
-        ">
-            <strong>ChatGPT:</strong> {chat['bot']}
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+# Volume over time, bucketed to stay under the point budget
+volume, bucket = time_series(TABLE, "date", filters)
+fig3 = px.line(volume, x="date", y="count", title=f"Incident Volume (per {bucket})")
+st.plotly_chart(fig3, use_container_width=True)
 
-st.markdown("<div style='clear: both;'></div>", unsafe_allow_html=True)
\ No newline at end of file
+chat_panel(TABLE)
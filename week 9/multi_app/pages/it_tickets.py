@@ -1,6 +1,7 @@
 import streamlit as st
 import plotly.express as px
-from app_db import get_table_from_csv
+from app_db import count_rows, distinct_values, table_columns, filters_from_selections, aggregate_table, time_series, search_available
+from table_view import paginated_table
 import sys
 import os
 
@@ -9,135 +10,105 @@ week10_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."
 print("Week10 path:", week10_path, "Exists?", os.path.exists(week10_path))
 sys.path.insert(0, week10_path)
 
-# Import chatgpt_bot correctly (no .py extension)
-from chatgpt_bot import ask_chatgpt
+# Week 8 package (app.*) for the shared session service
+week8_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "week 8"))
+sys.path.insert(0, week8_path)
+from app.services.session_service import validate_session
+from app.data.db import get_connection
+from app.data.search import search_tickets
+
+# Streaming ChatGPT panel (uses chatgpt_bot from week 10)
+from chat_panel import chat_panel
 
 
 #  Require login
-if "logged_in" not in st.session_state or st.session_state.logged_in is False:
+# The signed session token is checked from memory, never bcrypt or the database
+if validate_session(st.session_state.get("session_token")) is None:
     st.error(" You must be logged in to view this page.")
     st.stop()
 
 st.set_page_config(page_title="IT Tickets Dashboard", layout="wide")
 st.title(" IT Tickets Dashboard")
 
-# Load CSV
-df = get_table_from_csv("it_tickets_1000")
+# Data source (SQLite or CSV, see app_db.DATA_BACKEND)
+TABLE = "it_tickets"
+columns = table_columns(TABLE)
+# Columns shown in the table (those present); only these are read for each page
+DISPLAY_COLUMNS = [col for col in ("id", "ticket_id", "priority", "status", "category", "subject",
+                                   "description", "created_date", "resolved_date", "assigned_to")
+                   if col in columns]
 
 
 
 # -----------------------------
 # Sidebar Filters (dynamic)
 # -----------------------------
-def safe_select(df, col_name, label):
-    if col_name in df.columns:
-        return st.sidebar.selectbox(label, ["All"] + sorted(df[col_name].astype(str).unique()))
+def safe_select(col_name, label):
+    if col_name in columns:
+        return st.sidebar.selectbox(label, ["All"] + distinct_values(TABLE, col_name))
     else:
-        st.sidebar.warning(f"Column '{col_name}' not found in CSV, skipping filter.")
+        st.sidebar.warning(f"Column '{col_name}' not found in {TABLE}, skipping filter.")
         return "All"
 
-# Example columns to filter — adjust if your CSV has different names
-priority_filter = safe_select(df, "priority", "Priority")
-status_filter = safe_select(df, "status", "Status")
-assigned_filter = safe_select(df, "assigned_to", "Assigned To")
+# Example columns to filter — adjust if your table has different names
+priority_filter = safe_select("priority", "Priority")
+status_filter = safe_select("status", "Status")
+assigned_filter = safe_select("assigned_to", "Assigned To")
 
 # -----------------------------
-# Filter the DataFrame
+# Filter at the source: only matching rows are read
 # -----------------------------
-filtered = df.copy()
-if "priority" in df.columns and priority_filter != "All":
-    filtered = filtered[filtered["priority"] == priority_filter]
-if "status" in df.columns and status_filter != "All":
-    filtered = filtered[filtered["status"] == status_filter]
-if "assigned_to" in df.columns and assigned_filter != "All":
-    filtered = filtered[filtered["assigned_to"] == assigned_filter]
+filters = filters_from_selections({
+    "priority": priority_filter,
+    "status": status_filter,
+    "assigned_to": assigned_filter,
+})
+total = count_rows(TABLE, filters)
 
 # -----------------------------
 # Display Table
 # -----------------------------
-st.subheader(f"Showing {len(filtered)} ticket(s)")
-st.dataframe(filtered, use_container_width=True)
+st.subheader(f"Showing {total} ticket(s)")
+# Only the visible page is fetched and sent to the browser
+paginated_table(TABLE, filters, key="tickets", columns=DISPLAY_COLUMNS)
+
+# Full-text search (SQLite FTS5 over the week 8 database). The index is
+# built by the week 8 setup (main.py); without it the search box is hidden.
+if search_available(TABLE):
+    search_text = st.text_input("Search ticket subjects and descriptions", placeholder="e.g. printer, password reset")
+    if search_text:
+        results = search_tickets(get_connection(), search_text, limit=20)
+        st.caption(f"{len(results)} best matching ticket(s)")
+        for row in results.itertuples():
+            st.markdown(f"**{row.ticket_id}** · {row.priority} · {row.status} · {row.assigned_to} — {row.snippet}")
 
 # -----------------------------
-# Charts
+# Charts (aggregates are cached per data version + filters, shared by every session)
 # -----------------------------
 st.header("IT Tickets Overview")
 
 # 1️⃣ Tickets by Priority
-if "priority" in filtered.columns:
-    count_by_priority = filtered.groupby("priority").size().reset_index(name="count")
+if "priority" in columns:
+    count_by_priority = aggregate_table(TABLE, "priority", filters)
     fig1 = px.bar(count_by_priority, x="priority", y="count", title="Tickets by Priority", color="priority")
     st.plotly_chart(fig1, use_container_width=True)
 
 # 2️⃣ Tickets by Status
-if "status" in filtered.columns:
-    count_by_status = filtered.groupby("status").size().reset_index(name="count")
+if "status" in columns:
+    count_by_status = aggregate_table(TABLE, "status", filters)
     fig2 = px.pie(count_by_status, names="status", values="count", title="Status Breakdown")
     st.plotly_chart(fig2, use_container_width=True)
 
 # 3️⃣ Tickets by Assigned To
-if "assigned_to" in filtered.columns:
-    count_by_assigned = filtered.groupby("assigned_to").size().reset_index(name="count")
+if "assigned_to" in columns:
+    count_by_assigned = aggregate_table(TABLE, "assigned_to", filters)
     fig3 = px.bar(count_by_assigned, x="assigned_to", y="count", title="Tickets by Assigned To", color="assigned_to")
     st.plotly_chart(fig3, use_container_width=True)
 
-st.header(" :) ChatGPT ")
-
-# Initialize conversation in session state
-if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
-
-# Input form at the bottom
-with st.form(key="chat_form", clear_on_submit=True):
-    user_input = st.text_input("Type your message here:")
-    send_button = st.form_submit_button("Send")
-
-    if send_button and user_input:
-        try:
-            answer = ask_chatgpt(user_input)
-            st.session_state.chat_history.append({"user": user_input, "bot": answer})
-        except Exception as e:
-            st.error(f"API call failed: {e}")
-
-# Display chat history (after form, so input stays at bottom)
-for chat in st.session_state.chat_history:
-    # User message
-    st.markdown(
-        f"""
-        <div style="
-            background-color: #DCF8C6;
-            padding: 10px;
-            border-radius: 10px;
-            margin: 5px 0;
-            max-width: 70%;
-            float: right;
-            clear: both;
-        ">
-            <strong>You:</strong> {chat['user']}
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-    # ChatGPT message
-    st.markdown(
-        f"""
-        <div style="
-            background-color: #F1F0F0;
-            padding: 10px;
-            border-radius: 10px;
-            margin: 5px 0;
-            max-width: 70%;
-            float: left;
-            clear: both;
-        ">
-            <strong>ChatGPT:</strong> {chat['bot']}
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-
-st.markdown("<div style='clear: both;'></div>", unsafe_allow_html=True)
-
-
-
+# 4️⃣ Ticket Volume Over Time (bucketed to stay under the point budget)
+if "created_date" in columns:
+    volume, bucket = time_series(TABLE, "created_date", filters)
+    fig4 = px.line(volume, x="created_date", y="count", title=f"Tickets Created (per {bucket})")
+    st.plotly_chart(fig4, use_container_width=True)
 
+chat_panel(TABLE)
@@ -0,0 +1,50 @@
+"""
+Paginated table view for the dashboards.
+
+Only the visible page is fetched (sort, offset and limit are pushed to the
+data source in app_db), the total comes from a cached count query, and the
+next page is prefetched in the background. Rendering cost depends on the
+page size, not on how many rows match the filters.
+"""
+import math
+
+import streamlit as st
+
+from app_db import count_rows, get_page, table_columns, freeze_filters
+
+DEFAULT_PAGE_SIZE = 50
+
+
+def paginated_table(table, filters=None, key=None, page_size=DEFAULT_PAGE_SIZE, columns=None):
+    """
+    Render one page of table (matching filters) with sort and page controls.
+    key keeps the widget state apart when a page shows several tables.
+    Returns the total number of matching rows.
+    """
+    key = key or table
+    total = count_rows(table, filters)
+    pages = max(1, math.ceil(total / page_size))
+
+    # Back to the first page when the filters change, and never past the last one
+    page_key = f"{key}_page"
+    filters_key = f"{key}_filters"
+    if st.session_state.get(filters_key) != freeze_filters(filters):
+        st.session_state[filters_key] = freeze_filters(filters)
+        st.session_state[page_key] = 1
+    st.session_state[page_key] = min(st.session_state.get(page_key, 1), pages)
+
+    available = list(columns or table_columns(table))
+    sort_col, order_col, page_col = st.columns([2, 1, 1])
+    order_by = sort_col.selectbox("Sort by", available,
+                                  index=available.index("id") if "id" in available else 0,
+                                  key=f"{key}_sort")
+    descending = order_col.checkbox("Descending", key=f"{key}_desc")
+    page = page_col.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, step=1,
+                                 key=page_key)
+
+    df = get_page(table, filters, order_by, descending, page - 1, page_size, columns)
+    start = (page - 1) * page_size
+    if total:
+        st.caption(f"Rows {start + 1:,}–{start + len(df):,} of {total:,}")
+    st.dataframe(df, use_container_width=True, hide_index=True)
+    return total